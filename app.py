@@ -5,6 +5,7 @@ Ponto de entrada principal da aplicação com interface gráfica
 
 import sys
 import os
+import multiprocessing
 
 # Adiciona o diretório atual ao path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -12,4 +13,6 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from src.gui.main_window import main
 
 if __name__ == "__main__":
+    # Necessário para o pool de extração no executável gerado pelo PyInstaller
+    multiprocessing.freeze_support()
     main()
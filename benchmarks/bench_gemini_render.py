@@ -0,0 +1,91 @@
+"""
+Benchmark da renderização de páginas enviadas ao Gemini
+
+Para os PDFs de um diretório, compara o caminho anterior (3 páginas em zoom
+2x como PNG, decodificadas em PIL.Image) com variações de page_render
+(resolução, tons de cinza, JPEG/WebP), medindo o tempo de renderização e os
+bytes enviados por documento.
+
+Uso:
+    python benchmarks/bench_gemini_render.py DIRETORIO [--max-files 50]
+
+Requer PyMuPDF (e Pillow para o caminho anterior e para WebP).
+"""
+
+import argparse
+import os
+import sys
+import time
+from io import BytesIO
+from pathlib import Path
+
+# Adiciona o diretório raiz ao path para imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.page_render import render_pdf_page
+
+VARIANTS = [
+    ('png 144dpi', dict(dpi=144, max_side=None, image_format='png')),
+    ('jpeg 144dpi', dict(dpi=144, image_format='jpeg', quality=85)),
+    ('jpeg 144dpi cinza', dict(dpi=144, image_format='jpeg', quality=85, grayscale=True)),
+    ('jpeg 110dpi cinza', dict(dpi=110, image_format='jpeg', quality=80, grayscale=True)),
+    ('webp 110dpi cinza', dict(dpi=110, image_format='webp', quality=80, grayscale=True)),
+    ('jpeg 96dpi cinza', dict(dpi=96, image_format='jpeg', quality=75, grayscale=True)),
+]
+
+
+def previous_path(file_path: str) -> int:
+    """Caminho anterior: 3 páginas PNG em zoom 2x decodificadas em PIL; envia a primeira"""
+    import fitz
+    from PIL import Image
+
+    images = []
+    sizes = []
+    with fitz.open(file_path) as doc:
+        for page_num in range(min(3, len(doc))):
+            img_data = doc[page_num].get_pixmap(matrix=fitz.Matrix(2, 2)).tobytes("png")
+            sizes.append(len(img_data))
+            images.append(Image.open(BytesIO(img_data)))
+
+    if not images:
+        return 0
+    # O SDK recodifica a imagem PIL (PNG) ao montar a requisição
+    buffer = BytesIO()
+    images[0].save(buffer, format='PNG')
+    return buffer.tell()
+
+
+def measure(label, render, files):
+    start = time.perf_counter()
+    total = 0
+    for file_path in files:
+        total += render(str(file_path))
+    elapsed = time.perf_counter() - start
+
+    count = len(files)
+    print(f"{label:<28} {elapsed / count * 1000:>10.1f} {total / count / 1024:>10.1f} {total / 1024 / 1024:>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da renderização de imagens para o Gemini")
+    parser.add_argument('directory', help="Diretório com PDFs (busca recursiva)")
+    parser.add_argument('--max-files', type=int, default=50)
+    args = parser.parse_args()
+
+    files = sorted(p for p in Path(args.directory).rglob('*') if p.suffix.lower() == '.pdf')
+    files = files[:args.max_files] if args.max_files else files
+    if not files:
+        print(f"Nenhum PDF encontrado em {args.directory}")
+        sys.exit(1)
+
+    print(f"{len(files)} PDF(s) em {args.directory}\n")
+    print(f"{'variação':<28} {'ms/doc':>10} {'KB/doc':>10} {'MB total':>10}")
+
+    measure('anterior (3 págs PNG + PIL)', previous_path, files)
+    for label, options in VARIANTS:
+        measure(label, lambda path, options=options: len((render_pdf_page(path, **options) or {'data': b''})['data']),
+                files)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark do agendador de requisições ao Gemini contra um modelo falso local
+
+O FakeGeminiModel simula a latência da API e o throttling do servidor
+(responde 429 quando recebe mais requisições por minuto que sua cota e,
+ocasionalmente, 503). Compara o envio sequencial (1 requisição por vez, como
+no fluxo original) com o agendador concorrente.
+
+Uso:
+    python benchmarks/bench_gemini_scheduler.py [--documents 60] [--latency 0.5]
+                                                [--in-flight 8] [--rpm 300] [--server-rpm 400]
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from collections import deque
+from types import SimpleNamespace
+
+# Adiciona o diretório raiz ao path para imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.gemini_scheduler import GeminiScheduler
+
+
+class FakeApiError(Exception):
+    """Erro HTTP simulado (mesmo atributo 'code' das exceções do google.api_core)"""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(f"{code} {message}")
+        self.code = code
+
+
+class FakeGeminiModel:
+    """Modelo falso com latência, cota por minuto no servidor e falhas 503 aleatórias"""
+
+    def __init__(self, latency: float = 0.5, server_rpm: int = 400, error_rate: float = 0.02, seed: int = 0):
+        self.latency = latency
+        self.server_rpm = server_rpm
+        self.error_rate = error_rate
+        self.calls = 0
+        self.throttled = 0
+        self.failed = 0
+        self._random = random.Random(seed)
+        self._recent = deque()
+        self._lock = threading.Lock()
+
+    def generate_content(self, contents):
+        with self._lock:
+            self.calls += 1
+            now = time.monotonic()
+            while self._recent and now - self._recent[0] > 60:
+                self._recent.popleft()
+            if len(self._recent) >= self.server_rpm:
+                self.throttled += 1
+                raise FakeApiError(429, "Resource has been exhausted")
+            self._recent.append(now)
+            fail = self._random.random() < self.error_rate
+            jitter = self._random.uniform(0.8, 1.2)
+
+        time.sleep(self.latency * jitter)
+        if fail:
+            with self._lock:
+                self.failed += 1
+            raise FakeApiError(503, "Service Unavailable")
+
+        return SimpleNamespace(text="TIPO: diploma\nRA: 12345\nNOME: MARIA DA SILVA")
+
+
+def run(documents: int, latency: float, in_flight: int, rpm: int, server_rpm: int):
+    model = FakeGeminiModel(latency=latency, server_rpm=server_rpm)
+    scheduler = GeminiScheduler(model, max_in_flight=in_flight, requests_per_minute=rpm,
+                                tokens_per_minute=None, base_delay=0.2, max_delay=2.0)
+
+    start = time.perf_counter()
+    futures = [scheduler.submit(lambda i=i: [f"prompt {i}", b"imagem"]) for i in range(documents)]
+    answered = errors = 0
+    for future in futures:
+        try:
+            answered += bool(future.result())
+        except FakeApiError:
+            errors += 1
+    elapsed = time.perf_counter() - start
+    scheduler.shutdown()
+
+    print(f"{in_flight:>9} {elapsed:>10.2f} {documents / elapsed:>8.2f} {answered:>10} {errors:>6} "
+          f"{scheduler.retries:>9} {model.throttled:>5} {model.failed:>5} {scheduler.throttled_seconds:>11.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do agendador do Gemini com modelo falso")
+    parser.add_argument('--documents', type=int, default=60)
+    parser.add_argument('--latency', type=float, default=0.5, help="Latência simulada (s)")
+    parser.add_argument('--in-flight', type=int, default=8, help="Requisições simultâneas")
+    parser.add_argument('--rpm', type=int, default=300, help="Cota de requisições/minuto do cliente")
+    parser.add_argument('--server-rpm', type=int, default=400, help="Cota do servidor falso antes do 429")
+    args = parser.parse_args()
+
+    print(f"{args.documents} documentos, latência {args.latency}s, cota {args.rpm} RPM\n")
+    print(f"{'simultâneas':>9} {'tempo (s)':>10} {'docs/s':>8} {'respostas':>10} {'falhas':>6} "
+          f"{'retentat.':>9} {'429':>5} {'503':>5} {'espera (s)':>11}")
+
+    for in_flight in sorted({1, args.in_flight}):
+        run(args.documents, args.latency, in_flight, args.rpm, args.server_rpm)
+
+
+if __name__ == "__main__":
+    main()
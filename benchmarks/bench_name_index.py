@@ -0,0 +1,122 @@
+"""
+Benchmark do índice de nomes (cross-referencing de RA)
+
+Compara a busca do NameIndex com a varredura linear usada anteriormente por
+find_ra_by_name, com 1k, 10k e 100k nomes registrados, e confere que ambas
+retornam o mesmo RA.
+
+Uso:
+    python benchmarks/bench_name_index.py [--sizes 1000 10000 100000] [--queries 200]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+# Adiciona o diretório raiz ao path para imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.name_index import NameIndex
+
+
+FIRST_NAMES = ['ana', 'joao', 'maria', 'pedro', 'katia', 'jose', 'paula', 'carlos',
+               'fernanda', 'lucas', 'juliana', 'rafael', 'beatriz', 'marcos', 'camila',
+               'gabriel', 'larissa', 'thiago', 'veronica', 'bruno']
+LAST_NAMES = ['silva', 'santos', 'oliveira', 'souza', 'lima', 'pereira', 'almeida',
+              'ferreira', 'costa', 'rodrigues', 'gomes', 'martins', 'araujo', 'barbosa',
+              'ribeiro', 'carvalho', 'rocha', 'dias', 'monteiro', 'mendes', 'cardoso',
+              'teixeira', 'moreira', 'correia', 'nunes', 'vieira', 'freitas', 'pinto']
+
+
+def random_name(rng: random.Random) -> str:
+    """Gera um nome normalizado como os produzidos por clean_name"""
+    words = [rng.choice(FIRST_NAMES)]
+    words += rng.sample(LAST_NAMES, rng.randint(1, 3))
+    return '_'.join(words)
+
+
+def linear_find(processed_files: dict, nome_procurado: str):
+    """Busca linear original de find_ra_by_name (sem os prints)"""
+    for original_file, file_info in processed_files.items():
+        nome_arquivo = file_info.get('nome', '')
+        ra_arquivo = file_info.get('ra', '')
+
+        if nome_arquivo and ra_arquivo:
+            if nome_arquivo == nome_procurado:
+                return ra_arquivo
+
+            palavras_procurado = set(nome_procurado.split('_'))
+            palavras_arquivo = set(nome_arquivo.split('_'))
+            if len(palavras_procurado & palavras_arquivo) >= 2:
+                return ra_arquivo
+
+    return None
+
+
+def run(size: int, queries: int, seed: int = 42):
+    """Executa o benchmark para um número de nomes registrados"""
+    rng = random.Random(seed)
+    processed_files = {}
+    index = NameIndex()
+
+    start = time.perf_counter()
+    for i in range(size):
+        nome = random_name(rng)
+        ra = f"{rng.randint(1, 99999):05d}" if rng.random() < 0.9 else None
+        processed_files[f"arquivo_{i}.pdf"] = {'nome': nome, 'ra': ra}
+    for key, info in processed_files.items():
+        index.add(key, info['nome'], info['ra'])
+    build_time = time.perf_counter() - start
+
+    # Mistura de nomes conhecidos, parciais e inexistentes
+    lookups = []
+    for _ in range(queries):
+        choice = rng.random()
+        if choice < 0.4:
+            lookups.append(random_name(rng))
+        elif choice < 0.8:
+            lookups.append(f"{rng.choice(FIRST_NAMES)}_{rng.choice(LAST_NAMES)}")
+        else:
+            lookups.append(f"nome_{rng.randint(0, 10**6)}_inexistente")
+
+    start = time.perf_counter()
+    expected = [linear_find(processed_files, nome) for nome in lookups]
+    linear_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    found = []
+    for nome in lookups:
+        match = index.find(nome)
+        found.append(match[0] if match else None)
+    index_time = time.perf_counter() - start
+
+    if found != expected:
+        raise AssertionError(f"Resultados divergentes com {size} nomes registrados")
+
+    return {
+        'size': size,
+        'build_ms': build_time * 1000,
+        'linear_us': linear_time / queries * 1e6,
+        'index_us': index_time / queries * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do índice de nomes")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--queries', type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'registros':>10} {'montagem (ms)':>14} {'linear (µs/busca)':>18} "
+          f"{'índice (µs/busca)':>18} {'ganho':>8}")
+    for size in args.sizes:
+        r = run(size, args.queries)
+        speedup = r['linear_us'] / r['index_us'] if r['index_us'] else float('inf')
+        print(f"{r['size']:>10} {r['build_ms']:>14.1f} {r['linear_us']:>18.1f} "
+              f"{r['index_us']:>18.1f} {speedup:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
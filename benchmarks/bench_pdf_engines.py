@@ -0,0 +1,134 @@
+"""
+Benchmark dos motores de extração de texto de PDF
+
+Mede a vazão por página de cada motor (PyMuPDF/fitz, pdfplumber e PyPDF2)
+sobre os PDFs de um diretório do acervo, sem fallback entre motores. Antes,
+confere a troca de motor de iter_pdf_pages com motores simulados (em 'auto',
+um motor que só devolve páginas vazias passa a vez ao próximo).
+
+Uso:
+    python benchmarks/bench_pdf_engines.py DIRETORIO [--engines fitz pdfplumber pypdf2]
+                                           [--max-files 200] [--json resultado.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+# Adiciona o diretório raiz ao path para imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core import extractors
+from src.core.extractors import PDF_ENGINES
+
+
+def bench_engine(engine: str, files) -> dict:
+    """Extrai todas as páginas dos arquivos com um motor e mede o tempo"""
+    iter_pages = PDF_ENGINES[engine]
+    pages = 0
+    chars = 0
+    errors = 0
+
+    start = time.perf_counter()
+    for file_path in files:
+        try:
+            for page_text in iter_pages(str(file_path), 0):
+                pages += 1
+                chars += len(page_text)
+        except Exception:
+            errors += 1
+    elapsed = time.perf_counter() - start
+
+    return {
+        'engine': engine,
+        'files': len(files),
+        'pages': pages,
+        'chars': chars,
+        'errors': errors,
+        'seconds': elapsed,
+        'pages_per_second': pages / elapsed if elapsed else 0.0,
+        'ms_per_page': elapsed / pages * 1000 if pages else 0.0,
+    }
+
+
+def _fake_engine(pages, fail_after=None, available=True):
+    """Motor simulado: devolve as páginas dadas (falha após fail_after páginas)"""
+    def iter_pages(file_path, start):
+        if not available:
+            raise extractors.PdfEngineUnavailable('simulado')
+        for number, text in enumerate(pages[start:], start):
+            if fail_after is not None and number >= fail_after:
+                raise RuntimeError("falha simulada")
+            yield text
+    return iter_pages
+
+
+def check_engine_chain():
+    """Confere a troca de motor de extractors.iter_pdf_pages com motores simulados"""
+    cases = [
+        # (motores, seleção, páginas esperadas)
+        ({'fitz': _fake_engine(['', ' ']), 'pdfplumber': _fake_engine(['a', 'b'])}, 'auto', ['a', 'b']),
+        ({'fitz': _fake_engine(['', 'b']), 'pdfplumber': _fake_engine(['x', 'y'])}, 'auto', ['', 'b']),
+        ({'fitz': _fake_engine(['', '']), 'pdfplumber': _fake_engine([], available=False),
+          'pypdf2': _fake_engine([], available=False)}, 'auto', ['', '']),
+        ({'fitz': _fake_engine(['', '']), 'pdfplumber': _fake_engine(['', '']),
+          'pypdf2': _fake_engine(['', 'c'], fail_after=1)}, 'auto', ['', '']),
+        ({'fitz': _fake_engine(['a', 'b', 'c'], fail_after=1), 'pdfplumber': _fake_engine(['x', 'y', 'z'])},
+         'auto', ['a', 'y', 'z']),
+        ({'fitz': _fake_engine(['', ''])}, 'fitz', ['', '']),
+        ({'pdfplumber': _fake_engine(['', '']), 'pypdf2': _fake_engine(['a', 'b'])}, 'pdfplumber', ['', '']),
+    ]
+    original = dict(PDF_ENGINES)
+    try:
+        for engines, selection, expected in cases:
+            PDF_ENGINES.clear()
+            PDF_ENGINES.update({name: _fake_engine([], available=False) for name in original})
+            PDF_ENGINES.update(engines)
+            pages = list(extractors.iter_pdf_pages('simulado.pdf', selection))
+            if pages != expected:
+                raise AssertionError(f"iter_pdf_pages({selection!r}) com {sorted(engines)}: "
+                                     f"{pages} != {expected}")
+    finally:
+        PDF_ENGINES.clear()
+        PDF_ENGINES.update(original)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos motores de extração de PDF")
+    parser.add_argument('directory', help="Diretório com PDFs (busca recursiva)")
+    parser.add_argument('--engines', nargs='+', default=list(PDF_ENGINES), choices=list(PDF_ENGINES))
+    parser.add_argument('--max-files', type=int, default=0, help="Limita a quantidade de PDFs (0 = todos)")
+    parser.add_argument('--json', help="Grava os resultados neste arquivo JSON")
+    args = parser.parse_args()
+
+    check_engine_chain()
+
+    files = sorted(p for p in Path(args.directory).rglob('*') if p.suffix.lower() == '.pdf')
+    if args.max_files:
+        files = files[:args.max_files]
+
+    if not files:
+        print(f"Nenhum PDF encontrado em {args.directory}")
+        sys.exit(1)
+
+    print(f"{len(files)} PDF(s) em {args.directory}\n")
+    print(f"{'motor':<12} {'páginas':>8} {'tempo (s)':>10} {'pág/s':>9} {'ms/pág':>8} "
+          f"{'caracteres':>11} {'erros':>6}")
+
+    results = []
+    for engine in args.engines:
+        r = bench_engine(engine, files)
+        results.append(r)
+        print(f"{r['engine']:<12} {r['pages']:>8} {r['seconds']:>10.2f} {r['pages_per_second']:>9.1f} "
+              f"{r['ms_per_page']:>8.2f} {r['chars']:>11} {r['errors']:>6}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+"""
+Benchmark do processamento completo sobre um acervo sintético
+
+Gera (ou reaproveita) acervos de 100, 1k e 10k documentos com
+benchmarks/corpus.py e processa cada um com o pipeline completo
+(extração nos processos de trabalho, Gemini, resolução em duas passagens)
+em modo simulação, sem cache de extração e com um modelo Gemini falso que
+responde a partir do manifesto do acervo (com a latência de
+--gemini-latency). Cada tamanho roda em um processo separado, para que o
+pico de memória (RSS) seja o daquele tamanho.
+
+Para cada tamanho mostra a vazão (arquivos/s), o pico de RSS do processo
+principal e dos processos de extração, os tempos por etapa do relatório de
+tempos (extração, identify_document_type, busca do RA, planejamento das
+renomeações), o custo isolado de identify_document_type e find_ra_by_name
+(com o índice nome→RA completo) e o acerto de tipo e RA em relação ao
+manifesto.
+
+Cada execução é acrescentada a um histórico JSONL (commit, máquina e
+parâmetros) e comparada com a última execução equivalente do histórico;
+vazão menor ou memória maior que a tolerância são apontadas como regressão.
+
+Uso:
+    python benchmarks/bench_pipeline.py [--sizes 100 1000 10000] [--workers 0]
+                                        [--gemini-latency 0] [--corpus-dir DIR]
+                                        [--history benchmarks/results/pipeline_history.jsonl]
+                                        [--threshold 0.15] [--fail-on-regression]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Adiciona o diretório raiz ao path para imports
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import DEFAULT_MIX, generate_corpus
+
+
+DEFAULT_HISTORY = os.path.join(ROOT, 'benchmarks', 'results', 'pipeline_history.jsonl')
+DEFAULT_THRESHOLD = 0.15
+
+# Etapas do relatório de tempos mostradas na tabela (etapa → coluna)
+STAGE_COLUMNS = {
+    'extract': 'extração',
+    'resolve.facts': 'fatos',
+    'resolve.ra_lookup': 'busca RA',
+    'resolve.rename': 'renomeação',
+}
+
+_SINGLE_FILE = re.compile(r'NOME DO ARQUIVO: (.+)')
+_BATCH_FILE = re.compile(r'DOCUMENTO (\d+) - ARQUIVO: (.+)')
+
+
+class ManifestGeminiModel:
+    """Modelo Gemini falso: responde tipo, RA e nome do manifesto do acervo"""
+
+    def __init__(self, files: Dict[str, Dict], latency: float = 0.0):
+        self.files = files
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _answer(self, path: str) -> str:
+        info = self.files.get(os.path.basename(path.strip()))
+        if info is None:
+            return "TIPO: NÃO IDENTIFICADO\nRA: NÃO IDENTIFICADO\nNOME: NÃO IDENTIFICADO"
+        # O RA só é "lido" se estiver impresso no documento
+        ra = info['ra'] if info['ra_in_text'] else "NÃO IDENTIFICADO"
+        return f"TIPO: {info['type']}\nRA: {ra}\nNOME: {info['name']}"
+
+    def generate_content(self, contents):
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        batch = [part for part in contents if isinstance(part, str) and _BATCH_FILE.match(part)]
+        if batch:
+            blocks = []
+            for part in batch:
+                number, path = _BATCH_FILE.match(part).groups()
+                blocks.append(f"DOCUMENTO: {number}\n{self._answer(path)}")
+            return SimpleNamespace(text="\n\n".join(blocks))
+
+        match = _SINGLE_FILE.search(contents[0])
+        return SimpleNamespace(text=self._answer(match.group(1) if match else ""))
+
+
+def peak_rss_mb() -> Dict[str, Optional[float]]:
+    """Pico de RSS do processo e dos processos filhos já encerrados (MB)"""
+    try:
+        import resource
+    except ImportError:
+        # Windows: só o processo atual, se o psutil estiver instalado
+        try:
+            import psutil
+            return {'self': psutil.Process().memory_info().peak_wset / 2 ** 20, 'children': None}
+        except (ImportError, AttributeError):
+            return {'self': None, 'children': None}
+
+    # ru_maxrss é em KB no Linux e em bytes no macOS
+    unit = 1 if sys.platform == 'darwin' else 1024
+    return {
+        'self': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit / 2 ** 20,
+        'children': resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * unit / 2 ** 20,
+    }
+
+
+def _per_call_us(func, calls: List[tuple], repeat: int = 3) -> float:
+    """Melhor tempo médio por chamada (µs) em 'repeat' rodadas"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for args in calls:
+            func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best / max(1, len(calls)) * 1e6
+
+
+def run_size(corpus_dir: str, workers: int, gemini_latency: float) -> Dict:
+    """Processa um acervo (executado no processo filho) e retorna as medições"""
+    start = time.perf_counter()
+    from src.core.document_analyzer import DocumentAnalyzer
+    from src.core.pipeline import ProcessingPipeline
+    from src.core.timing import TimingReport
+    from src.utils.logging_setup import setup_logging
+    import_seconds = time.perf_counter() - start
+
+    setup_logging('WARNING')
+    with open(os.path.join(corpus_dir, 'manifest.json'), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)['files']
+
+    model = ManifestGeminiModel(manifest, gemini_latency)
+    analyzer = DocumentAnalyzer(use_cache=False, gemini_client=model, dry_run=True)
+    # Sem as cotas da API real: o benchmark mede o processamento local
+    analyzer.config['gemini_requests_per_minute'] = 0
+    analyzer.config['gemini_tokens_per_minute'] = 0
+    analyzer.setup_gemini_scheduler()
+
+    # Ordem fixa: o resultado da resolução depende da ordem dos arquivos
+    files = [os.path.join(corpus_dir, name) for name in sorted(manifest)]
+    report = TimingReport()
+    type_hits = ra_hits = 0
+    samples = []
+
+    def on_result(index, total, result):
+        nonlocal type_hits, ra_hits
+        report.add(result)
+        outcome = result.get('outcome') or {}
+        expected = manifest[os.path.basename(result['path'])]
+        type_hits += outcome.get('type') == expected['type']
+        ra_hits += outcome.get('ra') == expected['ra']
+        if result.get('text'):
+            samples.append((result['text'], os.path.basename(result['path'])))
+
+    pipeline = ProcessingPipeline(analyzer, workers=workers, two_pass=True)
+    successful, processed = pipeline.run(files, on_result=on_result)
+    report.finish()
+    if analyzer.gemini_scheduler:
+        analyzer.gemini_scheduler.shutdown()
+
+    # Aguarda o fim dos processos de extração (o pool é encerrado sem esperar):
+    # o pico de RSS dos filhos só conta processos já encerrados
+    deadline = time.monotonic() + 10
+    while multiprocessing.active_children() and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    # Custo isolado por chamada, com o índice nome→RA já completo
+    identify_us = _per_call_us(analyzer.identify_document_type, samples)
+    find_ra_us = _per_call_us(analyzer.find_ra_by_name, samples)
+
+    data = report.to_dict()
+    return {
+        'files': processed,
+        'successful': successful,
+        'import_seconds': import_seconds,
+        'wall_seconds': data['wall_seconds'],
+        'files_per_second': data['files_per_second'],
+        'workers': pipeline.workers,
+        'gemini_calls': model.calls,
+        'type_accuracy': type_hits / processed if processed else None,
+        'ra_accuracy': ra_hits / processed if processed else None,
+        'identify_us': identify_us,
+        'find_ra_us': find_ra_us,
+        'stages': {name: stats for name, stats in data['stages'].items()},
+        'text_sources': data['text_sources'],
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def measure(size: int, corpus_dir: str, workers: int, gemini_latency: float) -> Dict:
+    """Executa run_size em um processo novo (pico de RSS isolado por tamanho)"""
+    command = [sys.executable, os.path.abspath(__file__), '--child', corpus_dir,
+               '--workers', str(workers), '--gemini-latency', str(gemini_latency)]
+    completed = subprocess.run(command, cwd=ROOT, stdout=subprocess.PIPE, check=True)
+    result = json.loads(completed.stdout.decode('utf-8').strip().splitlines()[-1])
+    result['size'] = size
+    return result
+
+
+def git_commit() -> Optional[str]:
+    try:
+        completed = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                   stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True)
+        return completed.stdout.decode().strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path: str) -> List[Dict]:
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def find_baseline(history: List[Dict], entry: Dict) -> Optional[Dict]:
+    """Última execução do histórico com os mesmos parâmetros e na mesma máquina"""
+    for previous in reversed(history):
+        if previous['params'] == entry['params'] and previous['machine'] == entry['machine']:
+            return previous
+    return None
+
+
+def compare(result: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Regressões de vazão e de memória em relação à execução de referência"""
+    problems = []
+    old_rate, new_rate = baseline.get('files_per_second'), result.get('files_per_second')
+    if old_rate and new_rate and new_rate < old_rate * (1 - threshold):
+        problems.append(f"vazão {new_rate:.1f} arquivos/s (antes {old_rate:.1f}, "
+                        f"{(new_rate / old_rate - 1) * 100:+.0f}%)")
+
+    old_rss, new_rss = baseline['peak_rss_mb'].get('self'), result['peak_rss_mb'].get('self')
+    if old_rss and new_rss and new_rss > old_rss * (1 + threshold):
+        problems.append(f"pico de RSS {new_rss:.0f} MB (antes {old_rss:.0f} MB, "
+                        f"{(new_rss / old_rss - 1) * 100:+.0f}%)")
+    return problems
+
+
+def _ms(result: Dict, stage: str) -> str:
+    stats = result['stages'].get(stage)
+    return f"{stats['p50'] * 1000:.3f}" if stats else "-"
+
+
+def _mb(value: Optional[float]) -> str:
+    return f"{value:.0f}" if value is not None else "-"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do processamento completo")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--workers', type=int, default=0, help="Processos de extração (0 = automático)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--gemini-latency', type=float, default=0.0,
+                        help="Latência simulada de cada requisição ao Gemini (s)")
+    parser.add_argument('--corpus-dir', default=os.path.join(tempfile.gettempdir(), 'ediploma_bench_corpus'),
+                        help="Diretório dos acervos gerados (reaproveitados entre execuções)")
+    parser.add_argument('--history', default=DEFAULT_HISTORY, help="Histórico JSONL ('' = não grava)")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Variação tolerada antes de apontar regressão (0.15 = 15%%)")
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help="Termina com código 1 se houver regressão")
+    parser.add_argument('--child', metavar='ACERVO', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_size(args.child, args.workers, args.gemini_latency)))
+        return
+
+    history = load_history(args.history) if args.history else []
+    machine = {'platform': platform.platform(), 'python': platform.python_version(), 'cpus': os.cpu_count()}
+    commit = git_commit()
+    regressions = []
+
+    print(f"{'arquivos':>9} {'acervo (s)':>10} {'total (s)':>10} {'arq/s':>8} {'RSS (MB)':>9} "
+          f"{'filhos (MB)':>11} " + " ".join(f"{label + ' p50':>15}" for label in STAGE_COLUMNS.values())
+          + f" {'tipo (µs)':>10} {'busca RA (µs)':>14} {'acerto tipo':>12} {'acerto RA':>10}")
+
+    for size in args.sizes:
+        corpus_dir = os.path.join(args.corpus_dir, f"{size}-{args.seed}")
+        start = time.perf_counter()
+        generate_corpus(corpus_dir, size, args.seed)
+        corpus_seconds = time.perf_counter() - start
+
+        result = measure(size, corpus_dir, args.workers, args.gemini_latency)
+        rss = result['peak_rss_mb']
+        print(f"{size:>9} {corpus_seconds:>10.1f} {result['wall_seconds']:>10.1f} "
+              f"{result['files_per_second']:>8.1f} {_mb(rss['self']):>9} {_mb(rss['children']):>11} "
+              + " ".join(f"{_ms(result, stage):>15}" for stage in STAGE_COLUMNS)
+              + f" {result['identify_us']:>10.1f} {result['find_ra_us']:>14.1f}"
+              f" {result['type_accuracy']:>12.1%} {result['ra_accuracy']:>10.1%}")
+
+        entry = {
+            'time': datetime.now().isoformat(timespec='seconds'),
+            'commit': commit,
+            'machine': machine,
+            'params': {'size': size, 'seed': args.seed, 'workers': args.workers,
+                       'gemini_latency': args.gemini_latency, 'mix': DEFAULT_MIX},
+            **result,
+        }
+        baseline = find_baseline(history, entry)
+        if baseline:
+            for problem in compare(result, baseline, args.threshold):
+                regressions.append(f"{size} arquivos: {problem} (referência: {baseline.get('commit') or baseline['time']})")
+
+        if args.history:
+            os.makedirs(os.path.dirname(os.path.abspath(args.history)), exist_ok=True)
+            with open(args.history, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            history.append(entry)
+
+    print("(p50 das etapas em ms por arquivo; tipo e busca RA: custo isolado por chamada)")
+    if regressions:
+        print("\n⚠️  Regressões em relação ao histórico:")
+        for line in regressions:
+            print(f"  {line}")
+        if args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
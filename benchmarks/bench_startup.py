@@ -0,0 +1,145 @@
+"""
+Benchmark do tempo de abertura da aplicação
+
+Mede o tempo até a janela ser desenhada pela primeira vez (time-to-window)
+para a execução pelo código-fonte (python app.py) e para os executáveis
+gerados por build_exe.py, se existirem (dist/DocsAnalyser.exe do perfil
+--onefile e dist/DocsAnalyser/DocsAnalyser.exe do perfil --onedir). A
+aplicação é aberta com a variável DOCSANALYSER_STARTUP_PROBE, que faz a
+janela gravar os horários de início de main() e do primeiro desenho e
+fechar em seguida (ver main_window.report_first_paint).
+
+A primeira abertura de cada alvo é mostrada à parte (arquivos fora do cache
+do sistema, extração do --onefile). Também mede, sem abrir janela, o tempo
+de importação da interface e confere que nenhuma biblioteca pesada
+(extração, Gemini, .env) é carregada antes do primeiro uso.
+
+Uso:
+    python benchmarks/bench_startup.py [--runs 5] [--timeout 60] [--exe CAMINHO ...]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Adiciona o diretório raiz ao path para imports
+sys.path.insert(0, ROOT)
+
+from src.gui.main_window import STARTUP_PROBE_ENV
+
+
+APP_NAME = 'DocsAnalyser'
+EXE_SUFFIX = '.exe' if sys.platform == 'win32' else ''
+
+# Bibliotecas que só devem ser importadas no primeiro uso
+HEAVY_MODULES = ('fitz', 'pdfplumber', 'PyPDF2', 'docx', 'docx2txt', 'dotenv', 'google.generativeai', 'PIL')
+
+IMPORT_CHECK = f"""
+import json, sys, time
+sys.path.insert(0, {ROOT!r})
+start = time.perf_counter()
+import src.gui.main_window
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'heavy': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))
+"""
+
+
+def default_targets() -> Dict[str, List[str]]:
+    """Código-fonte e executáveis encontrados em dist/"""
+    targets = {'código-fonte': [sys.executable, os.path.join(ROOT, 'app.py')]}
+
+    dist = os.path.join(ROOT, 'dist')
+    onefile = os.path.join(dist, APP_NAME + EXE_SUFFIX)
+    onedir = os.path.join(dist, APP_NAME, APP_NAME + EXE_SUFFIX)
+    if os.path.isfile(onefile):
+        targets['--onefile'] = [onefile]
+    if os.path.isfile(onedir):
+        targets['--onedir'] = [onedir]
+    return targets
+
+
+def measure_import() -> Dict:
+    """Tempo de importação da interface em um interpretador novo"""
+    completed = subprocess.run([sys.executable, '-c', IMPORT_CHECK], cwd=ROOT,
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+    return json.loads(completed.stdout.decode('utf-8').strip().splitlines()[-1])
+
+
+def open_once(command: List[str], timeout: float) -> Optional[Dict[str, float]]:
+    """
+    Abre a aplicação uma vez
+
+    Returns:
+        {'main': segundos até main(), 'window': segundos até a janela}, ou
+        None se a janela não foi desenhada (ex: sem display)
+    """
+    fd, probe = tempfile.mkstemp(suffix='.json')
+    os.close(fd)
+    os.remove(probe)
+    env = dict(os.environ, **{STARTUP_PROBE_ENV: probe})
+
+    start = time.time()
+    process = subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    try:
+        _, stderr = process.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.communicate()
+        print(f"  ⚠️  Tempo esgotado ({timeout:.0f}s): {' '.join(command)}")
+        return None
+
+    if not os.path.exists(probe):
+        lines = stderr.decode('utf-8', 'replace').strip().splitlines()
+        print(f"  ⚠️  A janela não foi aberta: {lines[-1] if lines else f'código {process.returncode}'}")
+        return None
+
+    with open(probe, 'r', encoding='utf-8') as f:
+        times = json.load(f)
+    os.remove(probe)
+    return {'main': times['main'] - start, 'window': times['window'] - start}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do tempo de abertura")
+    parser.add_argument('--runs', type=int, default=5, help="Aberturas por alvo")
+    parser.add_argument('--timeout', type=float, default=60, help="Tempo máximo de cada abertura (s)")
+    parser.add_argument('--exe', nargs='+', default=[], help="Outros executáveis a medir")
+    args = parser.parse_args()
+
+    imported = measure_import()
+    heavy = ", ".join(imported['heavy']) or "nenhuma"
+    print(f"Importação da interface: {imported['seconds'] * 1000:.0f} ms "
+          f"(bibliotecas pesadas carregadas: {heavy})\n")
+
+    targets = default_targets()
+    for path in args.exe:
+        targets[os.path.basename(path)] = [os.path.abspath(path)]
+
+    print(f"{'alvo':<16} {'aberturas':>9} {'1ª janela (s)':>14} {'janela p50 (s)':>15} "
+          f"{'janela mín (s)':>15} {'main() p50 (s)':>15}")
+    for name, command in targets.items():
+        results = []
+        for _ in range(args.runs):
+            result = open_once(command, args.timeout)
+            if result is None:
+                break
+            results.append(result)
+        if not results:
+            print(f"{name:<16} {0:>9} {'-':>14} {'-':>15} {'-':>15} {'-':>15}")
+            continue
+
+        windows = [r['window'] for r in results]
+        print(f"{name:<16} {len(results):>9} {windows[0]:>14.2f} {statistics.median(windows):>15.2f} "
+              f"{min(windows):>15.2f} {statistics.median(r['main'] for r in results):>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""
+Benchmark da extração de RA e de nome do texto
+
+Compara a varredura única de text_patterns (uma expressão combinada por uso,
+compilada uma vez) com a busca anterior, que convertia o texto para
+minúsculas e procurava cada padrão em sequência (até sete varreduras do
+texto para o RA e seis para o nome, com os padrões de nome recompilados a
+cada chamada), em textos de documentos do acervo sintético com 1, 6, 20 e
+50 páginas. Confere que ambas retornam o mesmo RA e o mesmo nome, também
+com o texto em maiúsculas ou com iniciais maiúsculas. A busca só do RA usa,
+como antes, uma expressão por padrão (sem a alternância), e por isso fica
+no mesmo tempo da anterior; o ganho está no nome e no RA+nome.
+
+Uso:
+    python benchmarks/bench_text_patterns.py [--pages 1 6 20 50] [--docs 200] [--repeat 3] [--seed 42]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+import unicodedata
+
+# Adiciona o diretório raiz ao path para imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from corpus import DOCUMENT_TYPES, LABELS, NAMED_LABELS, SUBJECTS, _student, document_pages
+from src.core import text_patterns
+
+
+# Padrões e funções originais (sem os prints)
+LEGACY_FILENAME_RA_PATTERNS = [
+    re.compile(r'ra(\d{6})'),
+    re.compile(r'ra(\d{5})'),
+    re.compile(r'ra(\d{4})'),
+    re.compile(r'mat(\d+)'),
+    re.compile(r'matricula[_\-]?(\d+)'),
+]
+
+LEGACY_TEXT_RA_PATTERNS = [
+    re.compile(r'ra[:\s]+(\d{6})'),
+    re.compile(r'ra[:\s]+(\d{5})'),
+    re.compile(r'ra[:\s]+(\d{4})'),
+    re.compile(r'r\.?a\.?[:\s]+(\d+)'),
+    re.compile(r'registro[:\s]+(\d+)'),
+    re.compile(r'matrícula[:\s]+(\d+)'),
+    re.compile(r'matricula[:\s]+(\d+)'),
+]
+
+
+def legacy_matricula_from_filename(filename: str):
+    filename_lower = filename.lower()
+    for pattern in LEGACY_FILENAME_RA_PATTERNS:
+        match = pattern.search(filename_lower)
+        if match:
+            return match.group(1)
+    return None
+
+
+def legacy_matricula_from_text(text: str):
+    text_lower = text.lower()
+    for pattern in LEGACY_TEXT_RA_PATTERNS:
+        match = pattern.search(text_lower)
+        if match:
+            return match.group(1)
+    return None
+
+
+def legacy_clean_name(name: str) -> str:
+    name = unicodedata.normalize('NFD', name)
+    name = ''.join(c for c in name if unicodedata.category(c) != 'Mn')
+    name = re.sub(r'[^a-zA-Z\s]', '', name)
+    name = re.sub(r'\s+', '_', name.strip())
+    return name.lower()
+
+
+def legacy_name_from_text(text: str, filename: str = "") -> str:
+    if filename:
+        filename_clean = filename.lower()
+        filename_clean = re.sub(r'\.(pdf|docx?|jpg|png)$', '', filename_clean)
+        filename_clean = re.sub(r'ra\d+', '', filename_clean)
+        filename_clean = re.sub(r'doc\d+', '', filename_clean)
+
+        for keyword in ['termo', 'oficio', 'ofício', 'historico', 'histórico']:
+            if keyword in filename_clean:
+                parts = filename_clean.split(keyword)
+                if len(parts) > 1:
+                    potential_name = parts[1].strip()
+                    potential_name = re.sub(r'\d+', '', potential_name)
+                    potential_name = re.sub(r'[_\-\.]+', ' ', potential_name).strip()
+                    if len(potential_name.split()) >= 2:
+                        cleaned = legacy_clean_name(potential_name)
+                        if cleaned and cleaned != "documento":
+                            return cleaned
+
+    patterns = [
+        r'nome[:\s]+([^\n\r,;]+(?:\s+[^\n\r,;]+)*)',
+        r'portador[:\s]+([^\n\r,;]+(?:\s+[^\n\r,;]+)*)',
+        r'titular[:\s]+([^\n\r,;]+(?:\s+[^\n\r,;]+)*)',
+        r'eu,\s+([^\n\r,;]+(?:\s+[^\n\r,;]+)*)',
+        r'sr\.?\s+([^\n\r,;]+(?:\s+[^\n\r,;]+)*)',
+        r'sra\.?\s+([^\n\r,;]+(?:\s+[^\n\r,;]+)*)',
+    ]
+    for pattern in patterns:
+        match = re.search(pattern, text, re.IGNORECASE | re.UNICODE)
+        if match:
+            name = match.group(1).strip()
+            name = ' '.join(name.split())
+            words = name.split()[:6]
+            name = ' '.join(words)
+
+            exclude_words = ['documento', 'carteira', 'registro', 'geral', 'federal', 'receita',
+                             'declaro', 'termo', 'responsabilidade', 'que']
+            if not any(word in name.lower() for word in exclude_words) and len(words) >= 2:
+                return legacy_clean_name(name)
+
+    return "documento"
+
+
+def make_documents(pages: int, docs: int, seed: int):
+    """
+    Gera (nome do arquivo, texto) de documentos com o número de páginas pedido
+
+    O texto vem em minúsculas, como o produzido pelos extratores. O RA pode
+    estar no nome do arquivo, na primeira página, só na última página ou
+    ausente; páginas de disciplinas completam o documento.
+    """
+    rng = random.Random(seed)
+    used_ras = set()
+    documents = []
+    for number in range(1, docs + 1):
+        student = _student(rng, used_ras)
+        doc_type = rng.choice(DOCUMENT_TYPES)
+        placement = rng.choice(['primeira', 'ultima', 'ausente'])
+        doc_pages = document_pages(doc_type, student, placement == 'primeira', rng, pages)[:pages]
+        while len(doc_pages) < pages:
+            doc_pages.append("\n".join(
+                f"{rng.choice(SUBJECTS)}  {rng.randint(30, 90)}h  nota {rng.randint(60, 100) / 10:.1f}  aprovado"
+                for _ in range(30)))
+        if placement == 'ultima':
+            doc_pages[-1] += f"\nregistro acadêmico (ra): {student['ra']}"
+
+        label = rng.choice(LABELS[doc_type])
+        if rng.random() < 0.6:
+            filename = f"ra{student['ra']} doc{number:05d} {label}.pdf"
+        elif doc_type in NAMED_LABELS:
+            filename = f"doc{number:05d} {label} {student['name'].lower()}.pdf"
+        else:
+            filename = f"doc{number:05d} {label}.pdf"
+        documents.append((filename, "\n".join(doc_pages).lower()))
+    return documents
+
+
+def measure(function, documents, repeat: int) -> float:
+    """Menor tempo médio por documento (µs) entre as repetições"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for filename, text in documents:
+            function(filename, text)
+        best = min(best, time.perf_counter() - start)
+    return best / len(documents) * 1e6
+
+
+def legacy_both(filename: str, text: str):
+    return legacy_matricula_from_text(text), legacy_name_from_text(text)
+
+
+def scan_both(filename: str, text: str):
+    ra, name = text_patterns.scan_text(text)
+    return ra.value if ra else None, text_patterns.name_from_candidate(name)
+
+
+def check_equivalence(filename: str, text: str, pages: int):
+    """Confere que as funções atuais retornam o mesmo que as originais"""
+    expected = (
+        legacy_matricula_from_filename(filename),
+        legacy_matricula_from_text(text),
+        legacy_name_from_text(text),
+        legacy_name_from_text(text, filename),
+        legacy_both(filename, text),
+    )
+    found = (
+        text_patterns.extract_matricula_from_filename(filename),
+        text_patterns.extract_matricula_from_text(text),
+        text_patterns.extract_name_from_text(text),
+        text_patterns.extract_name_from_text(text, filename),
+        scan_both(filename, text),
+    )
+    if found != expected:
+        raise AssertionError(f"Resultados divergentes em '{filename}' ({pages} páginas): "
+                             f"{found} != {expected}")
+
+
+def run(pages: int, docs: int, repeat: int, seed: int):
+    """Executa o benchmark para documentos com um número de páginas"""
+    documents = make_documents(pages, docs, seed)
+
+    for filename, text in documents:
+        check_equivalence(filename, text, pages)
+        # As funções públicas também aceitam texto com maiúsculas
+        check_equivalence(filename, text.upper(), pages)
+        check_equivalence(filename, text.title(), pages)
+
+    return {
+        'pages': pages,
+        'chars': sum(len(text) for _, text in documents) / len(documents),
+        'ra': (measure(lambda f, t: legacy_matricula_from_text(t), documents, repeat),
+               measure(lambda f, t: text_patterns.extract_matricula_from_text(t), documents, repeat)),
+        'name': (measure(lambda f, t: legacy_name_from_text(t, f), documents, repeat),
+                 measure(lambda f, t: text_patterns.extract_name_from_text(t, f), documents, repeat)),
+        'both': (measure(legacy_both, documents, repeat),
+                 measure(scan_both, documents, repeat)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da extração de RA e de nome do texto")
+    parser.add_argument('--pages', type=int, nargs='+', default=[1, 6, 20, 50])
+    parser.add_argument('--docs', type=int, default=200, help="Documentos por tamanho")
+    parser.add_argument('--repeat', type=int, default=3, help="Repetições (vale a mais rápida)")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'páginas':>8} {'caracteres':>11} {'extração':>9} {'anterior (µs/doc)':>18} "
+          f"{'varredura única (µs/doc)':>25} {'ganho':>7}")
+    for pages in args.pages:
+        r = run(pages, args.docs, args.repeat, args.seed)
+        for label, key in (('RA', 'ra'), ('nome', 'name'), ('RA+nome', 'both')):
+            legacy, current = r[key]
+            speedup = legacy / current if current else float('inf')
+            print(f"{r['pages']:>8} {r['chars']:>11.0f} {label:>9} {legacy:>18.1f} "
+                  f"{current:>25.1f} {speedup:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+"""
+Gerador de acervo sintético de documentos do E-DIPLOMA
+
+Cria um diretório com documentos dos dez tipos das regras de renomeação
+(ofício, termo, identidade, CPF, certidão, ensino médio, históricos,
+diploma e taxa) para vários alunos, com nomes de arquivo como os
+digitalizados na secretaria ('ra03013 doc00005 RG pdf-a.pdf', ou sem RA e
+com o nome do aluno: 'doc00007 TERMO katia veronica almeida.pdf'), nos
+formatos:
+
+- 'pdf': PDF com texto
+- 'scan': PDF só com a imagem da página (depende do Gemini)
+- 'docx': DOCX
+- 'doc': conteúdo OOXML com extensão .doc (o extrator de .doc, docx2txt,
+  só lê OOXML; um .doc binário do Word 97 não é gerado)
+
+O arquivo manifest.json do diretório guarda, para cada arquivo, o tipo, o
+RA e o nome esperados, usados pelos benchmarks para conferir o resultado.
+O mesmo 'seed' gera sempre o mesmo acervo; um acervo já gerado com os
+mesmos parâmetros é reaproveitado.
+
+Uso:
+    python benchmarks/corpus.py DIRETORIO [--count 1000] [--seed 42]
+                                [--mix pdf=55 scan=15 docx=20 doc=10] [--pages 6]
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+import zipfile
+from typing import Dict, List, Optional
+from xml.sax.saxutils import escape
+
+
+MANIFEST_NAME = 'manifest.json'
+CORPUS_VERSION = 1
+
+DEFAULT_MIX = {'pdf': 55, 'scan': 15, 'docx': 20, 'doc': 10}
+DEFAULT_PAGES = 6
+EXTENSIONS = {'pdf': '.pdf', 'scan': '.pdf', 'docx': '.docx', 'doc': '.doc'}
+
+FIRST_NAMES = ['Ana', 'João', 'Maria', 'Pedro', 'Kátia', 'José', 'Paula', 'Carlos',
+               'Fernanda', 'Lucas', 'Juliana', 'Rafael', 'Beatriz', 'Marcos', 'Camila',
+               'Gabriel', 'Larissa', 'Thiago', 'Verônica', 'Bruno', 'Letícia', 'André']
+LAST_NAMES = ['Silva', 'Santos', 'Oliveira', 'Souza', 'Lima', 'Pereira', 'Almeida',
+              'Ferreira', 'Costa', 'Rodrigues', 'Gomes', 'Martins', 'Araújo', 'Barbosa',
+              'Ribeiro', 'Carvalho', 'Rocha', 'Dias', 'Monteiro', 'Mendes', 'Cardoso',
+              'Teixeira', 'Moreira', 'Correia', 'Nunes', 'Vieira', 'Freitas', 'Pinto']
+COURSES = ['Matemática', 'Pedagogia', 'Letras', 'História', 'Física', 'Química', 'Geografia']
+SUBJECTS = ['Cálculo I', 'Cálculo II', 'Álgebra Linear', 'Didática', 'Psicologia da Educação',
+            'Estágio Supervisionado', 'Metodologia Científica', 'Libras', 'Estatística',
+            'Políticas Educacionais', 'Leitura e Produção de Textos', 'Física Geral']
+SUFFIXES = ['', '', ' pdf-a', ' scan', ' frente e verso', ' v2']
+
+# Tipo → rótulos usados no nome do arquivo
+LABELS = {
+    'oficio': ['OFICIO', 'Ofício'],
+    'termo': ['TERMO', 'Termo'],
+    'identidade': ['RG', 'Identidade'],
+    'cpf': ['CPF', 'C.P.F'],
+    'certidao': ['Certidão de Nascimento', 'Certidão Casamento'],
+    'ensino_medio': ['Ensino Médio', 'Certificado Ensino Medio'],
+    'historico_graduacao': ['Histórico Escolar', 'Historico Escolar'],
+    'historico_aproveitamento': ['Histórico Aproveitamento', 'Aproveitamento de Estudos'],
+    'diploma': ['Diploma', 'DIPLOMA'],
+    'taxa': ['GRU', 'Taxa GRU'],
+}
+DOCUMENT_TYPES = tuple(LABELS)
+
+# Tipos cujo rótulo no nome do arquivo é seguido do nome do aluno (ver extract_name_from_text)
+NAMED_LABELS = ('oficio', 'termo', 'historico_graduacao')
+
+
+def _student(rng: random.Random, used_ras: set) -> Dict[str, str]:
+    name = ' '.join([rng.choice(FIRST_NAMES)] + rng.sample(LAST_NAMES, rng.randint(2, 3)))
+    while True:
+        ra = f"{rng.randint(1000, 99999):05d}"
+        if ra not in used_ras:
+            used_ras.add(ra)
+            return {'name': name, 'ra': ra, 'course': rng.choice(COURSES)}
+
+
+def _date(rng: random.Random) -> str:
+    return f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/{rng.randint(2015, 2024)}"
+
+
+def document_pages(doc_type: str, student: Dict[str, str], ra_in_text: bool,
+                   rng: random.Random, max_pages: int = DEFAULT_PAGES) -> List[str]:
+    """Texto de cada página de um documento"""
+    nome = student['name']
+    ra_line = f"RA: {student['ra']}" if ra_in_text else ""
+
+    if doc_type == 'oficio':
+        first = (f"OFÍCIO Nº {rng.randint(1, 999)}/{rng.randint(2015, 2024)}\n"
+                 f"Assunto: encaminhamento de documentação acadêmica\n"
+                 f"Nome: {nome}\n{ra_line}\n"
+                 f"Encaminhamos a documentação do(a) aluno(a) acima para as providências cabíveis.")
+    elif doc_type == 'termo':
+        first = (f"TERMO DE RESPONSABILIDADE\n"
+                 f"Eu, {nome}\n{ra_line}\n"
+                 f"declaro serem verdadeiras as informações e documentos apresentados.")
+    elif doc_type == 'identidade':
+        first = (f"REPÚBLICA FEDERATIVA DO BRASIL\nCARTEIRA DE IDENTIDADE\n"
+                 f"Registro Geral: {rng.randint(10, 99)}.{rng.randint(100, 999)}.{rng.randint(100, 999)}-{rng.randint(0, 9)}\n"
+                 f"Nome: {nome}\nData de expedição: {_date(rng)}")
+    elif doc_type == 'cpf':
+        first = (f"MINISTÉRIO DA FAZENDA\nRECEITA FEDERAL DO BRASIL\n"
+                 f"Cadastro de Pessoa Física - CPF\n"
+                 f"Número de inscrição: {rng.randint(100, 999)}.{rng.randint(100, 999)}."
+                 f"{rng.randint(100, 999)}-{rng.randint(10, 99)}\nNome: {nome}")
+    elif doc_type == 'certidao':
+        first = (f"REGISTRO CIVIL DAS PESSOAS NATURAIS\nCERTIDÃO DE NASCIMENTO\n"
+                 f"Nome: {nome}\nData do registro: {_date(rng)}")
+    elif doc_type == 'ensino_medio':
+        first = (f"CERTIFICADO DE CONCLUSÃO DO ENSINO MÉDIO\n"
+                 f"Nome: {nome}\n"
+                 f"concluiu o ensino médio em {rng.randint(2010, 2019)}, fazendo jus a este certificado.")
+    elif doc_type == 'historico_graduacao':
+        first = (f"HISTÓRICO ESCOLAR\nCurso: Licenciatura em {student['course']}\n"
+                 f"Nome: {nome}\n{ra_line}")
+    elif doc_type == 'historico_aproveitamento':
+        first = (f"HISTÓRICO DE APROVEITAMENTO DE ESTUDOS\n"
+                 f"Nome: {nome}\n{ra_line}\n"
+                 f"Disciplinas cursadas em outra instituição, aproveitadas na transferência.")
+    elif doc_type == 'diploma':
+        first = (f"DIPLOMA\nO Reitor da Universidade confere a\nNome: {nome}\n"
+                 f"o título de Licenciado(a) em {student['course']}.\n{ra_line}")
+    elif doc_type == 'taxa':
+        first = (f"GUIA DE RECOLHIMENTO DA UNIÃO - GRU\nTaxa de expedição de documentos\n"
+                 f"Nome: {nome}\n{ra_line}\nValor do pagamento: R$ {rng.randint(50, 300)},00")
+    else:
+        raise ValueError(f"Tipo de documento desconhecido: {doc_type}")
+
+    pages = [first]
+    if doc_type.startswith('historico'):
+        # Históricos: várias páginas de disciplinas
+        for _ in range(rng.randint(1, max(1, max_pages - 1))):
+            pages.append("\n".join(
+                f"{rng.choice(SUBJECTS)}  {rng.randint(30, 90)}h  nota {rng.randint(60, 100) / 10:.1f}  aprovado"
+                for _ in range(30)))
+    return pages
+
+
+def _write_text_pdf(path: str, pages: List[str]):
+    import fitz  # PyMuPDF
+    doc = fitz.open()
+    for text in pages:
+        page = doc.new_page()
+        page.insert_textbox(fitz.Rect(50, 50, page.rect.width - 50, page.rect.height - 50), text, fontsize=10)
+    doc.save(path, garbage=3, deflate=True)
+    doc.close()
+
+
+def _write_scanned_pdf(path: str, pages: List[str]):
+    """PDF sem camada de texto: cada página é a imagem da página de texto"""
+    import fitz  # PyMuPDF
+    source = fitz.open()
+    doc = fitz.open()
+    for text in pages:
+        page = source.new_page()
+        page.insert_textbox(fitz.Rect(50, 50, page.rect.width - 50, page.rect.height - 50), text, fontsize=10)
+        pixmap = page.get_pixmap(dpi=100, colorspace=fitz.csGRAY)
+        doc.new_page(width=page.rect.width, height=page.rect.height).insert_image(page.rect, pixmap=pixmap)
+    doc.save(path, garbage=3, deflate=True)
+    doc.close()
+    source.close()
+
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '</Relationships>'
+)
+
+
+def _write_ooxml(path: str, pages: List[str]):
+    """Documento do Word mínimo (um parágrafo por linha)"""
+    paragraphs = "".join(
+        f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>'
+        for text in pages for line in text.split("\n")
+    )
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f'<w:body>{paragraphs}</w:body></w:document>'
+    )
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as package:
+        package.writestr('[Content_Types].xml', _CONTENT_TYPES)
+        package.writestr('_rels/.rels', _RELS)
+        package.writestr('word/document.xml', document)
+
+
+WRITERS = {'pdf': _write_text_pdf, 'scan': _write_scanned_pdf, 'docx': _write_ooxml, 'doc': _write_ooxml}
+
+
+def load_manifest(directory: str) -> Optional[Dict]:
+    """Manifesto de um acervo gerado (None se não houver)"""
+    path = os.path.join(directory, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def generate_corpus(directory: str, count: int, seed: int = 42,
+                    mix: Optional[Dict[str, float]] = None,
+                    pages: int = DEFAULT_PAGES) -> Dict:
+    """
+    Gera (ou reaproveita) um acervo sintético
+
+    Args:
+        directory: Diretório do acervo (criado se não existir)
+        count: Quantidade de documentos
+        seed: Semente do gerador (o mesmo seed gera o mesmo acervo)
+        mix: Peso de cada formato ('pdf', 'scan', 'docx', 'doc')
+        pages: Máximo de páginas dos históricos
+
+    Returns:
+        Manifesto: parâmetros e, em 'files', nome do arquivo → {'type',
+        'ra', 'name', 'format', 'ra_in_filename', 'ra_in_text'}
+    """
+    mix = mix or DEFAULT_MIX
+    params = {'version': CORPUS_VERSION, 'count': count, 'seed': seed,
+              'mix': dict(sorted(mix.items())), 'pages': pages}
+
+    manifest = load_manifest(directory)
+    if manifest and manifest['params'] == params and all(
+            os.path.exists(os.path.join(directory, name)) for name in manifest['files']):
+        return manifest
+
+    os.makedirs(directory, exist_ok=True)
+    for name in os.listdir(directory):
+        if os.path.splitext(name)[1].lower() in ('.pdf', '.docx', '.doc') or name == MANIFEST_NAME:
+            os.remove(os.path.join(directory, name))
+
+    rng = random.Random(seed)
+    formats = list(mix)
+    weights = [mix[fmt] for fmt in formats]
+    used_ras = set()
+    files = {}
+    number = 0
+
+    while number < count:
+        student = _student(rng, used_ras)
+        # Cada aluno tem de 4 a 10 documentos; o primeiro sempre traz o RA no
+        # nome do arquivo (os demais podem depender do índice nome→RA)
+        for position in range(rng.randint(4, 10)):
+            if number >= count:
+                break
+            number += 1
+            doc_type = rng.choice(DOCUMENT_TYPES)
+            fmt = rng.choices(formats, weights)[0]
+            ra_in_filename = position == 0 or rng.random() < 0.6
+            ra_in_text = rng.random() < 0.4
+            label = rng.choice(LABELS[doc_type])
+
+            if ra_in_filename:
+                base = f"ra{student['ra']} doc{number:05d} {label}{rng.choice(SUFFIXES)}"
+            elif doc_type in NAMED_LABELS:
+                base = f"doc{number:05d} {label} {student['name'].lower()}"
+            else:
+                base = f"doc{number:05d} {label}{rng.choice(SUFFIXES)}"
+            file_name = base + EXTENSIONS[fmt]
+
+            WRITERS[fmt](os.path.join(directory, file_name),
+                         document_pages(doc_type, student, ra_in_text, rng, pages))
+            files[file_name] = {
+                'type': doc_type,
+                'ra': student['ra'],
+                'name': student['name'],
+                'format': fmt,
+                'ra_in_filename': ra_in_filename,
+                'ra_in_text': ra_in_text,
+            }
+
+    manifest = {'params': params, 'files': files}
+    with open(os.path.join(directory, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    return manifest
+
+
+def parse_mix(items: List[str]) -> Dict[str, float]:
+    """Converte ['pdf=55', 'scan=15', ...] em {'pdf': 55.0, ...}"""
+    mix = {}
+    for item in items:
+        fmt, _, weight = item.partition('=')
+        if fmt not in WRITERS or not weight:
+            raise argparse.ArgumentTypeError(f"Formato inválido: '{item}' (use {', '.join(WRITERS)})")
+        mix[fmt] = float(weight)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera um acervo sintético de documentos do E-DIPLOMA")
+    parser.add_argument('directory', help="Diretório do acervo")
+    parser.add_argument('--count', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--mix', nargs='+', default=None, metavar='FORMATO=PESO',
+                        help="Peso de cada formato (pdf, scan, docx, doc)")
+    parser.add_argument('--pages', type=int, default=DEFAULT_PAGES, help="Máximo de páginas dos históricos")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    manifest = generate_corpus(args.directory, args.count, args.seed,
+                               parse_mix(args.mix) if args.mix else None, args.pages)
+    counts = {}
+    for info in manifest['files'].values():
+        counts[info['format']] = counts.get(info['format'], 0) + 1
+    print(f"{len(manifest['files'])} documento(s) em {args.directory} ({time.perf_counter() - start:.1f}s): "
+          + ", ".join(f"{fmt} {n}" for fmt, n in sorted(counts.items())))
+
+
+if __name__ == "__main__":
+    main()
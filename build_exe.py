@@ -1,14 +1,28 @@
 """
 Script para gerar executável do DocsAnalyser usando PyInstaller
+
+Perfis de build:
+    python build_exe.py           # --onefile: um único DocsAnalyser.exe
+    python build_exe.py --onedir  # --onedir: pasta dist/DocsAnalyser/ com o .exe e as bibliotecas
+
+O executável --onefile extrai todas as bibliotecas para uma pasta temporária
+a cada abertura; o perfil --onedir abre mais rápido (nada é extraído), mas
+é distribuído como uma pasta.
 """
 
+import argparse
 import os
 import sys
 import subprocess
 from pathlib import Path
 
-def build_executable():
-    """Gera o executável do DocsAnalyser"""
+def build_executable(profile="onefile"):
+    """
+    Gera o executável do DocsAnalyser
+    
+    Args:
+        profile: "onefile" (um único .exe) ou "onedir" (pasta com o .exe)
+    """
     
     print("="*60)
     print("🔨 CONSTRUINDO EXECUTÁVEL DO DOCSANALYSER")
@@ -33,7 +47,7 @@ def build_executable():
     command = [
         "pyinstaller",
         "--name", app_name,
-        "--onefile",  # Gera um único arquivo executável
+        f"--{profile}",  # Um único arquivo executável ou uma pasta
         "--windowed",  # Sem console (apenas GUI)
         "--clean",  # Limpa cache antes de construir
         
@@ -42,8 +56,11 @@ def build_executable():
         "--add-data", f"renaming_rules.json{os.pathsep}.",
         "--add-data", f".env{os.pathsep}." if os.path.exists(".env") else "",
         
-        # Hidden imports para garantir que tudo seja incluído
+        # Hidden imports para garantir que tudo seja incluído (as bibliotecas
+        # opcionais são importadas sob demanda, pelo nome, e o PyInstaller não as detecta)
         "--hidden-import", "google.generativeai",
+        "--hidden-import", "dotenv",
+        "--hidden-import", "fitz",
         "--hidden-import", "PIL",
         "--hidden-import", "pdfplumber",
         "--hidden-import", "PyPDF2",
@@ -80,9 +97,14 @@ def build_executable():
             print("\n" + "="*60)
             print("✅ EXECUTÁVEL CRIADO COM SUCESSO!")
             print("="*60)
-            print(f"\n📁 Localização: dist/{app_name}.exe")
-            print(f"📦 Tamanho: ~{get_file_size(f'dist/{app_name}.exe')}")
-            print("\n💡 Você pode distribuir apenas o arquivo .exe para seus clientes!")
+            if profile == "onedir":
+                print(f"\n📁 Localização: dist/{app_name}/{app_name}.exe")
+                print(f"📦 Tamanho: ~{get_file_size(f'dist/{app_name}')}")
+                print(f"\n💡 Distribua a pasta dist/{app_name} inteira para seus clientes!")
+            else:
+                print(f"\n📁 Localização: dist/{app_name}.exe")
+                print(f"📦 Tamanho: ~{get_file_size(f'dist/{app_name}.exe')}")
+                print("\n💡 Você pode distribuir apenas o arquivo .exe para seus clientes!")
             print("   Não é necessário instalar Python ou bibliotecas.")
             print("="*60)
         else:
@@ -97,11 +119,15 @@ def build_executable():
 
 
 def get_file_size(filepath):
-    """Retorna tamanho do arquivo em formato legível"""
+    """Retorna tamanho do arquivo (ou da pasta) em formato legível"""
     if not os.path.exists(filepath):
         return "N/A"
     
-    size = os.path.getsize(filepath)
+    if os.path.isdir(filepath):
+        size = sum(os.path.getsize(os.path.join(root, name))
+                   for root, _, files in os.walk(filepath) for name in files)
+    else:
+        size = os.path.getsize(filepath)
     for unit in ['B', 'KB', 'MB', 'GB']:
         if size < 1024.0:
             return f"{size:.1f} {unit}"
@@ -165,6 +191,12 @@ def prepare_build():
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera o executável do DocsAnalyser")
+    parser.add_argument("--onedir", action="store_true",
+                        help="Gera uma pasta com o executável (abre mais rápido que o arquivo único)")
+    args = parser.parse_args()
+    profile = "onedir" if args.onedir else "onefile"
+    
     print("\n" + "="*60)
     print("   DOCSANALYSER - BUILD EXECUTÁVEL")
     print("="*60 + "\n")
@@ -176,6 +208,6 @@ if __name__ == "__main__":
     response = input("🔨 Deseja iniciar o build do executável? (S/N): ")
     
     if response.lower() in ['s', 'sim', 'y', 'yes']:
-        build_executable()
+        build_executable(profile)
     else:
         print("\n❌ Build cancelado pelo usuário")
@@ -0,0 +1,549 @@
+"""
+DocsAnalyser - Interface de linha de comando
+
+Execução não interativa (cron, servidores sem interface gráfica) sobre o
+DocumentAnalyzer. Não importa tkinter.
+
+Uso:
+    python -m src.cli run DIRETORIO [--workers N] [--dry-run [--plan plano.json]] [--jsonl saida.jsonl] [--resume]
+                                    [--recursive] [--include GLOB] [--exclude GLOB] [--report relatorio.json]
+    python -m src.cli watch DIRETORIO [--interval 2] [--settle 3] [--process-existing] [--jsonl saida.jsonl]
+                                      [--report relatorio.json]
+    python -m src.cli apply plano.json
+    python -m src.cli undo [DIARIO]
+    python -m src.cli recover (--resume | --rollback) [DIARIO]
+
+Cada arquivo gera um registro JSON (uma linha) com tipo, RA, origem do RA,
+tempos e nome final. Sem --jsonl (ou com --jsonl -), os registros vão para
+a saída padrão e as mensagens do processamento para a saída de erro.
+As mensagens são de nível INFO por padrão ('log_level' em settings.json);
+--verbose inclui os diagnósticos de cada arquivo (DEBUG), --quiet mostra só
+erros e --log-format json gera um objeto JSON por mensagem.
+
+Ao final, uma tabela com o tempo de cada etapa (extração, Gemini,
+identificação, busca do RA, renomeação...: quantidade, total, p50, p95 e
+máximo) e os arquivos mais lentos vai para a saída de erro; --report grava
+o mesmo relatório em JSON.
+
+Com --dry-run --plan, o plano de renomeação completo é gravado em JSON para
+revisão; o subcomando apply o executa depois, em uma única passada.
+
+As renomeações de run e apply são registradas em um diário (config/journal/,
+desativável com --no-journal): undo desfaz a última execução (ou a do
+diário informado) e recover conclui ou desfaz uma execução interrompida.
+
+O progresso de run é salvo em um checkpoint (config/checkpoints/): se a
+execução for interrompida ou terminar com falhas (ex: cota do Gemini
+esgotada), run --resume processa apenas os arquivos que faltam, sem ler de
+novo os já renomeados.
+
+watch observa um diretório de entrada (por varredura periódica, em qualquer
+sistema) e processa cada documento novo assim que ele termina de ser
+copiado, mantendo o índice nome→RA em memória entre as chegadas. Encerra
+com Ctrl+C ou SIGTERM, depois de concluir o arquivo em andamento.
+
+Códigos de saída:
+    0   todos os arquivos processados com sucesso
+    1   um ou mais arquivos falharam
+    2   erro de uso ou diretório inexistente
+    3   nenhum arquivo suportado no diretório
+    130 interrompido (Ctrl+C)
+"""
+
+import argparse
+import contextlib
+import itertools
+import json
+import os
+import signal
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from .utils.file_scanner import iter_files, scan_options
+from .utils.helpers import load_config
+from .utils.logging_setup import setup_logging, DEFAULT_LEVEL as DEFAULT_LOG_LEVEL
+
+EXIT_OK = 0
+EXIT_FAILURES = 1
+EXIT_USAGE = 2
+EXIT_NO_FILES = 3
+EXIT_INTERRUPTED = 130
+
+
+def build_record(result: Dict) -> Dict[str, Any]:
+    """Monta o registro JSON de um arquivo a partir do resultado do pipeline"""
+    outcome = result.get('outcome') or {}
+    path = Path(result['path'])
+    new_name = outcome.get('new_name')
+
+    if outcome.get('renamed'):
+        status = 'renamed'
+    elif result.get('success'):
+        status = 'planned'
+    else:
+        status = 'failed'
+
+    return {
+        'file': str(path),
+        'status': status,
+        'type': outcome.get('type'),
+        'type_source': outcome.get('type_source'),
+        'ra': outcome.get('ra'),
+        'ra_source': outcome.get('ra_source'),
+        'text_source': result.get('text_source'),
+        'new_name': new_name,
+        'new_path': str(path.parent / new_name) if new_name else None,
+        'pages': result.get('pages'),
+        'gemini_upload_bytes': result.get('gemini_upload_bytes'),
+        'message': result.get('message'),
+        'timings': {stage: round(seconds, 4) for stage, seconds in (result.get('timings') or {}).items()},
+    }
+
+
+def file_scan_options(args) -> Dict[str, Any]:
+    """Opções da busca de arquivos (settings.json, sobrescrito pelas opções da linha de comando)"""
+    options = scan_options(load_config())
+    if args.recursive is not None:
+        options['recursive'] = args.recursive
+    if args.include:
+        options['include'] = args.include
+    if args.exclude:
+        options['exclude'] = args.exclude
+    return options
+
+
+def find_files(directory: Path, args) -> Iterator[str]:
+    """Arquivos suportados do diretório"""
+    return iter_files(str(directory), **file_scan_options(args))
+
+
+def configure_logging(args):
+    """Nível e formato das mensagens do processamento (settings.json, sobrescrito pelas opções)"""
+    config = load_config()
+    if args.quiet:
+        level = 'ERROR'
+    elif args.verbose:
+        level = 'DEBUG'
+    else:
+        level = config.get('log_level', DEFAULT_LOG_LEVEL)
+    setup_logging(level, json_format=(args.log_format or config.get('log_format', 'text')) == 'json')
+
+
+def emit_report(report, args):
+    """Exibe o relatório de tempos na saída de erro (exceto com --quiet) e o grava com --report"""
+    if not args.quiet:
+        print("\n" + report.format_table() + "\n", file=sys.stderr)
+    if args.report:
+        report.save(args.report)
+        print(f"Relatório de tempos gravado em {args.report}", file=sys.stderr)
+
+
+def _reserve_stdout():
+    """
+    Reserva a saída padrão para os registros JSON
+
+    Duplica o descritor 1 para os registros e aponta o descritor 1 para a
+    saída de erro, para que nenhuma mensagem (inclusive dos processos de
+    extração) se misture aos registros.
+    """
+    sys.stdout.flush()
+    records = os.fdopen(os.dup(1), 'w', encoding='utf-8')
+    os.dup2(2, 1)
+    return records
+
+
+def run(args) -> int:
+    """Executa o subcomando run"""
+    directory = Path(args.directory)
+    if not directory.is_dir():
+        print(f"Diretório não encontrado: {directory}", file=sys.stderr)
+        return EXIT_USAGE
+
+    # A varredura é consumida pelo pipeline sob demanda; aqui só confere se há algum arquivo
+    files = find_files(directory, args)
+    first = next(files, None)
+    if first is None:
+        print("Nenhum arquivo PDF ou DOC encontrado no diretório", file=sys.stderr)
+        return EXIT_NO_FILES
+    files = itertools.chain([first], files)
+
+    if args.plan and not args.dry_run:
+        print("--plan requer --dry-run", file=sys.stderr)
+        return EXIT_USAGE
+
+    if args.resume and args.dry_run:
+        print("--resume não pode ser usado com --dry-run", file=sys.stderr)
+        return EXIT_USAGE
+
+    if args.jsonl in (None, '-'):
+        records = _reserve_stdout()
+    else:
+        records = open(args.jsonl, 'w', encoding='utf-8')
+
+    configure_logging(args)
+    log = open(os.devnull, 'w', encoding='utf-8') if args.quiet else sys.stderr
+
+    # Importado aqui para que as mensagens de importação também sigam para o log
+    with contextlib.redirect_stdout(log):
+        from .core.document_analyzer import DocumentAnalyzer
+        from .core.pipeline import ProcessingPipeline
+        from .core.timing import TimingReport
+
+        analyzer = DocumentAnalyzer(
+            use_cache=False if args.no_cache else None,
+            page_budget=args.page_budget,
+            pdf_engine=args.pdf_engine,
+            dry_run=args.dry_run
+        )
+        two_pass = args.two_pass if args.two_pass is not None else analyzer.config.get('two_pass_resolution', True)
+        workers = args.workers if args.workers is not None else analyzer.config.get('extraction_workers', 0)
+
+        if not args.dry_run and analyzer.has_checkpoint(str(directory)) and not args.resume:
+            print("Execução interrompida anterior neste diretório descartada (use --resume para retomá-la)",
+                  file=sys.stderr)
+        files = analyzer.open_checkpoint(str(directory), files, resume=args.resume)
+
+    failures = 0
+    start = time.perf_counter()
+    report = TimingReport()
+
+    def on_result(index, total, result):
+        nonlocal failures
+        if not result.get('success'):
+            failures += 1
+        report.add(result)
+        records.write(json.dumps(build_record(result), ensure_ascii=False) + "\n")
+        records.flush()
+
+    def on_file_done(index, total, file_path, success, message):
+        print(f"[{index + 1}/{total}] {'✓' if success else '✗'} {Path(file_path).name}: {message}")
+
+    if args.journal is not False and analyzer.config.get('auto_backup', True):
+        analyzer.open_journal(str(directory))
+
+    completed = False
+    successful = processed = 0
+    try:
+        with contextlib.redirect_stdout(log):
+            pipeline = ProcessingPipeline(analyzer, workers=workers, two_pass=two_pass)
+            successful, processed = pipeline.run(files, on_file_done=on_file_done, on_result=on_result)
+        completed = True
+    except KeyboardInterrupt:
+        print("Interrompido.", file=sys.stderr)
+        return EXIT_INTERRUPTED
+    finally:
+        analyzer.close_journal(completed)
+        analyzer.close_checkpoint(completed and successful == processed)
+        records.close()
+        if log is not sys.stderr:
+            log.close()
+
+    elapsed = time.perf_counter() - start
+    report.finish()
+    emit_report(report, args)
+    mode = " (simulação, nenhum arquivo renomeado)" if args.dry_run else ""
+    if args.plan:
+        analyzer.context.rename_plan.save(args.plan)
+        print(f"Plano com {len(analyzer.context.rename_plan)} renomeação(ões) gravado em {args.plan}", file=sys.stderr)
+    print(f"{successful}/{processed} arquivo(s) processado(s) com sucesso em {elapsed:.1f}s{mode}",
+          file=sys.stderr)
+
+    return EXIT_FAILURES if failures else EXIT_OK
+
+
+def watch(args) -> int:
+    """Executa o subcomando watch"""
+    directory = Path(args.directory)
+    if not directory.is_dir():
+        print(f"Diretório não encontrado: {directory}", file=sys.stderr)
+        return EXIT_USAGE
+
+    if args.jsonl in (None, '-'):
+        records = _reserve_stdout()
+    else:
+        records = open(args.jsonl, 'a', encoding='utf-8')
+
+    configure_logging(args)
+    log = open(os.devnull, 'w', encoding='utf-8') if args.quiet else sys.stderr
+
+    with contextlib.redirect_stdout(log):
+        from .core.document_analyzer import DocumentAnalyzer
+        from .core.watcher import FolderWatcher, watch_state_path, DEFAULT_INTERVAL, DEFAULT_SETTLE
+        from .core.timing import TimingReport
+        from .utils.helpers import get_config_dir
+
+        analyzer = DocumentAnalyzer(
+            use_cache=False if args.no_cache else None,
+            page_budget=args.page_budget,
+            pdf_engine=args.pdf_engine
+        )
+        config = analyzer.config
+        watcher = FolderWatcher(
+            analyzer, str(directory),
+            interval=args.interval if args.interval is not None else config.get('watch_interval_seconds',
+                                                                                 DEFAULT_INTERVAL),
+            settle=args.settle if args.settle is not None else config.get('watch_settle_seconds', DEFAULT_SETTLE),
+            workers=args.workers or 1,
+            two_pass=args.two_pass if args.two_pass is not None else config.get('two_pass_resolution', True),
+            scan_options=file_scan_options(args),
+            journal=args.journal is not False and config.get('auto_backup', True),
+            state_path=watch_state_path(get_config_dir(), str(directory)),
+            process_existing=args.process_existing
+        )
+
+    report = TimingReport()
+
+    def on_result(index, total, result):
+        report.add(result)
+        records.write(json.dumps(build_record(result), ensure_ascii=False) + "\n")
+        records.flush()
+
+    def on_file_done(index, total, file_path, success, message):
+        print(f"{'✓' if success else '✗'} {Path(file_path).name}: {message}")
+
+    # Ctrl+C e SIGTERM encerram depois do arquivo em andamento
+    signal.signal(signal.SIGINT, lambda signum, frame: watcher.stop())
+    if hasattr(signal, 'SIGTERM'):
+        signal.signal(signal.SIGTERM, lambda signum, frame: watcher.stop())
+
+    print(f"👀 Observando {directory} (varredura a cada {watcher.interval:g}s, "
+          f"arquivo estável por {watcher.settle:g}s). Ctrl+C para encerrar.", file=sys.stderr)
+    try:
+        with contextlib.redirect_stdout(log):
+            watcher.run(on_file_done=on_file_done, on_result=on_result)
+    finally:
+        records.close()
+        if log is not sys.stderr:
+            log.close()
+
+    report.finish()
+    if report.files:
+        emit_report(report, args)
+    print(f"Encerrado: {watcher.successful}/{watcher.processed} arquivo(s) processado(s) com sucesso "
+          f"em {watcher.batches} lote(s)", file=sys.stderr)
+    return EXIT_OK
+
+
+def _journal_directory() -> str:
+    from .core.rename_journal import journal_dir
+    from .utils.helpers import get_config_dir
+    return journal_dir(get_config_dir())
+
+
+def _read_journal(path: str) -> Optional[Dict[str, Any]]:
+    """Lê um diário, ou informa o erro e devolve None se ele não puder ser lido"""
+    from .core.rename_journal import read_journal
+
+    try:
+        return read_journal(path)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Não foi possível ler o diário {path}: {e}", file=sys.stderr)
+        return None
+
+
+def _print_entry(entry, success, message):
+    print(f"{'✓' if success else '✗'} {message}", file=sys.stderr)
+
+
+def apply(args) -> int:
+    """Executa o subcomando apply"""
+    from .core.rename_journal import RenameJournal
+    from .core.rename_plan import RenamePlan
+
+    try:
+        plan = RenamePlan.load(args.plan)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Não foi possível ler o plano {args.plan}: {e}", file=sys.stderr)
+        return EXIT_USAGE
+
+    journal = None
+    if args.journal is not False:
+        directories = {str(Path(entry['source']).parent) for entry in plan}
+        journal = RenameJournal.create(_journal_directory(), ", ".join(sorted(directories)))
+
+    completed = False
+    try:
+        applied, failed = plan.apply(on_entry=_print_entry, journal=journal)
+        completed = True
+    except KeyboardInterrupt:
+        print("Interrompido.", file=sys.stderr)
+        return EXIT_INTERRUPTED
+    finally:
+        if journal:
+            if completed:
+                journal.commit()
+            journal.close()
+
+    print(f"{applied}/{len(plan)} renomeação(ões) aplicada(s)", file=sys.stderr)
+    return EXIT_FAILURES if failed else EXIT_OK
+
+
+def undo(args) -> int:
+    """Executa o subcomando undo"""
+    from .core import rename_journal
+
+    path = args.journal_file
+    if path is None:
+        committed = [p for p in rename_journal.list_journals(_journal_directory())
+                     if (_read_journal(p) or {}).get('state') == 'committed']
+        if not committed:
+            print("Nenhuma execução para desfazer", file=sys.stderr)
+            return EXIT_NO_FILES
+        path = committed[-1]
+
+    info = _read_journal(path)
+    if info is None:
+        return EXIT_NO_FILES
+    print(f"Desfazendo a execução {info['run']} ({info['directory']})", file=sys.stderr)
+    undone, failed = rename_journal.undo(path, on_entry=_print_entry)
+    print(f"{undone} renomeação(ões) desfeita(s), {failed} falha(s)", file=sys.stderr)
+    return EXIT_FAILURES if failed else EXIT_OK
+
+
+def recover(args) -> int:
+    """Executa o subcomando recover"""
+    from .core import rename_journal
+
+    paths = [args.journal_file] if args.journal_file else rename_journal.find_incomplete(_journal_directory())
+    if not paths:
+        print("Nenhuma execução interrompida", file=sys.stderr)
+        return EXIT_OK
+
+    mode = 'resume' if args.resume else 'rollback'
+    total_failed = 0
+    for path in paths:
+        info = _read_journal(path)
+        if info is None:
+            total_failed += 1
+            continue
+        action = "Concluindo" if mode == 'resume' else "Desfazendo"
+        print(f"{action} a execução interrompida {info['run']} ({info['directory']})", file=sys.stderr)
+        done, failed = rename_journal.recover(path, mode, on_entry=_print_entry)
+        print(f"{done} renomeação(ões) processada(s), {failed} falha(s)", file=sys.stderr)
+        if failed:
+            print("A execução continua pendente; corrija as falhas e execute recover de novo", file=sys.stderr)
+        total_failed += failed
+
+    return EXIT_FAILURES if total_failed else EXIT_OK
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='python -m src.cli',
+        description="DocsAnalyser - processamento em lote sem interface gráfica"
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help="Processa (renomeia) os documentos de um diretório")
+    run_parser.add_argument('directory', help="Diretório com os documentos")
+    run_parser.add_argument('--workers', type=int, default=None,
+                            help="Processos de extração (0 = automático; padrão: settings.json)")
+    run_parser.add_argument('--dry-run', action='store_true',
+                            help="Calcula os novos nomes sem renomear os arquivos")
+    run_parser.add_argument('--plan', default=None, metavar='ARQUIVO',
+                            help="Com --dry-run, grava o plano de renomeação neste arquivo JSON")
+    run_parser.add_argument('--jsonl', default=None, metavar='ARQUIVO',
+                            help="Grava os registros neste arquivo (padrão ou '-': saída padrão)")
+    run_parser.add_argument('--two-pass', dest='two_pass', action='store_true', default=None,
+                            help="Resolução em duas passagens (padrão: settings.json)")
+    run_parser.add_argument('--single-pass', dest='two_pass', action='store_false',
+                            help="Resolução em uma passagem, na ordem dos arquivos")
+    run_parser.add_argument('--no-cache', action='store_true', help="Não usa o cache de extração")
+    run_parser.add_argument('--pdf-engine', choices=['auto', 'fitz', 'pdfplumber', 'pypdf2'], default=None,
+                            help="Motor de extração de PDF (padrão: settings.json)")
+    run_parser.add_argument('--page-budget', type=int, default=None,
+                            help="Páginas de PDF lidas antes de desistir da parada antecipada (0 = PDF inteiro)")
+    run_parser.add_argument('--quiet', action='store_true', help="Não exibe as mensagens do processamento")
+    run_parser.add_argument('--verbose', '-v', action='store_true',
+                            help="Exibe os diagnósticos de cada arquivo (nível DEBUG)")
+    run_parser.add_argument('--log-format', choices=['text', 'json'], default=None,
+                            help="Formato das mensagens na saída de erro (padrão: 'log_format' de settings.json)")
+    run_parser.add_argument('--no-journal', dest='journal', action='store_false', default=None,
+                            help="Não registra as renomeações no diário (não poderão ser desfeitas)")
+    run_parser.add_argument('--recursive', dest='recursive', action='store_true', default=None,
+                            help="Inclui os subdiretórios (padrão: settings.json)")
+    run_parser.add_argument('--no-recursive', dest='recursive', action='store_false',
+                            help="Apenas o diretório informado")
+    run_parser.add_argument('--include', action='append', default=None, metavar='GLOB',
+                            help="Processa apenas arquivos que casem com o padrão (pode repetir)")
+    run_parser.add_argument('--exclude', action='append', default=None, metavar='GLOB',
+                            help="Ignora arquivos e subdiretórios que casem com o padrão (pode repetir)")
+    run_parser.add_argument('--report', default=None, metavar='ARQUIVO',
+                            help="Grava o relatório de tempos por etapa em JSON")
+    run_parser.add_argument('--resume', action='store_true',
+                            help="Retoma a execução interrompida no diretório (apenas os arquivos que faltam)")
+    run_parser.set_defaults(handler=run)
+
+    watch_parser = subparsers.add_parser('watch', help="Observa um diretório e processa os documentos que chegam")
+    watch_parser.add_argument('directory', help="Diretório de entrada")
+    watch_parser.add_argument('--interval', type=float, default=None,
+                              help="Segundos entre varreduras (padrão: settings.json)")
+    watch_parser.add_argument('--settle', type=float, default=None,
+                              help="Segundos sem mudança para considerar o arquivo completo (padrão: settings.json)")
+    watch_parser.add_argument('--process-existing', action='store_true',
+                              help="Na primeira observação do diretório, processa também os arquivos já presentes")
+    watch_parser.add_argument('--workers', type=int, default=None,
+                              help="Processos de extração por lote (padrão: 1)")
+    watch_parser.add_argument('--jsonl', default=None, metavar='ARQUIVO',
+                              help="Acrescenta os registros neste arquivo (padrão ou '-': saída padrão)")
+    watch_parser.add_argument('--two-pass', dest='two_pass', action='store_true', default=None,
+                              help="Resolução em duas passagens dentro de cada lote (padrão: settings.json)")
+    watch_parser.add_argument('--single-pass', dest='two_pass', action='store_false',
+                              help="Resolução em uma passagem")
+    watch_parser.add_argument('--no-cache', action='store_true', help="Não usa o cache de extração")
+    watch_parser.add_argument('--pdf-engine', choices=['auto', 'fitz', 'pdfplumber', 'pypdf2'], default=None,
+                              help="Motor de extração de PDF (padrão: settings.json)")
+    watch_parser.add_argument('--page-budget', type=int, default=None,
+                              help="Páginas de PDF lidas antes de desistir da parada antecipada (0 = PDF inteiro)")
+    watch_parser.add_argument('--recursive', dest='recursive', action='store_true', default=None,
+                              help="Inclui os subdiretórios (padrão: settings.json)")
+    watch_parser.add_argument('--no-recursive', dest='recursive', action='store_false',
+                              help="Apenas o diretório informado")
+    watch_parser.add_argument('--include', action='append', default=None, metavar='GLOB',
+                              help="Processa apenas arquivos que casem com o padrão (pode repetir)")
+    watch_parser.add_argument('--exclude', action='append', default=None, metavar='GLOB',
+                              help="Ignora arquivos e subdiretórios que casem com o padrão (pode repetir)")
+    watch_parser.add_argument('--no-journal', dest='journal', action='store_false', default=None,
+                              help="Não registra as renomeações no diário")
+    watch_parser.add_argument('--quiet', action='store_true', help="Não exibe as mensagens do processamento")
+    watch_parser.add_argument('--verbose', '-v', action='store_true',
+                              help="Exibe os diagnósticos de cada arquivo (nível DEBUG)")
+    watch_parser.add_argument('--log-format', choices=['text', 'json'], default=None,
+                              help="Formato das mensagens na saída de erro (padrão: 'log_format' de settings.json)")
+    watch_parser.add_argument('--report', default=None, metavar='ARQUIVO',
+                              help="Grava, ao encerrar, o relatório de tempos por etapa em JSON")
+    watch_parser.set_defaults(handler=watch)
+
+    apply_parser = subparsers.add_parser('apply', help="Executa um plano gravado por run --dry-run --plan")
+    apply_parser.add_argument('plan', help="Arquivo JSON do plano")
+    apply_parser.add_argument('--no-journal', dest='journal', action='store_false', default=None,
+                              help="Não registra as renomeações no diário")
+    apply_parser.set_defaults(handler=apply)
+
+    undo_parser = subparsers.add_parser('undo', help="Desfaz as renomeações de uma execução")
+    undo_parser.add_argument('journal_file', nargs='?', default=None, metavar='DIARIO',
+                             help="Diário da execução (padrão: a última concluída)")
+    undo_parser.set_defaults(handler=undo)
+
+    recover_parser = subparsers.add_parser('recover', help="Recupera execuções interrompidas")
+    recover_mode = recover_parser.add_mutually_exclusive_group(required=True)
+    recover_mode.add_argument('--resume', action='store_true', help="Conclui as renomeações pendentes")
+    recover_mode.add_argument('--rollback', action='store_true', help="Desfaz a execução")
+    recover_parser.add_argument('journal_file', nargs='?', default=None, metavar='DIARIO',
+                                help="Diário da execução (padrão: todas as interrompidas)")
+    recover_parser.set_defaults(handler=recover)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    import multiprocessing
+    multiprocessing.freeze_support()
+    sys.exit(main())
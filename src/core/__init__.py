@@ -2,6 +2,13 @@
 Core module - Lógica principal do sistema
 """
 
-from .document_analyzer import DocumentAnalyzer
-
 __all__ = ['DocumentAnalyzer']
+
+
+def __getattr__(name):
+    # Importado no primeiro acesso: importar um submódulo leve (ex: src.core.timing)
+    # não carrega o analisador inteiro
+    if name == 'DocumentAnalyzer':
+        from .document_analyzer import DocumentAnalyzer
+        return DocumentAnalyzer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
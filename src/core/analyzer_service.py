@@ -0,0 +1,167 @@
+"""
+Analisador mantido entre execuções
+
+AnalyzerService guarda um DocumentAnalyzer já carregado (regras compiladas,
+modelo do Gemini e agendador, cache de extração aberto), o índice nome→RA
+das execuções anteriores e o pool de processos de extração, para que execuções
+seguidas (ex: cada clique em "Processar" na janela) comecem sem recarregar
+nada. A cada execução as opções escolhidas são aplicadas com
+DocumentAnalyzer.configure, e as regras só são relidas se
+renaming_rules.json tiver sido modificado.
+
+Cada execução recebe seu próprio RunContext, que parte de uma cópia do
+índice nome→RA das execuções já terminadas; ao fim da execução os arquivos
+que ela processou entram nesse índice. Execuções com as mesmas opções rodam
+ao mesmo tempo; uma execução com outras opções aguarda as que estão em
+andamento terminarem antes de reconfigurar o analisador. Outros lotes (ex:
+uma pasta observada por FolderWatcher) também podem usar o mesmo analisador
+com seus próprios contextos.
+"""
+
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Iterator, Optional, Tuple
+
+from .document_analyzer import DocumentAnalyzer
+from .pipeline import ProcessingPipeline, create_executor, default_worker_count
+from .run_context import RunContext
+
+
+logger = logging.getLogger(__name__)
+
+
+class AnalyzerService:
+    """Analisador e pool de extração compartilhados pelas execuções da aplicação"""
+
+    def __init__(self, gemini_client=None):
+        """
+        Args:
+            gemini_client: Modelo usado no lugar do Gemini configurado pelo .env
+                (ver DocumentAnalyzer)
+        """
+        self.gemini_client = gemini_client
+        self.history = RunContext()  # Índice nome→RA das execuções terminadas (ver session)
+        self._analyzer: Optional[DocumentAnalyzer] = None
+        self._options = None  # Opções aplicadas ao analisador
+        self._sessions = 0  # Execuções em andamento
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_workers = 0
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+
+    @property
+    def loaded(self) -> bool:
+        """Indica se o analisador já foi criado"""
+        return self._analyzer is not None
+
+    @contextmanager
+    def session(self, use_cache: Optional[bool] = None, page_budget: Optional[int] = None,
+                pdf_engine: Optional[str] = None,
+                dry_run: bool = False) -> Iterator[Tuple[DocumentAnalyzer, RunContext]]:
+        """
+        Reserva o analisador para uma execução
+
+        Na primeira execução o analisador é criado; nas seguintes apenas as
+        opções são aplicadas (argumentos como em DocumentAnalyzer). O lock só
+        é mantido enquanto o analisador é criado ou configurado: execuções com
+        as mesmas opções rodam ao mesmo tempo, e uma execução com outras opções
+        aguarda as demais terminarem.
+
+        Yields:
+            Tupla (DocumentAnalyzer compartilhado, RunContext da execução com
+            o índice nome→RA das execuções anteriores)
+        """
+        options = (use_cache, page_budget, pdf_engine)
+        with self._idle:
+            while self._sessions and options != self._options:
+                self._idle.wait()
+            if self._analyzer is None:
+                self._analyzer = DocumentAnalyzer(use_cache=use_cache, page_budget=page_budget,
+                                                  pdf_engine=pdf_engine, gemini_client=self.gemini_client)
+            elif not self._sessions:
+                self._analyzer.configure(use_cache=use_cache, page_budget=page_budget, pdf_engine=pdf_engine)
+            self._options = options
+            self._sessions += 1
+            analyzer = self._analyzer
+
+            context = RunContext(dry_run=dry_run)
+            inherited = dict(self.history.processed_files)
+            context.processed_files = dict(inherited)
+            context.name_index = self.history.name_index.copy()
+
+        try:
+            yield analyzer, context
+        finally:
+            with self._idle:
+                # Só os registros criados ou alterados nesta execução, para não
+                # desfazer os de execuções simultâneas terminadas antes
+                for file_name, entry in context.processed_files.items():
+                    if inherited.get(file_name) is not entry:
+                        self.history.register_processed_file(file_name, entry['nome'], entry['ra'],
+                                                             entry['novo_nome'])
+                self._sessions -= 1
+                self._idle.notify_all()
+
+    def pipeline(self, context: RunContext, workers: Optional[int] = None,
+                 two_pass: bool = False) -> ProcessingPipeline:
+        """
+        Pipeline de uma execução (chamar dentro de session) com o pool compartilhado
+
+        Args:
+            context: RunContext recebido de session
+            workers: Processos de extração (None ou 0 = automático)
+            two_pass: Ver ProcessingPipeline
+        """
+        if self._analyzer is None:
+            raise RuntimeError("pipeline() deve ser chamado dentro de session()")
+        workers = workers if workers and workers > 0 else default_worker_count()
+        with self._lock:
+            executor = self._shared_executor(workers)
+        return ProcessingPipeline(self._analyzer, workers=workers, two_pass=two_pass,
+                                  executor=executor, context=context,
+                                  on_broken_pool=self._discard_executor)
+
+    def _shared_executor(self, workers: int) -> Optional[ProcessPoolExecutor]:
+        """Pool de extração reaproveitado (None com um único processo ou para um pool próprio)"""
+        if workers <= 1:
+            return None
+
+        if self._executor is not None and self._executor_workers != workers:
+            if self._sessions > 1:
+                # Outra execução usa o pool atual: esta cria um pool próprio
+                return None
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+        if self._executor is None:
+            self._executor = create_executor(workers)
+            self._executor_workers = workers
+        return self._executor
+
+    def _discard_executor(self, executor: ProcessPoolExecutor):
+        """Descarta o pool compartilhado quebrado (a próxima execução cria outro)"""
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+        logger.warning("⚠️  Pool de extração interrompido; um novo será criado na próxima execução")
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        """Encerra o pool de extração, o agendador do Gemini e o cache"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+            analyzer = self._analyzer
+            self._analyzer = None
+            if analyzer is None:
+                return
+            if analyzer.gemini_scheduler:
+                analyzer.gemini_scheduler.shutdown(wait=False)
+            if analyzer.cache:
+                analyzer.cache.close()
+                analyzer.cache = None
@@ -0,0 +1,196 @@
+"""
+Cache persistente de extração indexado pelo hash do conteúdo dos arquivos
+
+Guarda em SQLite o texto extraído e o resultado do Gemini (texto, tipo) de
+cada documento. A chave é o SHA-256 dos bytes do arquivo, então um arquivo
+renomeado continua encontrando sua entrada; entradas gravadas por outra
+versão dos extratores (ou com outro motor de PDF) são ignoradas.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Optional
+
+from .extractors import EXTRACTOR_VERSION, extractor_version
+
+
+DEFAULT_MAX_SIZE_MB = 512
+DEFAULT_MAX_AGE_DAYS = 90
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS extraction_cache (
+    content_hash TEXT PRIMARY KEY,
+    extractor_version TEXT NOT NULL,
+    text TEXT,
+    gemini_text TEXT,
+    gemini_type TEXT,
+    size INTEGER NOT NULL DEFAULT 0,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+)
+"""
+
+
+def hash_file(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Calcula o SHA-256 do conteúdo de um arquivo"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """Cache de texto extraído e respostas do Gemini em um arquivo SQLite"""
+
+    def __init__(self,
+                 path: str,
+                 max_size_mb: float = DEFAULT_MAX_SIZE_MB,
+                 max_age_days: float = DEFAULT_MAX_AGE_DAYS,
+                 read_only: bool = False,
+                 version: Optional[str] = None):
+        """
+        Args:
+            path: Caminho do arquivo SQLite
+            max_size_mb: Tamanho máximo (texto armazenado) antes da remoção por LRU
+            max_age_days: Idade máxima (desde o último acesso) de uma entrada
+            read_only: Abre sem gravar (usado pelos processos de extração)
+            version: Versão do texto extraído (padrão: extractor_version())
+        """
+        self.path = path
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.max_age_seconds = max_age_days * 24 * 3600
+        self.read_only = read_only
+        self.version = version or extractor_version()
+        self._lock = threading.Lock()
+
+        if read_only:
+            uri = 'file:' + os.path.abspath(path).replace('\\', '/') + '?mode=ro'
+            self._conn = sqlite3.connect(uri, uri=True, timeout=30, check_same_thread=False)
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(_SCHEMA)
+            self._conn.commit()
+
+    def get(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        """Retorna a entrada do hash (ou None se ausente/de outra versão do extrator)"""
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT text, gemini_text, gemini_type FROM extraction_cache "
+                    "WHERE content_hash = ? AND extractor_version = ?",
+                    (content_hash, self.version)
+                ).fetchone()
+            except sqlite3.Error:
+                return None
+
+            if row is None:
+                return None
+
+            if not self.read_only:
+                self._conn.execute(
+                    "UPDATE extraction_cache SET accessed = ? WHERE content_hash = ?",
+                    (time.time(), content_hash)
+                )
+
+        return {'text': row[0], 'gemini_text': row[1], 'gemini_type': row[2]}
+
+    def put_text(self, content_hash: str, text: str):
+        """Armazena o texto extraído de um documento"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO extraction_cache "
+                "(content_hash, extractor_version, text, size, created, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(content_hash) DO UPDATE SET "
+                "extractor_version = excluded.extractor_version, text = excluded.text, "
+                "size = excluded.size, accessed = excluded.accessed",
+                (content_hash, self.version, text, len(text.encode('utf-8')), now, now)
+            )
+
+    def put_gemini(self, content_hash: str, gemini_text: str, gemini_type: str):
+        """
+        Armazena o resultado do Gemini (texto e tipo) de um documento
+
+        Cria a entrada se ela não existir (ex: leitura parcial, cujo texto não
+        é armazenado); o texto de outra versão do extrator é descartado.
+        """
+        now = time.time()
+        size = len(gemini_text.encode('utf-8')) if gemini_text else 0
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO extraction_cache "
+                "(content_hash, extractor_version, gemini_text, gemini_type, size, created, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(content_hash) DO UPDATE SET "
+                "text = CASE WHEN extractor_version = excluded.extractor_version THEN text END, "
+                "size = CASE WHEN extractor_version = excluded.extractor_version THEN size ELSE excluded.size END, "
+                "extractor_version = excluded.extractor_version, gemini_text = excluded.gemini_text, "
+                "gemini_type = excluded.gemini_type, accessed = excluded.accessed",
+                (content_hash, self.version, gemini_text, gemini_type, size, now, now)
+            )
+
+    def commit(self):
+        """Grava as alterações pendentes"""
+        if self.read_only:
+            return
+        with self._lock:
+            self._conn.commit()
+
+    def evict(self) -> int:
+        """
+        Remove entradas expiradas e, se necessário, as menos usadas
+
+        Returns:
+            Número de entradas removidas
+        """
+        if self.read_only:
+            return 0
+
+        with self._lock:
+            removed = self._conn.execute(
+                "DELETE FROM extraction_cache WHERE accessed < ? OR extractor_version NOT LIKE ?",
+                (time.time() - self.max_age_seconds, f"{EXTRACTOR_VERSION}-%")
+            ).rowcount
+
+            total = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM extraction_cache"
+            ).fetchone()[0]
+
+            if total > self.max_size_bytes:
+                rows = self._conn.execute(
+                    "SELECT content_hash, size FROM extraction_cache ORDER BY accessed"
+                ).fetchall()
+                to_delete = []
+                for content_hash, size in rows:
+                    if total <= self.max_size_bytes:
+                        break
+                    to_delete.append((content_hash,))
+                    total -= size
+                self._conn.executemany(
+                    "DELETE FROM extraction_cache WHERE content_hash = ?", to_delete
+                )
+                removed += len(to_delete)
+
+            self._conn.commit()
+
+        return removed
+
+    def clear(self):
+        """Remove todas as entradas do cache"""
+        with self._lock:
+            self._conn.execute("DELETE FROM extraction_cache")
+            self._conn.commit()
+
+    def close(self):
+        """Grava as alterações pendentes e fecha a conexão"""
+        self.commit()
+        with self._lock:
+            self._conn.close()
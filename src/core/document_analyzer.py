@@ -1,130 +1,297 @@
 import os
 import re
 import json
+import itertools
+import threading
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterable, List, Tuple, Optional
+from concurrent.futures import Future
 import base64
-from io import BytesIO
+import logging
 
-# Bibliotecas necessárias (instale with pip install)
-try:
-    import PyPDF2
-    import pdfplumber
-except ImportError:
-    print("Para PDFs, instale: pip install PyPDF2 pdfplumber")
+from . import extractors, page_render, text_patterns
+from .keyword_matcher import KeywordMatcher
+from .document_facts import DocumentFacts
+from .cache import ExtractionCache, DEFAULT_MAX_SIZE_MB, DEFAULT_MAX_AGE_DAYS
+from .gemini_scheduler import (GeminiScheduler, DEFAULT_MAX_IN_FLIGHT, DEFAULT_REQUESTS_PER_MINUTE,
+                               DEFAULT_TOKENS_PER_MINUTE, DEFAULT_MAX_RETRIES)
+from .gemini_batch import GeminiBatcher, DEFAULT_BATCH_SIZE, DEFAULT_BATCH_MAX_MB
+from .gemini_client import LazyGeminiModel, gemini_api_key, sdk_available
+from ..utils.helpers import load_config, get_config_dir
+from ..utils.file_scanner import iter_files, scan_options
+from ..utils.logging_setup import setup_logging, DEFAULT_LEVEL as DEFAULT_LOG_LEVEL
+from .pipeline import ProcessingPipeline
+from .timing import TimingReport, collect, stage, timed
+from .run_context import RunContext
+from .rename_journal import RenameJournal, journal_dir, prune_journals, DEFAULT_FSYNC_EVERY, DEFAULT_KEEP_JOURNALS
+from .run_checkpoint import (RunCheckpoint, checkpoint_dir, checkpoint_path, read_checkpoint, remaining_files,
+                             gemini_result, DEFAULT_CHECKPOINT_EVERY)
 
-try:
-    from docx import Document
-except ImportError:
-    print("Para arquivos Word, instale: pip install python-docx")
+logger = logging.getLogger(__name__)
 
-try:
-    import docx2txt
-except ImportError:
-    print("Para arquivos .doc, instale: pip install docx2txt")
+RULES_FILE = 'renaming_rules.json'
 
-try:
-    import google.generativeai as genai
-    from dotenv import load_dotenv
-    from PIL import Image
-    GEMINI_AVAILABLE = True
-except ImportError:
-    print("Para usar Gemini AI com PDFs escaneados, instale: pip install google-generativeai python-dotenv pillow")
-    GEMINI_AVAILABLE = False
+# Instruções do prompt de análise do Gemini (comuns à análise individual e em lote)
+GEMINI_INSTRUCTIONS = """INSTRUÇÕES CRÍTICAS - SIGA À RISCA:
 
-# Carregar variáveis de ambiente
-load_dotenv()
+1. TIPO DE DOCUMENTO - Responda EXATAMENTE com uma destas palavras (sem aspas):
+   oficio - Se for um ofício de encaminhamento
+   termo - Se for termo de responsabilidade ou compromisso
+   identidade - Se for RG, Carteira de Identidade, Cédula de Identidade
+   cpf - Se for Cadastro de Pessoa Física, documento com CPF
+   certidao - Se for certidão de nascimento, casamento ou óbito
+   ensino_medio - Se for histórico/certificado/boletim de Ensino Médio, 2º Grau, Segundo Grau
+   historico_graduacao - Se for histórico escolar de faculdade/universidade/graduação/bacharelado
+   historico_aproveitamento - Se for histórico de aproveitamento ou transferência entre instituições
+   diploma - Se for diploma de graduação ou pós-graduação
+   taxa - Se for GRU, taxa, boleto, comprovante de pagamento
+
+DICAS IMPORTANTES:
+- HISTÓRICO com "Ensino Médio" ou "2º Grau" → ensino_medio
+- HISTÓRICO com "Graduação" ou "Universidade" → historico_graduacao
+- Se tem número de CPF (xxx.xxx.xxx-xx) e título "CPF" → cpf
+- Documento de identidade com foto → identidade
+- Certidões têm carimbos de cartório → certidao
+
+2. RA - Procure o número de matrícula/RA do aluno (4-6 dígitos)
+   Também olhe no nome do arquivo (ex: ra03013)
+
+3. NOME - Nome completo da pessoa (aluno/titular do documento)
+
+"""
 
 class DocumentAnalyzer:
-    def __init__(self):
+    def __init__(self, use_cache: Optional[bool] = None, page_budget: Optional[int] = None,
+                 pdf_engine: Optional[str] = None, gemini_client=None, dry_run: bool = False):
+        """
+        Args:
+            use_cache: Usa o cache de extração (None = conforme 'cache_enabled' em settings.json)
+            page_budget: Páginas de PDF lidas antes de desistir da parada antecipada
+                (None = conforme 'pdf_page_budget'; 0 = sempre lê o PDF inteiro)
+            pdf_engine: Motor de extração de PDF: 'auto', 'fitz', 'pdfplumber'
+                ou 'pypdf2' (None = conforme 'pdf_engine')
+            gemini_client: Modelo usado no lugar do Gemini configurado pelo .env
+                (qualquer objeto com generate_content, ex: um modelo falso em testes)
+            dry_run: Simula o processamento sem renomear os arquivos (contexto
+                padrão); as renomeações calculadas ficam em self.context.rename_plan
+        """
+        # Configuração: carregada uma vez e mantida entre execuções (ver configure)
+        self.config = load_config()
         self.rules = {}
+        self.rules_path = os.path.abspath(RULES_FILE)  # Resolvido na criação (independe do diretório atual depois)
+        self.rules_mtime = None  # Data de modificação do arquivo de regras carregado (ver reload_rules_if_changed)
+        self.keyword_matcher = KeywordMatcher({})  # Regras compiladas para identify_document_type
         self.gemini_model = None
-        self.processed_files = {}  # Armazena informações dos arquivos já processados
+        self.gemini_scheduler = None  # Requisições concorrentes ao Gemini (ver setup_gemini_scheduler)
+        self.gemini_batcher = None  # Análise em lote (None = um documento por requisição)
+        self.cache = None  # Cache de extração por hash de conteúdo (None = desativado)
+        self.page_budget = 0
+        self.pdf_engine = extractors.DEFAULT_PDF_ENGINE
+        self._rules_lock = threading.Lock()
+        
+        # Estado da execução: índice nome→RA, nomes ocupados, plano, diário e
+        # checkpoint ficam em um RunContext passado aos métodos de resolução.
+        # Este é o contexto usado quando nenhum é informado (process_file,
+        # process_directory); lotes simultâneos usam cada um o seu.
+        self.context = RunContext(dry_run)
+        
         self.load_rules()
-        self.setup_gemini()
+        if gemini_client is not None:
+            self.gemini_model = gemini_client
+        else:
+            self.setup_gemini()
+        if self.gemini_model:
+            self.setup_gemini_scheduler()
+        self.configure(use_cache=use_cache, page_budget=page_budget, pdf_engine=pdf_engine)
+    
+    def configure(self, use_cache: Optional[bool] = None, page_budget: Optional[int] = None,
+                  pdf_engine: Optional[str] = None):
+        """
+        Aplica as opções de uma execução sem recarregar o analisador
+        
+        Regras compiladas e Gemini são mantidos; o cache de
+        extração só é reaberto se for ativado/desativado ou se o motor de PDF
+        mudar. Argumentos None seguem settings.json.
+        """
+        self.page_budget = page_budget if page_budget is not None else self.config.get('pdf_page_budget', 0)
+        pdf_engine = pdf_engine or self.config.get('pdf_engine', extractors.DEFAULT_PDF_ENGINE)
+        if pdf_engine not in extractors.PDF_ENGINE_CHAINS:
+            logger.warning("⚠️  Motor de PDF desconhecido '%s', usando '%s'",
+                           pdf_engine, extractors.DEFAULT_PDF_ENGINE)
+            pdf_engine = extractors.DEFAULT_PDF_ENGINE
+        self.pdf_engine = pdf_engine
+        
+        if use_cache is None:
+            use_cache = self.config.get('cache_enabled', True)
+        if self.cache and (not use_cache or self.cache.version != extractors.extractor_version(pdf_engine)):
+            self.cache.close()
+            self.cache = None
+        if use_cache and not self.cache:
+            self.setup_cache()
+    
+    def setup_cache(self):
+        """Abre o cache persistente de extração (config/extraction_cache.sqlite3)"""
+        config = self.config
+        try:
+            self.cache = ExtractionCache(
+                os.path.join(get_config_dir(), 'extraction_cache.sqlite3'),
+                max_size_mb=config.get('cache_max_size_mb', DEFAULT_MAX_SIZE_MB),
+                max_age_days=config.get('cache_max_age_days', DEFAULT_MAX_AGE_DAYS),
+                version=extractors.extractor_version(self.pdf_engine)
+            )
+        except Exception as e:
+            logger.warning("⚠️  Cache de extração indisponível: %s", e)
+            self.cache = None
+    
+    @property
+    def cache_path(self) -> Optional[str]:
+        """Caminho do cache de extração (None se o cache estiver desativado)"""
+        return self.cache.path if self.cache else None
+    
+    def extraction_options(self) -> Dict:
+        """Argumentos de extractors.extract_document para este analisador"""
+        return {
+            'cache_path': self.cache_path,
+            'page_budget': self.page_budget or None,
+            'matcher': self.keyword_matcher if self.page_budget else None,
+            'pdf_engine': self.pdf_engine,
+        }
     
     def setup_gemini(self):
-        """Configura a API do Gemini se disponível"""
-        if not GEMINI_AVAILABLE:
-            print("⚠️  Gemini AI não disponível. PDFs escaneados não poderão ser processados.")
+        """
+        Configura a API do Gemini se disponível
+        
+        O SDK só é importado na primeira análise (ver gemini_client.LazyGeminiModel):
+        aqui apenas se verifica se ele está instalado e se há chave de API.
+        """
+        if not sdk_available():
+            logger.warning("⚠️  Gemini AI não disponível. PDFs escaneados não poderão ser processados. "
+                           "Para usar Gemini AI, instale: pip install google-generativeai python-dotenv pillow")
             return
         
-        api_key = os.getenv('GEMINI_API_KEY')
-        if not api_key or api_key == 'your_gemini_api_key_here':
-            print("⚠️  GEMINI_API_KEY não configurada no arquivo .env")
-            print("   Configure sua chave da API para processar PDFs escaneados.")
+        api_key = gemini_api_key()
+        if not api_key:
+            logger.warning("⚠️  GEMINI_API_KEY não configurada no arquivo .env. "
+                           "Configure sua chave da API para processar PDFs escaneados.")
             return
         
-        try:
-            genai.configure(api_key=api_key)
-            
-            # Lista de modelos para tentar em ordem de preferência
-            model_names = [
-                os.getenv('GEMINI_MODEL', 'gemini-2.5-flash'),
-                'gemini-2.5-flash',
-                'gemini-2.0-flash',
-                'gemini-flash-latest',
-                'gemini-pro-latest',
-                'gemini-2.5-pro',
-                'gemini-2.0-flash-001'
-            ]
-            
-            # Tenta cada modelo até encontrar um que funcione
-            for model_name in model_names:
-                try:
-                    self.gemini_model = genai.GenerativeModel(model_name)
-                    # Testa se o modelo funciona
-                    print(f"✅ Gemini AI configurado com sucesso! Modelo: {model_name}")
-                    break
-                except Exception as model_error:
-                    if model_name == model_names[-1]:  # Último modelo da lista
-                        raise model_error
-                    continue
-                    
-        except Exception as e:
-            print(f"❌ Erro ao configurar Gemini AI: {e}")
-            print("💡 Sugestão: Verifique se sua API key está válida e tem acesso aos modelos Gemini")
+        self.gemini_model = LazyGeminiModel(api_key)
     
-    def convert_pdf_to_images(self, file_path: str) -> List[Image.Image]:
-        """Converte PDF para imagens para análise pelo Gemini"""
-        try:
-            import fitz  # PyMuPDF
-            doc = fitz.open(file_path)
-            images = []
-            
-            for page_num in range(min(3, len(doc))):  # Máximo 3 páginas
-                page = doc[page_num]
-                pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))  # 2x zoom
-                img_data = pix.tobytes("png")
-                img = Image.open(BytesIO(img_data))
-                images.append(img)
-            
-            doc.close()
-            return images
-        except ImportError:
-            print("📦 Para processar PDFs escaneados, instale: pip install PyMuPDF")
-            return []
-        except Exception as e:
-            print(f"❌ Erro ao converter PDF para imagens: {e}")
-            return []
+    def setup_gemini_scheduler(self):
+        """Cria o agendador de requisições ao Gemini com as cotas de settings.json"""
+        config = self.config
+        self.gemini_scheduler = GeminiScheduler(
+            self.gemini_model,
+            max_in_flight=config.get('gemini_max_in_flight', DEFAULT_MAX_IN_FLIGHT),
+            requests_per_minute=config.get('gemini_requests_per_minute', DEFAULT_REQUESTS_PER_MINUTE),
+            tokens_per_minute=config.get('gemini_tokens_per_minute', DEFAULT_TOKENS_PER_MINUTE),
+            max_retries=config.get('gemini_max_retries', DEFAULT_MAX_RETRIES)
+        )
+        
+        batch_size = config.get('gemini_batch_size', DEFAULT_BATCH_SIZE)
+        if batch_size > 1:
+            self.gemini_batcher = GeminiBatcher(
+                self.gemini_scheduler,
+                render=self.render_gemini_image,
+                build_contents=self.build_gemini_contents,
+                max_documents=batch_size,
+                max_payload_mb=config.get('gemini_batch_max_mb', DEFAULT_BATCH_MAX_MB)
+            )
+    
+    @property
+    def gemini_prefetch(self) -> int:
+        """Análises do Gemini a manter agendadas à frente da resolução"""
+        if not self.gemini_scheduler:
+            return 0
+        batch_size = self.gemini_batcher.max_documents if self.gemini_batcher else 1
+        return self.gemini_scheduler.max_in_flight * batch_size * 2
+    
+    @property
+    def gemini_render_options(self) -> Dict:
+        """Argumentos de page_render.render_pdf_page conforme settings.json"""
+        config = self.config
+        return {
+            'dpi': config.get('gemini_image_dpi', page_render.DEFAULT_DPI),
+            'max_side': config.get('gemini_image_max_side', page_render.DEFAULT_MAX_SIDE),
+            'grayscale': config.get('gemini_image_grayscale', False),
+            'image_format': config.get('gemini_image_format', page_render.DEFAULT_FORMAT),
+            'quality': config.get('gemini_image_quality', page_render.DEFAULT_QUALITY),
+        }
     
     def analyze_document_with_gemini(self, file_path: str) -> Tuple[str, str]:
         """Analisa documento usando Gemini AI para PDFs escaneados"""
-        if not self.gemini_model:
+        if not self.gemini_scheduler:
             return "", ""
         
+        return self.gemini_analysis_result(self.submit_gemini_analysis(file_path))
+    
+    def submit_gemini_analysis(self, file_path: str, context: Optional[RunContext] = None) -> Future:
+        """Agenda a análise de um documento no Gemini (Future com o texto da resposta)"""
+        context = context or self.context
+        return self.gemini_scheduler.submit(lambda: self.build_gemini_request(file_path, context))
+    
+    def gemini_analysis_result(self, future: Future) -> Tuple[str, str]:
+        """Aguarda uma análise agendada e faz o parse da resposta"""
+        if self.gemini_batcher and not future.done():
+            # Envia o lote incompleto em que o documento possa estar
+            self.gemini_batcher.flush()
+        
+        try:
+            response_text = future.result()
+            if response_text:
+                return self.parse_gemini_response(response_text)
+        except Exception as e:
+            logger.error("❌ Erro ao analisar com Gemini AI: %s", e)
+        
+        return "", ""
+    
+    def build_gemini_request(self, file_path: str, context: Optional[RunContext] = None) -> Optional[list]:
+        """Monta o conteúdo (prompt e imagem) da análise de um documento pelo Gemini"""
+        image = self.render_gemini_image(file_path, context)
+        if image is None:
+            return None
+        
+        return self.build_gemini_contents([(file_path, image)])
+    
+    def render_gemini_image(self, file_path: str, context: Optional[RunContext] = None) -> Optional[Dict]:
+        """
+        Imagem enviada ao Gemini para um documento
+        
+        Para PDFs renderiza apenas a primeira página (a única enviada). Os
+        bytes enviados por documento ficam em context.gemini_upload_bytes.
+        
+        Returns:
+            Blob {'mime_type', 'data'} ou None
+        """
         try:
-            # Para PDFs, converte para imagens
             if file_path.lower().endswith('.pdf'):
-                images = self.convert_pdf_to_images(file_path)
-                if not images:
-                    return "", ""
-                
-                # Usa apenas a primeira página
-                image = images[0]
+                image = page_render.render_pdf_page(file_path, **self.gemini_render_options)
             else:
                 # Para outros formatos de imagem
-                image = Image.open(file_path)
+                image = page_render.load_image_file(file_path)
+        except ImportError:
+            logger.warning("📦 Para processar PDFs escaneados, instale: pip install PyMuPDF")
+            return None
+        except Exception as e:
+            logger.error("❌ Erro ao converter PDF para imagens: %s", e)
+            return None
+        
+        if image is not None:
+            (context or self.context).gemini_upload_bytes[file_path] = len(image['data'])
+        return image
+    
+    def build_gemini_contents(self, documents: List[Tuple[str, Dict]]) -> list:
+        """
+        Monta o conteúdo de uma requisição ao Gemini
+        
+        Args:
+            documents: Pares (caminho, imagem). Com um único documento usa o
+                prompt individual; com vários, o prompt em lote, em que cada
+                imagem é precedida pelo número do documento e a resposta traz
+                um bloco 'DOCUMENTO: n' por documento (ver demultiplex_response)
+        """
+        if len(documents) == 1:
+            file_path, image = documents[0]
             
             # Prompt para extração de informações
             prompt = f"""
@@ -133,56 +300,44 @@ Analise CUIDADOSAMENTE este documento e forneça as informações solicitadas.
 
 NOME DO ARQUIVO: {file_path}
 
-INSTRUÇÕES CRÍTICAS - SIGA À RISCA:
-
-1. TIPO DE DOCUMENTO - Responda EXATAMENTE com uma destas palavras (sem aspas):
-   oficio - Se for um ofício de encaminhamento
-   termo - Se for termo de responsabilidade ou compromisso
-   identidade - Se for RG, Carteira de Identidade, Cédula de Identidade
-   cpf - Se for Cadastro de Pessoa Física, documento com CPF
-   certidao - Se for certidão de nascimento, casamento ou óbito
-   ensino_medio - Se for histórico/certificado/boletim de Ensino Médio, 2º Grau, Segundo Grau
-   historico_graduacao - Se for histórico escolar de faculdade/universidade/graduação/bacharelado
-   historico_aproveitamento - Se for histórico de aproveitamento ou transferência entre instituições
-   diploma - Se for diploma de graduação ou pós-graduação
-   taxa - Se for GRU, taxa, boleto, comprovante de pagamento
-
-DICAS IMPORTANTES:
-- HISTÓRICO com "Ensino Médio" ou "2º Grau" → ensino_medio
-- HISTÓRICO com "Graduação" ou "Universidade" → historico_graduacao
-- Se tem número de CPF (xxx.xxx.xxx-xx) e título "CPF" → cpf
-- Documento de identidade com foto → identidade
-- Certidões têm carimbos de cartório → certidao
-
-2. RA - Procure o número de matrícula/RA do aluno (4-6 dígitos)
-   Também olhe no nome do arquivo (ex: ra03013)
+{GEMINI_INSTRUCTIONS}FORMATO DE RESPOSTA OBRIGATÓRIO (copie exatamente assim):
+TIPO: [palavra_exata_da_lista]
+RA: [numero ou NÃO IDENTIFICADO]
+NOME: [nome completo ou NÃO IDENTIFICADO]
 
-3. NOME - Nome completo da pessoa (aluno/titular do documento)
+IMPORTANTE: Use APENAS as palavras exatas da lista de tipos. Não invente tipos novos!
+"""
+            
+            return [prompt, image]
+        
+        # Prompt em lote: as instruções vão uma única vez para todos os documentos
+        prompt = f"""
+Você é um especialista em análise de documentos acadêmicos brasileiros.
+Você receberá {len(documents)} documentos. Cada imagem é precedida por uma linha
+"DOCUMENTO n - ARQUIVO: nome". Analise CUIDADOSAMENTE cada documento separadamente.
 
-FORMATO DE RESPOSTA OBRIGATÓRIO (copie exatamente assim):
+{GEMINI_INSTRUCTIONS}FORMATO DE RESPOSTA OBRIGATÓRIO - um bloco por documento, na ordem (copie exatamente assim):
+DOCUMENTO: [número do documento]
 TIPO: [palavra_exata_da_lista]
 RA: [numero ou NÃO IDENTIFICADO]
 NOME: [nome completo ou NÃO IDENTIFICADO]
 
 IMPORTANTE: Use APENAS as palavras exatas da lista de tipos. Não invente tipos novos!
+Responda os {len(documents)} documentos, sem misturar informações entre eles.
 """
-            
-            response = self.gemini_model.generate_content([prompt, image])
-            
-            if response and response.text:
-                return self.parse_gemini_response(response.text)
-            
-        except Exception as e:
-            print(f"❌ Erro ao analisar com Gemini AI: {e}")
         
-        return "", ""
+        contents = [prompt]
+        for number, (file_path, image) in enumerate(documents, 1):
+            contents.append(f"DOCUMENTO {number} - ARQUIVO: {file_path}")
+            contents.append(image)
+        return contents
     
     def parse_gemini_response(self, response_text: str) -> Tuple[str, str]:
         """Faz parse da resposta do Gemini para extrair tipo, RA e nome"""
         extracted_text = ""
         document_type = ""
         
-        print(f"🤖 Resposta do Gemini:\n{response_text}\n")
+        logger.debug("🤖 Resposta do Gemini:\n%s", response_text)
         
         lines = response_text.strip().split('\n')
         
@@ -204,7 +359,7 @@ IMPORTANTE: Use APENAS as palavras exatas da lista de tipos. Não invente tipos
                 # Verifica se é um tipo válido direto
                 if tipo_raw in valid_types:
                     document_type = tipo_raw
-                    print(f"✅ Tipo identificado diretamente: {document_type}")
+                    logger.debug("✅ Tipo identificado diretamente: %s", document_type)
                 else:
                     # Tenta mapear variações para tipos válidos
                     if 'oficio' in tipo_raw or 'ofício' in tipo_raw:
@@ -232,9 +387,9 @@ IMPORTANTE: Use APENAS as palavras exatas da lista de tipos. Não invente tipos
                         document_type = 'taxa'
                     
                     if document_type:
-                        print(f"✅ Tipo mapeado: '{tipo_raw}' → '{document_type}'")
+                        logger.debug("✅ Tipo mapeado: '%s' → '%s'", tipo_raw, document_type)
                     else:
-                        print(f"⚠️  Tipo não reconhecido: '{tipo_raw}'")
+                        logger.warning("⚠️  Tipo não reconhecido: '%s'", tipo_raw)
             
             elif line.startswith('RA:'):
                 ra = line.replace('RA:', '').strip()
@@ -243,28 +398,35 @@ IMPORTANTE: Use APENAS as palavras exatas da lista de tipos. Não invente tipos
                     ra_digits = re.sub(r'\D', '', ra)
                     if ra_digits:
                         extracted_text += f"RA: {ra_digits}\n"
-                        print(f"📝 RA extraído: {ra_digits}")
+                        logger.debug("📝 RA extraído: %s", ra_digits)
             
             elif line.startswith('NOME:'):
                 nome = line.replace('NOME:', '').strip()
                 if nome and nome != "NÃO IDENTIFICADO" and nome.lower() != "não identificado":
                     extracted_text += f"Nome: {nome}\n"
-                    print(f"📝 Nome extraído: {nome}")
+                    logger.debug("📝 Nome extraído: %s", nome)
         
         if not document_type:
-            print("❌ Nenhum tipo de documento foi identificado na resposta!")
+            logger.warning("❌ Nenhum tipo de documento foi identificado na resposta do Gemini")
         
         return extracted_text.lower(), document_type
     
     def load_rules(self):
         """Carrega as regras de renomeação de um arquivo JSON ou cria regras padrão"""
+        with self._rules_lock:
+            self._load_rules()
+    
+    def _load_rules(self):
+        """Lê as regras e troca regras e regras compiladas juntas (chamar com _rules_lock)"""
         try:
-            if os.path.exists('renaming_rules.json'):
-                with open('renaming_rules.json', 'r', encoding='utf-8') as f:
-                    self.rules = json.load(f)
+            if os.path.exists(self.rules_path):
+                with open(self.rules_path, 'r', encoding='utf-8') as f:
+                    rules = json.load(f)
+                self._set_rules(rules)
+                self.rules_mtime = self._rules_file_mtime()
             else:
                 # Regras padrão para E-DIPLOMA DIGITAL
-                self.rules = {
+                rules = {
                     "oficio": {
                         "keywords": ["ofício", "oficio", "encaminhamento", "registro"],
                         "pattern": "OFI_{ra}",
@@ -326,254 +488,157 @@ IMPORTANTE: Use APENAS as palavras exatas da lista de tipos. Não invente tipos
                         "extract_matricula": True
                     }
                 }
-                self.save_rules()
+                self._set_rules(rules)
+                self._save_rules()
         except Exception as e:
-            print(f"Erro ao carregar regras: {e}")
+            logger.error("Erro ao carregar regras: %s", e)
+    
+    def _set_rules(self, rules: Dict):
+        """
+        Substitui as regras e as regras compiladas (chamar com _rules_lock)
+        
+        O dicionário e o KeywordMatcher são montados antes e nunca alterados
+        depois de publicados: uma classificação em andamento continua com o
+        par anterior.
+        """
+        matcher = KeywordMatcher(rules)
+        self.rules, self.keyword_matcher = rules, matcher
     
     def save_rules(self):
         """Salva as regras no arquivo JSON"""
+        with self._rules_lock:
+            self._save_rules()
+    
+    def _save_rules(self):
+        """Grava as regras atuais (chamar com _rules_lock)"""
         try:
-            with open('renaming_rules.json', 'w', encoding='utf-8') as f:
+            with open(self.rules_path, 'w', encoding='utf-8') as f:
                 json.dump(self.rules, f, ensure_ascii=False, indent=2)
+            self.rules_mtime = self._rules_file_mtime()
         except Exception as e:
-            print(f"Erro ao salvar regras: {e}")
+            logger.error("Erro ao salvar regras: %s", e)
+    
+    def _rules_file_mtime(self) -> Optional[int]:
+        """Data de modificação do arquivo de regras (None se não existir)"""
+        try:
+            return os.stat(self.rules_path).st_mtime_ns
+        except OSError:
+            return None
+    
+    def reload_rules_if_changed(self) -> bool:
+        """
+        Recarrega e recompila as regras se o arquivo mudou desde a última leitura
+        
+        Returns:
+            True se as regras foram recarregadas
+        """
+        with self._rules_lock:
+            if self._rules_file_mtime() == self.rules_mtime:
+                return False
+            self._load_rules()
+        logger.info("📋 Regras de renomeação recarregadas de %s", self.rules_path)
+        return True
     
     def add_rule(self, document_type: str, keywords: List[str], pattern: str, extract_name: bool = True, extract_matricula: bool = True):
         """Adiciona uma nova regra de renomeação"""
-        self.rules[document_type] = {
-            "keywords": keywords,
-            "pattern": pattern,
-            "extract_name": extract_name,
-            "extract_matricula": extract_matricula
-        }
-        self.save_rules()
-        print(f"Regra adicionada para '{document_type}': {pattern}")
+        with self._rules_lock:
+            rules = dict(self.rules)
+            rules[document_type] = {
+                "keywords": keywords,
+                "pattern": pattern,
+                "extract_name": extract_name,
+                "extract_matricula": extract_matricula
+            }
+            self._set_rules(rules)
+            self._save_rules()
+        logger.info("Regra adicionada para '%s': %s", document_type, pattern)
     
     def extract_text_from_pdf_only(self, file_path: str) -> str:
         """Extrai texto de arquivo PDF (sem usar Gemini)"""
-        text = ""
-        try:
-            # Tentativa 1: pdfplumber (melhor para layouts complexos)
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-        except:
-            try:
-                # Tentativa 2: PyPDF2 (fallback)
-                with open(file_path, 'rb') as file:
-                    pdf_reader = PyPDF2.PdfReader(file)
-                    for page in pdf_reader.pages:
-                        text += page.extract_text() + "\n"
-            except Exception as e:
-                print(f"Erro ao extrair texto do PDF {file_path}: {e}")
-        
-        return text.lower()
+        return extractors.extract_text_from_pdf(file_path, self.pdf_engine)
     
     def extract_text_from_docx(self, file_path: str) -> str:
         """Extrai texto de arquivo DOCX"""
-        try:
-            doc = Document(file_path)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text.lower()
-        except Exception as e:
-            print(f"Erro ao extrair texto do DOCX {file_path}: {e}")
-            return ""
+        return extractors.extract_text_from_docx(file_path)
     
     def extract_text_from_doc(self, file_path: str) -> str:
         """Extrai texto de arquivo DOC (formato antigo)"""
-        try:
-            text = docx2txt.process(file_path)
-            return text.lower() if text else ""
-        except Exception as e:
-            print(f"Erro ao extrair texto do DOC {file_path}: {e}")
-            return ""
+        return extractors.extract_text_from_doc(file_path)
     
     def extract_matricula_from_filename(self, filename: str) -> Optional[str]:
         """Extrai matrícula (RA) do nome do arquivo usando padrões como 'ra03013'"""
-        # Padrões para identificar matrículas no nome do arquivo
-        # Ordem importante: do mais específico para o menos específico
-        patterns = [
-            r'ra(\d{6})',  # ra seguido de 6 dígitos (ex: ra123456)
-            r'ra(\d{5})',  # ra seguido de 5 dígitos (ex: ra03013)
-            r'ra(\d{4})',  # ra seguido de 4 dígitos (ex: ra1234)
-            r'mat(\d+)',   # mat seguido de números (ex: mat12345)
-            r'matricula[_\-]?(\d+)',  # matricula seguido de números
-        ]
-        
-        filename_lower = filename.lower()
-        for pattern in patterns:
-            match = re.search(pattern, filename_lower)
-            if match:
-                return match.group(1)
-        
-        return None
+        return text_patterns.extract_matricula_from_filename(filename)
     
     def extract_matricula_from_text(self, text: str) -> Optional[str]:
         """Extrai matrícula (RA) do conteúdo do texto do documento"""
-        # Padrões para identificar RA no texto do documento
-        patterns = [
-            r'ra[:\s]+(\d{6})',      # RA: 123456 ou RA 123456
-            r'ra[:\s]+(\d{5})',      # RA: 12345
-            r'ra[:\s]+(\d{4})',      # RA: 1234
-            r'r\.?a\.?[:\s]+(\d+)',  # R.A.: 123456 ou RA.: 123456
-            r'registro[:\s]+(\d+)',  # Registro: 123456
-            r'matrícula[:\s]+(\d+)', # Matrícula: 123456
-            r'matricula[:\s]+(\d+)', # Matricula: 123456
-        ]
-        
-        text_lower = text.lower()
-        for pattern in patterns:
-            match = re.search(pattern, text_lower)
-            if match:
-                return match.group(1)
-        
-        return None
+        return text_patterns.extract_matricula_from_text(text)
     
-    def find_ra_by_name(self, text: str, filename: str = "") -> Optional[str]:
+    def find_ra_by_name(self, text: str, filename: str = "", context: Optional[RunContext] = None) -> Optional[str]:
         """Busca RA em arquivos já processados com base no nome da pessoa"""
         # Tenta extrair nome tanto do texto quanto do filename
-        nome_procurado = self.extract_name_from_text(text, filename)
-        
+        return self.find_ra_for_name(self.extract_name_from_text(text, filename), context)
+    
+    def find_ra_for_name(self, nome_procurado: str, context: Optional[RunContext] = None) -> Optional[str]:
+        """Busca RA em arquivos já processados a partir do nome normalizado (ver DocumentFacts.name)"""
+        context = context or self.context
         if not nome_procurado or nome_procurado == "documento":
             return None
         
-        print(f"🔍 Buscando RA para: {nome_procurado}")
+        logger.debug("🔍 Buscando RA para: %s", nome_procurado)
         
-        # Busca em arquivos já processados
-        for original_file, file_info in self.processed_files.items():
-            nome_arquivo = file_info.get('nome', '')
-            ra_arquivo = file_info.get('ra', '')
-            
-            if nome_arquivo and ra_arquivo:
-                # Compara nomes (normalizado)
-                if nome_arquivo == nome_procurado:
-                    print(f"🔍 RA encontrado por nome exato: {ra_arquivo} (de {original_file})")
-                    return ra_arquivo
-                
-                # Comparação parcial (pelo menos 2 palavras em comum)
-                palavras_procurado = set(nome_procurado.split('_'))
-                palavras_arquivo = set(nome_arquivo.split('_'))
-                palavras_comuns = palavras_procurado & palavras_arquivo
-                
-                if len(palavras_comuns) >= 2:  # Pelo menos 2 palavras em comum
-                    print(f"🔍 RA encontrado por similaridade: {ra_arquivo} (de {original_file})")
-                    print(f"   Palavras em comum: {palavras_comuns}")
-                    return ra_arquivo
+        # Busca no índice de arquivos já processados
+        match = context.name_index.find(nome_procurado)
+        if match:
+            ra_arquivo, original_file, palavras_comuns = match
+            if palavras_comuns is None:
+                logger.debug("🔍 RA encontrado por nome exato: %s (de %s)", ra_arquivo, original_file)
+            else:
+                logger.debug("🔍 RA encontrado por similaridade: %s (de %s), palavras em comum: %s",
+                             ra_arquivo, original_file, palavras_comuns)
+            return ra_arquivo
         
-        print(f"⚠️  Nenhum RA encontrado para o nome: {nome_procurado}")
+        logger.debug("⚠️  Nenhum RA encontrado para o nome: %s", nome_procurado)
         return None
     
     def extract_name_from_text(self, text: str, filename: str = "") -> str:
         """Extrai nome de pessoa do texto ou do nome do arquivo"""
-        
-        # Primeiro tenta extrair do nome do arquivo (mais confiável)
-        if filename:
-            # Remove extensão e RA do nome do arquivo
-            filename_clean = filename.lower()
-            filename_clean = re.sub(r'\.(pdf|docx?|jpg|png)$', '', filename_clean)
-            filename_clean = re.sub(r'ra\d+', '', filename_clean)
-            filename_clean = re.sub(r'doc\d+', '', filename_clean)
-            
-            # Se o arquivo tem um nome de pessoa (TERMO, OFÍCIO, etc + nome)
-            for keyword in ['termo', 'oficio', 'ofício', 'historico', 'histórico']:
-                if keyword in filename_clean:
-                    # Extrai o que vem depois da palavra-chave
-                    parts = filename_clean.split(keyword)
-                    if len(parts) > 1:
-                        potential_name = parts[1].strip()
-                        # Remove números e caracteres especiais extras
-                        potential_name = re.sub(r'\d+', '', potential_name)
-                        potential_name = re.sub(r'[_\-\.]+', ' ', potential_name).strip()
-                        
-                        if len(potential_name.split()) >= 2:  # Pelo menos 2 palavras
-                            cleaned = self.clean_name(potential_name)
-                            if cleaned and cleaned != "documento":
-                                print(f"📝 Nome extraído do arquivo: {potential_name} → {cleaned}")
-                                return cleaned
-        
-        # Se não encontrou no filename, busca no texto
-        patterns = [
-            r'nome[:\s]+([^\n\r,;]+(?:\s+[^\n\r,;]+)*)',
-            r'portador[:\s]+([^\n\r,;]+(?:\s+[^\n\r,;]+)*)',
-            r'titular[:\s]+([^\n\r,;]+(?:\s+[^\n\r,;]+)*)',
-            r'eu,\s+([^\n\r,;]+(?:\s+[^\n\r,;]+)*)',  # Para TERMOs
-            r'sr\.?\s+([^\n\r,;]+(?:\s+[^\n\r,;]+)*)',
-            r'sra\.?\s+([^\n\r,;]+(?:\s+[^\n\r,;]+)*)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.UNICODE)
-            if match:
-                name = match.group(1).strip()
-                # Remove quebras de linha e espaços extras
-                name = ' '.join(name.split())
-                # Limita a 6 palavras (para evitar pegar texto demais)
-                words = name.split()[:6]
-                name = ' '.join(words)
-                # Remove palavras comuns que não são nomes
-                exclude_words = ['documento', 'carteira', 'registro', 'geral', 'federal', 'receita', 
-                               'declaro', 'termo', 'responsabilidade', 'que']
-                if not any(word in name.lower() for word in exclude_words) and len(words) >= 2:
-                    cleaned = self.clean_name(name)
-                    print(f"📝 Nome extraído do texto: {name} → {cleaned}")
-                    return cleaned
-        
-        return "documento"
-    
-        # Se não encontrar, usa timestamp como fallback
-        import time
-        return str(int(time.time()))[-6:]  # Últimos 6 dígitos do timestamp
+        return text_patterns.extract_name_from_text(text, filename)
     
     def clean_name(self, name: str) -> str:
         """Limpa o nome removendo caracteres especiais e espaços"""
-        # Remove acentos e caracteres especiais
-        import unicodedata
-        name = unicodedata.normalize('NFD', name)
-        name = ''.join(c for c in name if unicodedata.category(c) != 'Mn')
-        
-        # Remove espaços e caracteres especiais
-        name = re.sub(r'[^a-zA-Z\s]', '', name)
-        name = re.sub(r'\s+', '_', name.strip())
-        
-        return name.lower()
+        return text_patterns.clean_name(name)
     
     def identify_document_type(self, text: str, filename: str = "") -> Optional[str]:
         """Identifica o tipo de documento baseado no conteúdo e nome do arquivo"""
-        text_lower = text.lower()
-        filename_lower = filename.lower() if filename else ""
-        
-        # Pontuação para cada tipo de documento
-        scores = {}
-        
-        for doc_type, rule in self.rules.items():
-            score = 0
-            
-            # Pontuação do texto do documento (peso 2)
-            for keyword in rule['keywords']:
-                if keyword.lower() in text_lower:
-                    score += 2
-            
-            # Pontuação do nome do arquivo (peso 3 - MAIOR que texto para priorizar filename)
-            for keyword in rule['keywords']:
-                if keyword.lower() in filename_lower:
-                    score += 3
-            
-            if score > 0:
-                scores[doc_type] = score
-        
-        # Retorna o tipo com maior pontuação
-        if scores:
-            best_type = max(scores, key=scores.get)
-            return best_type
-        
-        return None
+        # Pontuação por keywords: peso 2 no texto, 3 no nome do arquivo
+        # (MAIOR que texto para priorizar filename)
+        return self.keyword_matcher.best_type(text, filename)
+    
+    @timed('resolve.facts')
+    def document_facts(self, file_name: str, text: str, content_hash: Optional[str] = None,
+                       gemini_type: Optional[str] = None) -> DocumentFacts:
+        """RA, nome e pontuação dos tipos de um documento (texto em minúsculas), calculados uma vez (ver DocumentFacts)"""
+        return DocumentFacts.from_text(file_name, text, self.keyword_matcher, content_hash, gemini_type)
+    
+    def result_facts(self, result: Dict) -> DocumentFacts:
+        """Fatos do resultado de extractors.extract_document (calculados na primeira chamada e guardados em 'facts')"""
+        facts = result.get('facts')
+        if facts is None:
+            facts = self.document_facts(Path(result['path']).name, result['text'], result['hash'],
+                                        result.get('gemini_type'))
+            result['facts'] = facts
+        return facts
     
-    def generate_new_filename(self, document_type: str, original_filename: str, extracted_text: str) -> str:
-        """Gera o novo nome do arquivo baseado nas regras do E-DIPLOMA DIGITAL"""
+    def generate_new_filename(self, document_type: str, original_filename: str, extracted_text: str,
+                              outcome: Optional[Dict] = None, context: Optional[RunContext] = None,
+                              facts: Optional[DocumentFacts] = None) -> str:
+        """
+        Gera o novo nome do arquivo baseado nas regras do E-DIPLOMA DIGITAL
+        
+        outcome: se informado, recebe 'ra' e 'ra_source' ('filename', 'text',
+        'name_index' ou None quando o RA não foi encontrado)
+        facts: fatos já calculados do documento (None = calculados aqui)
+        """
         rule = self.rules.get(document_type)
         if not rule:
             return original_filename
@@ -582,18 +647,21 @@ IMPORTANTE: Use APENAS as palavras exatas da lista de tipos. Não invente tipos
         extension = Path(original_filename).suffix
         
         # Extrai RA (primeiro tenta do nome do arquivo, depois do texto, depois por nome da pessoa)
+        if facts is None:
+            facts = self.document_facts(original_filename, extracted_text.lower())
+        
         ra = None
+        ra_source = None
         if rule.get('extract_matricula', False):
-            # Tentativa 1: Do nome do arquivo
-            ra = self.extract_matricula_from_filename(original_filename)
+            with stage('resolve.ra_lookup'):
+                # Tentativas 1 e 2: Do nome do arquivo ou do texto do documento
+                ra = facts.ra
+                ra_source = facts.ra_source
             
-            # Tentativa 2: Do texto do documento
-            if not ra:
-                ra = self.extract_matricula_from_text(extracted_text)
-            
-            # Tentativa 3: Busca por nome em arquivos já processados
-            if not ra:
-                ra = self.find_ra_by_name(extracted_text, original_filename)
+                # Tentativa 3: Busca por nome em arquivos já processados
+                if not ra:
+                    ra = self.find_ra_for_name(facts.name, context)
+                    ra_source = 'name_index'
             
             if ra:
                 # Garante que o RA tem pelo menos 5 dígitos (completa com zeros à esquerda)
@@ -602,14 +670,18 @@ IMPORTANTE: Use APENAS as palavras exatas da lista de tipos. Não invente tipos
                 pattern = pattern.replace('{matricula}', ra)  # Compatibilidade com padrão antigo
             else:
                 # Se não encontrar RA, deixa como "SEMRA"
-                print("⚠️  RA não encontrado. Usando 'SEMRA' no nome do arquivo.")
+                logger.debug("⚠️  RA não encontrado. Usando 'SEMRA' no nome do arquivo.")
                 pattern = pattern.replace('{ra}', 'SEMRA')
                 pattern = pattern.replace('{matricula}', 'SEMRA')
+                ra_source = None
+        
+        if outcome is not None:
+            outcome['ra'] = ra.zfill(5) if ra else None
+            outcome['ra_source'] = ra_source
         
         # Extrai nome se necessário (mantido para compatibilidade)
         if rule.get('extract_name', False):
-            name = self.extract_name_from_text(extracted_text, original_filename)
-            pattern = pattern.replace('{nome}', name)
+            pattern = pattern.replace('{nome}', facts.name)
         
         # Substitui outros placeholders se existirem
         if '{tipo}' in pattern:
@@ -617,116 +689,476 @@ IMPORTANTE: Use APENAS as palavras exatas da lista de tipos. Não invente tipos
         
         return pattern + extension
     
-    def process_file(self, file_path: str) -> Tuple[bool, str]:
+    def process_file(self, file_path: str, context: Optional[RunContext] = None) -> Tuple[bool, str]:
         """Processa um arquivo e retorna se foi processado com sucesso e o novo nome"""
+        context = context or self.context
         try:
             file_path = Path(file_path)
             extension = file_path.suffix.lower()
             
-            # Extrai texto baseado no tipo de arquivo
-            text = ""
-            gemini_doc_type = None
+            if extension not in extractors.SUPPORTED_EXTENSIONS:
+                return False, f"Tipo de arquivo não suportado: {extension}"
+            
+            # Extrai texto baseado no tipo de arquivo (ou recupera do cache)
+            result = extractors.extract_document(str(file_path), **self.extraction_options())
             
-            if extension == '.pdf':
-                # Primeiro tenta extrair texto normal
-                text = self.extract_text_from_pdf_only(str(file_path))
+            return self.resolve_document(result, context)
+            
+        except Exception as e:
+            return False, f"Erro ao processar arquivo: {e}"
+    
+    def complete_document(self, result: Dict, context: Optional[RunContext] = None) -> Dict:
+        """
+        Completa o resultado de extractors.extract_document antes da resolução
+        
+        Grava o texto no cache e, para PDFs sem texto extraível, obtém a análise
+        do Gemini (do cache ou por nova requisição). Adiciona ao resultado as
+        chaves 'gemini_type', 'text_source' ('extraction', 'cache', 'gemini'
+        ou 'gemini_cache') e 'completed', e os tempos das etapas 'gemini' e
+        'cache' em 'timings'.
+        
+        Args:
+            result: Dicionário retornado por extractors.extract_document
+            
+        Returns:
+            O próprio dicionário, atualizado
+        """
+        context = context or self.context
+        if result.get('completed'):
+            return result
+        
+        result['completed'] = True
+        result['gemini_type'] = None
+        result['text_source'] = 'cache' if result['cached'] else 'extraction'
+        if result['error']:
+            return result
+        
+        with collect(result.setdefault('timings', {})):
+            self.restore_gemini(result, context)
+            context.gemini_inflight.pop(result['path'], None)
+        
+            content_hash = result['hash'] if self.cache else None
+            # Extrações limitadas (parciais) não vão para o cache
+            if content_hash and not result['cached'] and not result['partial']:
+                with stage('cache'):
+                    self.cache.put_text(content_hash, result['text'])
+        
+            # PDF sem texto extraível: tenta análise completa com Gemini
+            if result['path'].lower().endswith('.pdf') and not result['text'].strip():
+                if result['gemini']:
+                    logger.debug("💾 Usando análise do Gemini armazenada em cache")
+                    result['text'], result['gemini_type'] = result['gemini']
+                    result['text_source'] = 'gemini_cache'
+                elif self.gemini_scheduler:
+                    logger.debug("🤖 Tentando análise completa com Gemini AI...")
+                    with stage('gemini'):
+                        future = result.pop('gemini_future', None) or self.submit_gemini_analysis(result['path'], context)
+                        gemini_text, gemini_doc_type = self.gemini_analysis_result(future)
+                    result['text'], result['gemini_type'] = gemini_text, gemini_doc_type
+                    result['text_source'] = 'gemini'
                 
-                # Se não conseguiu, tenta análise completa com Gemini
-                if not text.strip() and self.gemini_model:
-                    print("🤖 Tentando análise completa com Gemini AI...")
-                    gemini_text, gemini_doc_type = self.analyze_document_with_gemini(str(file_path))
-                    text = gemini_text
-                    
-            elif extension == '.docx':
-                text = self.extract_text_from_docx(str(file_path))
-            elif extension == '.doc':
-                text = self.extract_text_from_doc(str(file_path))
+                    uploaded = context.gemini_upload_bytes.pop(result['path'], None)
+                    if uploaded:
+                        result['gemini_upload_bytes'] = uploaded
+                        logger.debug("📤 Imagem enviada ao Gemini: %.0f KB", uploaded / 1024)
+                
+                    if content_hash and (gemini_text or gemini_doc_type):
+                        self.cache.put_gemini(content_hash, gemini_text, gemini_doc_type)
+                    if context.checkpoint and (gemini_text or gemini_doc_type):
+                        context.checkpoint.record_gemini(result['path'], result['hash'], gemini_text, gemini_doc_type)
+        
+            if self.cache:
+                with stage('cache'):
+                    self.cache.commit()
+        
+        return result
+    
+    def restore_gemini(self, result: Dict, context: Optional[RunContext] = None):
+        """Usa a resposta do Gemini recuperada do checkpoint, se o resultado não tiver uma"""
+        context = context or self.context
+        if not result['gemini'] and context.resumed_state:
+            result['gemini'] = gemini_result(context.resumed_state, result['path'], result.get('hash'))
+    
+    def needs_gemini(self, result: Dict, context: Optional[RunContext] = None) -> bool:
+        """Indica se o documento depende de uma nova análise do Gemini (PDF sem texto)"""
+        context = context or self.context
+        self.restore_gemini(result, context)
+        return (self.gemini_scheduler is not None
+                and not result['error']
+                and not result['gemini']
+                and result['path'].lower().endswith('.pdf')
+                and not result['text'].strip())
+    
+    def dispatch_gemini(self, result: Dict, context: Optional[RunContext] = None) -> bool:
+        """
+        Agenda antecipadamente a análise do Gemini de um documento extraído
+        
+        A resposta é aguardada em complete_document, na ordem de resolução,
+        enquanto as requisições de vários documentos correm em paralelo.
+        
+        Returns:
+            True se uma requisição foi agendada
+        """
+        context = context or self.context
+        if 'gemini_future' in result or not self.needs_gemini(result, context):
+            return False
+        
+        if self.gemini_batcher:
+            result['gemini_future'] = self.gemini_batcher.add(
+                result['path'], render=lambda path: self.render_gemini_image(path, context))
+        else:
+            result['gemini_future'] = self.submit_gemini_analysis(result['path'], context)
+        context.gemini_inflight[result['path']] = result
+        return True
+    
+    def save_inflight_gemini(self, context: Optional[RunContext] = None):
+        """
+        Guarda as respostas do Gemini já recebidas e ainda não consumidas
+        
+        Chamado quando a execução é interrompida: as respostas prontas vão para
+        o cache e para o checkpoint (não são pedidas de novo na retomada); as
+        que não chegaram são canceladas e registradas como pendentes no checkpoint.
+        """
+        context = context or self.context
+        pending = []
+        for path, result in context.gemini_inflight.items():
+            future = result.get('gemini_future')
+            if future is None or not future.done() or future.cancelled() or future.exception():
+                if future is not None:
+                    # Só as requisições deste contexto: outros lotes podem estar usando o agendador
+                    future.cancel()
+                pending.append(path)
+                continue
+            
+            gemini_text, gemini_doc_type = self.gemini_analysis_result(future)
+            if not (gemini_text or gemini_doc_type):
+                pending.append(path)
+                continue
+            if self.cache and result['hash']:
+                self.cache.put_gemini(result['hash'], gemini_text, gemini_doc_type)
+            if context.checkpoint:
+                context.checkpoint.record_gemini(path, result['hash'], gemini_text, gemini_doc_type)
+        
+        if self.cache and context.gemini_inflight:
+            self.cache.commit()
+        if context.checkpoint and pending:
+            context.checkpoint.record_gemini_pending(pending)
+        context.gemini_inflight = {}
+    
+    def resolve_document(self, result: Dict, context: Optional[RunContext] = None) -> Tuple[bool, str]:
+        """
+        Resolve (identifica, busca o RA e renomeia) o resultado de extractors.extract_document
+        
+        Grava no resultado 'success', 'message', 'outcome' (ver resolve_extracted)
+        e os tempos da resolução ('resolve' e subetapas) em 'timings'.
+        """
+        context = context or self.context
+        result['outcome'] = {}
+        try:
+            self.complete_document(result, context)
+            
+            if result['error']:
+                success, message = False, f"Erro ao processar arquivo: {result['error']}"
             else:
-                return False, f"Tipo de arquivo não suportado: {extension}"
+                with collect(result.setdefault('timings', {})), stage('resolve'):
+                    facts = self.result_facts(result) if result['text'].strip() else None
+                    success, message = self.resolve_extracted(result['path'], result['text'], result['gemini_type'],
+                                                              outcome=result['outcome'], content_hash=result['hash'],
+                                                              context=context, facts=facts)
+                
+                if result['pages'] is not None:
+                    complete_note = "" if result['partial'] else ", documento inteiro"
+                    message += f" [páginas lidas: {result['pages']}{complete_note}]"
+        except Exception as e:
+            success, message = False, f"Erro ao processar arquivo: {e}"
+        
+        result['success'], result['message'] = success, message
+        return success, message
+    
+    def open_journal(self, run_directory: str, context: Optional[RunContext] = None) -> Optional[RenameJournal]:
+        """
+        Abre o diário de renomeações de uma execução (permite desfazer/recuperar)
+        
+        Não faz nada em dry_run. Os diários concluídos mais antigos além de
+        'journal_keep' são removidos.
+        """
+        context = context or self.context
+        if context.dry_run:
+            return None
+        
+        directory = journal_dir(get_config_dir())
+        prune_journals(directory, self.config.get('journal_keep', DEFAULT_KEEP_JOURNALS))
+        context.journal = RenameJournal.create(
+            directory, run_directory,
+            fsync_every=self.config.get('journal_fsync_every', DEFAULT_FSYNC_EVERY)
+        )
+        return context.journal
+    
+    def close_journal(self, completed: bool = True, context: Optional[RunContext] = None):
+        """
+        Fecha o diário da execução
+        
+        completed=False deixa a execução marcada como interrompida (será
+        oferecida a recuperação)
+        """
+        context = context or self.context
+        if not context.journal:
+            return
+        if completed:
+            context.journal.commit()
+        context.journal.close()
+        context.journal = None
+    
+    def has_checkpoint(self, run_directory: str) -> bool:
+        """Indica se há uma execução interrompida a retomar no diretório"""
+        return os.path.exists(checkpoint_path(checkpoint_dir(get_config_dir()), run_directory))
+    
+    def open_checkpoint(self, run_directory: str, files: Iterable, resume: bool = False,
+                        context: Optional[RunContext] = None) -> Iterable[str]:
+        """
+        Abre o checkpoint da execução (ver run_checkpoint)
+        
+        Com resume=True e um checkpoint existente, restaura o mapa nome→RA e as
+        respostas do Gemini já recebidas e devolve apenas os arquivos que
+        faltam, na ordem original. Caso contrário, inicia um novo checkpoint e
+        devolve os próprios arquivos (um gerador continua sendo consumido sob
+        demanda). Não faz nada em dry_run.
+        
+        Returns:
+            Arquivos a processar
+        """
+        context = context or self.context
+        if context.dry_run:
+            return files
+        
+        path = checkpoint_path(checkpoint_dir(get_config_dir()), run_directory)
+        sync_every = self.config.get('checkpoint_every', DEFAULT_CHECKPOINT_EVERY)
+        
+        if resume and os.path.exists(path):
+            state = read_checkpoint(path)
+            for file_name, (nome, ra, novo_nome) in state['names'].items():
+                context.register_processed_file(file_name, nome, ra, novo_nome)
+            context.resumed_state = state
+            files = remaining_files(state, files)
+            
+            logger.info("⏯️ Retomando execução: %d arquivo(s) já renomeado(s), %d restante(s)",
+                        len(state['completed']), len(files))
+            if state['gemini_pending']:
+                logger.info("🤖 %d análise(s) do Gemini pendente(s) serão reenviadas", len(state['gemini_pending']))
+            context.checkpoint = RunCheckpoint(path, sync_every)
+        else:
+            context.checkpoint = RunCheckpoint.create(path, run_directory, sync_every)
+            files = context.checkpoint.track_files(files)
+        
+        return files
+    
+    def close_checkpoint(self, finished: bool, context: Optional[RunContext] = None):
+        """
+        Fecha o checkpoint da execução
+        
+        finished=True (todos os arquivos processados com sucesso) apaga o
+        checkpoint; caso contrário ele é mantido para a retomada.
+        """
+        context = context or self.context
+        if not context.checkpoint:
+            return
+        if finished:
+            context.checkpoint.discard()
+        else:
+            context.checkpoint.close()
+            logger.info("💾 Progresso salvo: a execução pode ser retomada (--resume)")
+        context.checkpoint = None
+        context.resumed_state = None
+    
+    def start_run(self, context: Optional[RunContext] = None):
+        """
+        Prepara uma nova execução (nomes ocupados relidos do disco, plano vazio)
+        
+        O índice nome→RA das execuções anteriores é mantido; as regras só são
+        relidas se renaming_rules.json tiver sido modificado.
+        """
+        self.reload_rules_if_changed()
+        (context or self.context).start()
+    
+    def register_known_ra(self, result: Dict, context: Optional[RunContext] = None):
+        """
+        Registra antecipadamente nome e RA de um documento para cross-referencing
+        
+        Usado pela resolução em duas passagens: todos os documentos com RA
+        alimentam o índice nome→RA antes de qualquer arquivo ser renomeado.
+        """
+        context = context or self.context
+        if result['error'] or not result['text'].strip():
+            return
+        
+        facts = self.result_facts(result)
+        if facts.ra and facts.has_name:
+            context.register_processed_file(facts.file_name, facts.name, facts.ra, None)
+    
+    def register_processed_file(self, file_name: str, nome: str, ra: Optional[str], novo_nome: Optional[str],
+                                context: Optional[RunContext] = None):
+        """Armazena nome e RA de um arquivo para cross-referencing (ver RunContext)"""
+        (context or self.context).register_processed_file(file_name, nome, ra, novo_nome)
+    
+    def resolve_extracted(self, file_path: str, text: str,
+                          gemini_doc_type: Optional[str] = None,
+                          outcome: Optional[Dict] = None,
+                          content_hash: Optional[str] = None,
+                          context: Optional[RunContext] = None,
+                          facts: Optional[DocumentFacts] = None) -> Tuple[bool, str]:
+        """
+        Identifica, busca o RA e renomeia um arquivo cujo texto já foi extraído
+        
+        Args:
+            file_path: Caminho do arquivo
+            text: Texto extraído (ou obtido do Gemini)
+            gemini_doc_type: Tipo identificado pelo Gemini, se houver
+            outcome: Se informado, recebe 'type', 'type_source' ('gemini' ou
+                'keywords'), 'ra', 'ra_source' (ver generate_new_filename),
+                'new_name' e 'renamed' (False em dry_run)
+            content_hash: SHA-256 do conteúdo, se já calculado (para o diário)
+            context: Estado da execução (None = self.context)
+            facts: Fatos já calculados do documento (None = calculados aqui)
+        """
+        context = context or self.context
+        if outcome is None:
+            outcome = {}
+        try:
+            file_path = Path(file_path)
             
             if not text.strip():
                 return False, "Não foi possível extrair texto do arquivo, mesmo com Gemini AI"
             
+            if facts is None:
+                facts = self.document_facts(file_path.name, text.lower(), content_hash, gemini_doc_type)
+            
             # Identifica o tipo de documento (usa resultado do Gemini se disponível)
             # IMPORTANTE: Passa o nome do arquivo para ajudar na identificação
             doc_type = None
             if gemini_doc_type and gemini_doc_type in self.rules:
                 doc_type = gemini_doc_type
-                print(f"✅ Usando tipo identificado pelo Gemini: {doc_type}")
+                outcome['type_source'] = 'gemini'
+                logger.debug("✅ Usando tipo identificado pelo Gemini: %s", doc_type)
             else:
-                doc_type = self.identify_document_type(text, file_path.name)
+                doc_type = facts.best_type
                 if doc_type:
-                    print(f"✅ Tipo identificado por keywords: {doc_type}")
+                    outcome['type_source'] = 'keywords'
+                    logger.debug("✅ Tipo identificado por keywords: %s", doc_type)
             
             if not doc_type:
                 return False, "Tipo de documento não identificado"
+            outcome['type'] = doc_type
             
             # Gera novo nome
-            new_filename = self.generate_new_filename(doc_type, file_path.name, text)
+            new_filename = self.generate_new_filename(doc_type, file_path.name, text, outcome, context, facts)
             new_path = file_path.parent / new_filename
             
-            # Renomeia o arquivo
-            if new_path.exists():
-                counter = 1
-                stem = Path(new_filename).stem
-                extension = Path(new_filename).suffix
-                while new_path.exists():
-                    new_filename = f"{stem}_{counter}{extension}"
-                    new_path = file_path.parent / new_filename
-                    counter += 1
+            with stage('resolve.rename'):
+                # Resolve colisões (_1, _2...) contra os nomes ocupados em memória
+                base_filename = new_filename
+                new_filename = context.taken_names.resolve(file_path.parent, base_filename)
+                new_path = file_path.parent / new_filename
             
-            file_path.rename(new_path)
+                if context.dry_run:
+                    context.rename_plan.add(file_path, new_path, type=doc_type, ra=outcome.get('ra'),
+                                         ra_source=outcome.get('ra_source'), hash=content_hash)
+                else:
+                    # Arquivo criado fora desta execução com o mesmo nome
+                    while new_path.exists():
+                        context.taken_names.mark_taken(new_path)
+                        new_filename = context.taken_names.resolve(file_path.parent, base_filename)
+                        new_path = file_path.parent / new_filename
+                
+                    # Renomeia o arquivo (registrando no diário antes e depois)
+                    seq = context.journal.record_rename(file_path, new_path, content_hash) if context.journal else None
+                    file_path.rename(new_path)
+                    if seq:
+                        context.journal.record_done(seq)
+                context.taken_names.move(file_path, new_path)
+            outcome['new_name'] = new_filename
+            outcome['renamed'] = not context.dry_run
             
-            # Armazena informações do arquivo processado para cross-referencing
-            ra = self.extract_matricula_from_filename(file_path.name) or self.extract_matricula_from_text(text)
-            nome = self.extract_name_from_text(text, file_path.name)
+            with stage('resolve.index'):
+                # Armazena informações do arquivo processado para cross-referencing
+                ra, nome = facts.ra, facts.name
             
-            if ra or nome != "documento":
-                self.processed_files[str(file_path.name)] = {
-                    'nome': nome,
-                    'ra': ra,
-                    'novo_nome': new_filename
-                }
-                print(f"📝 Arquivo armazenado para cross-referencing: RA={ra}, Nome={nome}")
+                if ra or facts.has_name:
+                    context.register_processed_file(str(file_path.name), nome, ra, new_filename)
+                    logger.debug("📝 Arquivo armazenado para cross-referencing: RA=%s, Nome=%s", ra, nome)
+            
+            # O arquivo só é registrado como concluído no checkpoint depois do
+            # seu par nome→RA, para que a retomada nunca pule um arquivo cujo
+            # nome→RA não foi gravado
+            if context.checkpoint and not context.dry_run:
+                context.checkpoint.record_file(file_path, new_path)
             
             ai_note = " (via Gemini AI)" if gemini_doc_type else ""
-            return True, f"Arquivo renomeado para: {new_filename} (tipo: {doc_type}{ai_note})"
+            action = "seria renomeado" if context.dry_run else "renomeado"
+            return True, f"Arquivo {action} para: {new_filename} (tipo: {doc_type}{ai_note})"
             
         except Exception as e:
             return False, f"Erro ao processar arquivo: {e}"
     
-    def process_directory(self, directory_path: str):
-        """Processa todos os arquivos em um diretório"""
+    def process_directory(self, directory_path: str, workers: Optional[int] = None, two_pass: bool = False,
+                          resume: bool = False, recursive: Optional[bool] = None):
+        """
+        Processa todos os arquivos em um diretório
+        
+        workers: processos de extração; two_pass: monta o índice nome→RA com
+        todos os arquivos antes de renomear (independe da ordem dos arquivos);
+        resume: retoma a execução interrompida no diretório (ver open_checkpoint);
+        recursive: inclui subdiretórios (None = 'recursive_scan' de settings.json)
+        """
         directory = Path(directory_path)
         
         if not directory.exists():
-            print(f"Diretório não encontrado: {directory_path}")
+            logger.error("Diretório não encontrado: %s", directory_path)
             return
         
-        # Busca arquivos PDF e DOC/DOCX
-        files = list(directory.glob('*.pdf')) + list(directory.glob('*.doc')) + list(directory.glob('*.docx'))
+        # Busca arquivos PDF e DOC/DOCX (varredura consumida pelo pipeline sob demanda)
+        options = scan_options(self.config)
+        if recursive is not None:
+            options['recursive'] = recursive
+        files = iter_files(directory_path, **options)
+        first = next(files, None)
         
-        if not files:
-            print("Nenhum arquivo PDF ou DOC encontrado no diretório")
+        if first is None:
+            logger.warning("Nenhum arquivo PDF ou DOC encontrado no diretório")
             return
         
-        print(f"Processando {len(files)} arquivo(s)...\n")
+        files = self.open_checkpoint(directory_path, itertools.chain([first], files), resume)
+        logger.info("Processando arquivos de %s...", directory_path)
         
-        success_count = 0
-        for file_path in files:
-            print(f"Processando: {file_path.name}")
-            success, message = self.process_file(str(file_path))
-            
+        def on_file_start(index, total, file_path):
+            logger.info("Processando: %s", Path(file_path).name)
+        
+        def on_file_done(index, total, file_path, success, message):
             if success:
-                success_count += 1
-                print(f"✓ {message}")
+                logger.info("✓ %s", message)
             else:
-                print(f"✗ {message}")
-            print()
+                logger.warning("✗ %s", message)
+        
+        if self.config.get('auto_backup', True):
+            self.open_journal(directory_path)
+        
+        completed = False
+        success_count = processed = 0
+        report = TimingReport()
+        try:
+            pipeline = ProcessingPipeline(self, workers=workers, two_pass=two_pass)
+            success_count, processed = pipeline.run(files, on_file_start=on_file_start, on_file_done=on_file_done,
+                                                    on_result=lambda index, total, result: report.add(result))
+            completed = True
+        finally:
+            self.close_journal(completed)
+            self.close_checkpoint(completed and success_count == processed)
         
-        print(f"Processamento concluído. {success_count}/{len(files)} arquivo(s) processado(s) com sucesso.")
+        logger.info("Processamento concluído. %d/%d arquivo(s) processado(s) com sucesso.", success_count, processed)
+        report.finish()
+        logger.info("Tempos por etapa:\n%s", report.format_table())
 
 def main():
+    setup_logging(load_config().get('log_level', DEFAULT_LOG_LEVEL))
     analyzer = DocumentAnalyzer()
     
     while True:
@@ -0,0 +1,103 @@
+"""
+Fatos de um documento, calculados uma vez por arquivo
+
+DocumentFacts reúne tudo o que a resolução de um arquivo tira do texto e do
+nome do arquivo: o hash do conteúdo, o RA do nome do arquivo e do texto, o
+nome normalizado da pessoa, a pontuação de cada tipo de documento e o tipo
+identificado pelo Gemini. O registro é calculado uma vez (na pré-passagem da
+resolução em duas passagens ou na própria resolução) e consumido pela
+identificação do tipo, pela busca do RA, pela geração do novo nome e pelo
+índice nome→RA, sem repetir buscas por expressões regulares nem a
+normalização do nome.
+
+O registro usa __slots__ e não guarda o texto, para que o custo por arquivo
+continue pequeno com centenas de milhares de arquivos acompanhados.
+"""
+
+from typing import Optional, Tuple
+
+from . import text_patterns
+from .text_patterns import NO_NAME
+
+
+class DocumentFacts:
+    """RA, nome, pontuação dos tipos e resultado do Gemini de um documento"""
+
+    __slots__ = ('file_name', 'hash', 'filename_ra', 'text_ra', 'name', 'type_scores', 'gemini_type')
+
+    def __init__(self, file_name: str, content_hash: Optional[str] = None, filename_ra: Optional[str] = None,
+                 text_ra: Optional[str] = None, name: str = NO_NAME,
+                 type_scores: Tuple[Tuple[str, int], ...] = (), gemini_type: Optional[str] = None):
+        self.file_name = file_name
+        self.hash = content_hash  # SHA-256 do conteúdo, se calculado
+        self.filename_ra = filename_ra
+        self.text_ra = text_ra  # Só procurado quando o nome do arquivo não tem RA
+        self.name = name  # Nome normalizado (palavras separadas por '_') ou NO_NAME
+        self.type_scores = type_scores  # (tipo, pontuação > 0), na ordem das regras
+        self.gemini_type = gemini_type
+
+    @classmethod
+    def from_text(cls, file_name: str, text: str, matcher, content_hash: Optional[str] = None,
+                  gemini_type: Optional[str] = None) -> 'DocumentFacts':
+        """
+        Calcula os fatos de um documento
+
+        O nome do arquivo tem precedência para o RA e para o nome da pessoa; o
+        texto é percorrido uma única vez, e só para o que o nome do arquivo
+        não trouxe.
+
+        Args:
+            file_name: Nome do arquivo (sem o diretório)
+            text: Texto extraído (ou obtido do Gemini), em minúsculas
+            matcher: KeywordMatcher das regras de renomeação
+            content_hash: SHA-256 do conteúdo, se calculado
+            gemini_type: Tipo identificado pelo Gemini, se houver
+        """
+        filename_ra = text_patterns.extract_matricula_from_filename(file_name)
+        name = text_patterns.extract_name_from_filename(file_name)
+
+        # O texto extraído já está em minúsculas
+        ra_candidate, name_candidate = text_patterns._scan_lower(text, find_ra=filename_ra is None,
+                                                                 find_name=name is None)
+        if name is None:
+            name = text_patterns.name_from_candidate(name_candidate)
+
+        return cls(file_name, content_hash,
+                   filename_ra=filename_ra,
+                   text_ra=ra_candidate.value if ra_candidate else None,
+                   name=name,
+                   type_scores=tuple(matcher.score(text, file_name).items()),
+                   gemini_type=gemini_type)
+
+    @property
+    def ra(self) -> Optional[str]:
+        """RA do nome do arquivo ou, se não houver, do texto"""
+        return self.filename_ra or self.text_ra
+
+    @property
+    def ra_source(self) -> Optional[str]:
+        """Origem do RA: 'filename', 'text' ou None"""
+        if self.filename_ra:
+            return 'filename'
+        return 'text' if self.text_ra else None
+
+    @property
+    def has_name(self) -> bool:
+        """Indica se um nome de pessoa foi encontrado"""
+        return self.name != NO_NAME
+
+    @property
+    def name_tokens(self) -> Tuple[str, ...]:
+        """Palavras do nome normalizado (vazio se não encontrado)"""
+        return tuple(self.name.split('_')) if self.has_name else ()
+
+    @property
+    def best_type(self) -> Optional[str]:
+        """Tipo com maior pontuação por palavras-chave (o primeiro das regras em caso de empate)"""
+        if not self.type_scores:
+            return None
+        return max(self.type_scores, key=lambda item: item[1])[0]
+
+    def __repr__(self) -> str:
+        return (f"DocumentFacts({self.file_name!r}, ra={self.ra!r}, ra_source={self.ra_source!r}, "
+                f"name={self.name!r}, best_type={self.best_type!r}, gemini_type={self.gemini_type!r})")
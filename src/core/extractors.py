@@ -0,0 +1,324 @@
+"""
+Extratores de texto - funções de nível de módulo para PDF, DOCX e DOC
+
+As funções deste módulo não dependem de estado do DocumentAnalyzer, o que
+permite executá-las em processos separados (ver src/core/pipeline.py).
+"""
+
+import logging
+from pathlib import Path
+from typing import Dict, Any, Iterator, Optional, Tuple
+
+from . import text_patterns
+from .timing import collect, stage, timed
+from ..utils.lazy_imports import optional_import
+from ..utils.logging_setup import file_context
+
+logger = logging.getLogger(__name__)
+
+# As bibliotecas de extração (PyMuPDF, pdfplumber, PyPDF2, python-docx,
+# docx2txt) são importadas no primeiro uso, com optional_import, e não ao
+# importar este módulo
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.doc')
+
+# Incrementar sempre que a extração mudar de forma a alterar o texto gerado
+# (invalida as entradas do cache persistente, ver src/core/cache.py)
+EXTRACTOR_VERSION = "3"
+
+# Cache somente-leitura aberto uma vez por processo de extração
+_worker_cache = None
+
+
+# ========== MOTORES DE EXTRAÇÃO DE PDF ==========
+
+class PdfEngineUnavailable(Exception):
+    """A biblioteca do motor de PDF não está instalada (o próximo motor da cadeia é usado)"""
+
+
+def _iter_pages_fitz(file_path: str, start: int) -> Iterator[str]:
+    """Texto das páginas via PyMuPDF (mais rápido)"""
+    fitz = optional_import('fitz', "PDFs")
+    if fitz is None:
+        raise PdfEngineUnavailable('fitz')
+    with fitz.open(file_path) as doc:
+        for page_num in range(start, len(doc)):
+            yield doc[page_num].get_text()
+
+
+def _iter_pages_pdfplumber(file_path: str, start: int) -> Iterator[str]:
+    """Texto das páginas via pdfplumber (melhor para layouts complexos)"""
+    pdfplumber = optional_import('pdfplumber', "PDFs")
+    if pdfplumber is None:
+        raise PdfEngineUnavailable('pdfplumber')
+    with pdfplumber.open(file_path) as pdf:
+        for page in pdf.pages[start:]:
+            yield page.extract_text() or ""
+
+
+def _iter_pages_pypdf2(file_path: str, start: int) -> Iterator[str]:
+    """Texto das páginas via PyPDF2"""
+    PyPDF2 = optional_import('PyPDF2', "PDFs")
+    if PyPDF2 is None:
+        raise PdfEngineUnavailable('pypdf2')
+    with open(file_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        for page in pdf_reader.pages[start:]:
+            yield page.extract_text() or ""
+
+
+PDF_ENGINES = {
+    'fitz': _iter_pages_fitz,
+    'pdfplumber': _iter_pages_pdfplumber,
+    'pypdf2': _iter_pages_pypdf2,
+}
+
+# Ordem de tentativa de cada seleção: o próximo motor só é usado se o
+# anterior não estiver instalado ou falhar ao ler o arquivo (em 'auto',
+# também se todas as páginas vierem sem texto). 'fitz' usa apenas o PyMuPDF
+# ('auto' é o PyMuPDF com alternativas)
+PDF_ENGINE_CHAINS = {
+    'auto': ('fitz', 'pdfplumber', 'pypdf2'),
+    'fitz': ('fitz',),
+    'pdfplumber': ('pdfplumber', 'pypdf2'),
+    'pypdf2': ('pypdf2',),
+}
+
+DEFAULT_PDF_ENGINE = 'auto'
+
+
+def extractor_version(pdf_engine: str = DEFAULT_PDF_ENGINE) -> str:
+    """Versão do texto extraído (usada pelo cache), que depende do motor de PDF"""
+    return f"{EXTRACTOR_VERSION}-{pdf_engine}"
+
+
+def iter_pdf_pages(file_path: str, engine: str = DEFAULT_PDF_ENGINE) -> Iterator[str]:
+    """
+    Gera o texto de cada página do PDF sob demanda
+
+    As páginas só são lidas conforme o consumidor avança, então parar a
+    iteração evita o parsing das páginas restantes. Se um motor falhar no
+    meio do arquivo, o próximo da cadeia continua da página seguinte.
+
+    Em 'auto' as páginas sem texto do início do arquivo são retidas até
+    aparecer uma página com texto; se nenhuma página tiver texto, o próximo
+    motor lê o arquivo do início (o último motor da cadeia entrega as
+    páginas vazias, para que o PDF siga para o Gemini).
+
+    Args:
+        file_path: Caminho do PDF
+        engine: 'auto' (PyMuPDF, depois pdfplumber e PyPDF2), 'fitz' (só
+            PyMuPDF), 'pdfplumber' (layout complexo, depois PyPDF2) ou 'pypdf2'
+    """
+    if engine not in PDF_ENGINE_CHAINS:
+        raise ValueError(f"Motor de PDF desconhecido: {engine}")
+
+    pages_read = 0
+    last_error = None
+    held = None  # Páginas do último motor que leu o arquivo inteiro sem texto ('auto')
+    for name in PDF_ENGINE_CHAINS[engine]:
+        empty_pages = []
+        hold_empty = engine == 'auto' and pages_read == 0
+        try:
+            for page_text in PDF_ENGINES[name](file_path, pages_read):
+                if hold_empty:
+                    if not page_text.strip():
+                        empty_pages.append(page_text)
+                        continue
+                    hold_empty = False
+                    for empty in empty_pages:
+                        pages_read += 1
+                        yield empty
+                    empty_pages = []
+                pages_read += 1
+                yield page_text
+            if not hold_empty:
+                return
+            # Nenhuma página com texto: tenta o próximo motor do início
+            held = empty_pages
+        except PdfEngineUnavailable:
+            # Não instalado (o aviso de instalação já foi registrado): próximo motor
+            continue
+        except Exception as e:
+            last_error = e
+
+    if held is not None:
+        # Nenhum motor encontrou texto (ex: PDF escaneado)
+        yield from held
+        return
+
+    if last_error is None:
+        logger.warning("Nenhum motor de PDF disponível para '%s' (%s)", engine, file_path)
+    else:
+        logger.warning("Erro ao extrair texto do PDF %s: %s", file_path, last_error)
+
+
+@timed('extract.pdf')
+def extract_text_from_pdf(file_path: str, engine: str = DEFAULT_PDF_ENGINE) -> str:
+    """Extrai texto de arquivo PDF (sem usar Gemini)"""
+    text = ""
+    for page_text in iter_pdf_pages(file_path, engine):
+        if page_text:
+            text += page_text + "\n"
+
+    return text.lower()
+
+
+def is_conclusive(text: str, filename: str, matcher) -> bool:
+    """Indica se o texto já basta para determinar o tipo e o RA do documento"""
+    if matcher.best_type(text, filename) is None:
+        return False
+
+    return bool(text_patterns.extract_matricula_from_filename(filename)
+                or text_patterns.find_matricula_lower(text))
+
+
+@timed('extract.pdf')
+def extract_text_from_pdf_bounded(file_path: str, page_budget: int, matcher,
+                                  engine: str = DEFAULT_PDF_ENGINE) -> Tuple[str, int, bool]:
+    """
+    Extrai texto de PDF parando assim que tipo e RA estiverem determinados
+
+    Depois de cada uma das primeiras page_budget páginas, verifica se o texto
+    lido já é conclusivo; se não for, lê o restante do documento.
+
+    Args:
+        file_path: Caminho do PDF
+        page_budget: Número máximo de páginas lidas antes de desistir da parada antecipada
+        matcher: KeywordMatcher com as regras de tipo de documento
+        engine: Motor de extração (ver iter_pdf_pages)
+
+    Returns:
+        Tupla (texto em minúsculas, páginas lidas, True se parou antes do fim)
+    """
+    filename = Path(file_path).name
+    parts = []
+    pages = 0
+
+    for page_text in iter_pdf_pages(file_path, engine):
+        pages += 1
+        if page_text:
+            parts.append(page_text + "\n")
+
+        if pages <= page_budget:
+            text = "".join(parts).lower()
+            if text.strip() and is_conclusive(text, filename, matcher):
+                return text, pages, True
+
+    return "".join(parts).lower(), pages, False
+
+
+@timed('extract.docx')
+def extract_text_from_docx(file_path: str) -> str:
+    """Extrai texto de arquivo DOCX"""
+    docx = optional_import('docx', "arquivos Word")
+    if docx is None:
+        return ""
+    try:
+        doc = docx.Document(file_path)
+        text = ""
+        for paragraph in doc.paragraphs:
+            text += paragraph.text + "\n"
+        return text.lower()
+    except Exception as e:
+        logger.warning("Erro ao extrair texto do DOCX %s: %s", file_path, e)
+        return ""
+
+
+@timed('extract.doc')
+def extract_text_from_doc(file_path: str) -> str:
+    """Extrai texto de arquivo DOC (formato antigo)"""
+    docx2txt = optional_import('docx2txt', "arquivos .doc")
+    if docx2txt is None:
+        return ""
+    try:
+        text = docx2txt.process(file_path)
+        return text.lower() if text else ""
+    except Exception as e:
+        logger.warning("Erro ao extrair texto do DOC %s: %s", file_path, e)
+        return ""
+
+
+def extract_text(file_path: str, pdf_engine: str = DEFAULT_PDF_ENGINE) -> str:
+    """Extrai texto escolhendo o extrator pela extensão do arquivo"""
+    extension = Path(file_path).suffix.lower()
+
+    if extension == '.pdf':
+        return extract_text_from_pdf(file_path, pdf_engine)
+    elif extension == '.docx':
+        return extract_text_from_docx(file_path)
+    elif extension == '.doc':
+        return extract_text_from_doc(file_path)
+
+    return ""
+
+
+def _open_worker_cache(cache_path: str, version: str):
+    """Abre (uma vez por processo) o cache em modo somente-leitura"""
+    global _worker_cache
+    if _worker_cache is None or (_worker_cache.path, _worker_cache.version) != (cache_path, version):
+        from .cache import ExtractionCache
+        try:
+            _worker_cache = ExtractionCache(cache_path, read_only=True, version=version)
+        except Exception:
+            return None
+    return _worker_cache
+
+
+def extract_document(file_path: str,
+                     cache_path: Optional[str] = None,
+                     page_budget: Optional[int] = None,
+                     matcher=None,
+                     pdf_engine: str = DEFAULT_PDF_ENGINE) -> Dict[str, Any]:
+    """
+    Extrai o texto de um documento para a fase de extração do pipeline
+
+    Executada nos processos de trabalho, por isso recebe e retorna apenas
+    tipos serializáveis (pickle).
+
+    Args:
+        file_path: Caminho do arquivo
+        cache_path: Caminho do cache de extração (None = sem cache)
+        page_budget: Para PDFs, lê no máximo essa quantidade de páginas
+            enquanto tipo e RA não estiverem determinados (None = documento inteiro)
+        matcher: KeywordMatcher usado para decidir a parada antecipada
+        pdf_engine: Motor de extração de PDF (ver iter_pdf_pages)
+
+    Returns:
+        Dicionário com 'path', 'text', 'error' (None se não houve erro),
+        'hash' (SHA-256 do conteúdo, se houver cache), 'cached' (texto veio
+        do cache), 'gemini' (resultado do Gemini em cache, ou None), 'pages'
+        (páginas lidas na extração limitada, ou None) e 'partial' (a extração
+        parou antes do fim do documento) e 'timings' ('extract' e as subetapas
+        'extract.hash', 'extract.cache', 'extract.pdf'..., em segundos)
+    """
+    result = {'path': file_path, 'text': "", 'error': None,
+              'hash': None, 'cached': False, 'gemini': None,
+              'pages': None, 'partial': False, 'timings': {}}
+    with file_context(file_path), collect(result['timings']), stage('extract'):
+        try:
+            if cache_path:
+                from .cache import hash_file
+                with stage('extract.hash'):
+                    result['hash'] = hash_file(file_path)
+                with stage('extract.cache'):
+                    cache = _open_worker_cache(cache_path, extractor_version(pdf_engine))
+                    entry = cache.get(result['hash']) if cache else None
+                if entry is not None and entry['gemini_type'] is not None:
+                    result['gemini'] = (entry['gemini_text'], entry['gemini_type'])
+                if entry is not None and entry['text'] is not None:
+                    result['text'] = entry['text']
+                    result['cached'] = True
+                    return result
+                # Sem texto armazenado (ex: leitura parcial): extrai de novo e
+                # reaproveita só o resultado do Gemini
+
+            if page_budget and matcher is not None and file_path.lower().endswith('.pdf'):
+                result['text'], result['pages'], result['partial'] = \
+                    extract_text_from_pdf_bounded(file_path, page_budget, matcher, pdf_engine)
+            else:
+                result['text'] = extract_text(file_path, pdf_engine)
+        except Exception as e:
+            result['error'] = str(e)
+
+    return result
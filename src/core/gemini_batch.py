@@ -0,0 +1,178 @@
+"""
+Análise em lote de PDFs escaneados pelo Gemini
+
+Agrupa a imagem da primeira página de vários documentos em uma única
+requisição, com o prompt enviado uma só vez, e separa a resposta em um bloco
+por documento ('DOCUMENTO: n'). Cada lote é limitado pela quantidade de
+imagens e pelo tamanho total das imagens; documentos ausentes na resposta
+são reenviados individualmente.
+"""
+
+import re
+import threading
+from concurrent.futures import Future
+from io import BytesIO
+from typing import Callable, List, Optional, Tuple
+
+from .gemini_scheduler import GeminiScheduler
+
+
+DEFAULT_BATCH_SIZE = 1  # 1 = sem lote (uma requisição por documento)
+DEFAULT_BATCH_MAX_MB = 15
+
+# Início de bloco na resposta em lote: "DOCUMENTO: 2", "**DOCUMENTO 2**", "Documento 2 - ..."
+_BLOCK_START = re.compile(r'^[\s*#>-]*DOCUMENTO\s*:?\s*(\d+)', re.IGNORECASE)
+
+
+def demultiplex_response(response_text: str, count: int) -> List[str]:
+    """
+    Separa a resposta de uma requisição em lote em um texto por documento
+
+    Args:
+        response_text: Resposta do Gemini
+        count: Quantidade de documentos enviados no lote
+
+    Returns:
+        Lista com count textos no formato da resposta individual (TIPO/RA/NOME),
+        na ordem do lote; "" para documentos ausentes na resposta
+    """
+    blocks = [[] for _ in range(count)]
+    current = None
+
+    for line in response_text.splitlines():
+        match = _BLOCK_START.match(line)
+        if match:
+            number = int(match.group(1))
+            current = blocks[number - 1] if 1 <= number <= count else None
+            continue
+        if current is not None:
+            current.append(line)
+
+    return ["\n".join(lines).strip() for lines in blocks]
+
+
+def payload_size(image) -> int:
+    """Tamanho em bytes de uma imagem como enviada na requisição"""
+    if isinstance(image, (bytes, bytearray)):
+        return len(image)
+    if isinstance(image, dict):
+        return len(image.get('data', b''))
+
+    buffer = BytesIO()
+    image.save(buffer, format=getattr(image, 'format', None) or 'PNG')
+    return buffer.tell()
+
+
+class GeminiBatcher:
+    """Acumula documentos e os envia ao Gemini em lotes pelo GeminiScheduler"""
+
+    def __init__(self, scheduler: GeminiScheduler,
+                 render: Callable[[str], Optional[object]],
+                 build_contents: Callable[[List[Tuple[str, object]]], List],
+                 max_documents: int = 4,
+                 max_payload_mb: float = DEFAULT_BATCH_MAX_MB):
+        """
+        Args:
+            scheduler: Agendador que executa as requisições
+            render: Gera a imagem de um documento (None se não houver)
+            build_contents: Monta a requisição a partir de pares (caminho, imagem)
+            max_documents: Máximo de documentos (imagens) por requisição
+            max_payload_mb: Tamanho máximo das imagens de uma requisição
+        """
+        self.scheduler = scheduler
+        self.render = render
+        self.build_contents = build_contents
+        self.max_documents = max(1, max_documents)
+        self.max_payload_bytes = int(max_payload_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+        self._batch: List[Tuple[str, Future, Callable]] = []
+
+        # Estatísticas
+        self.batches = 0
+        self.documents = 0
+
+    def add(self, file_path: str, render: Optional[Callable[[str], Optional[object]]] = None) -> Future:
+        """
+        Inclui um documento no lote atual (enviado ao completar max_documents)
+
+        Args:
+            file_path: Caminho do documento
+            render: Gera a imagem deste documento (None = self.render)
+
+        Returns:
+            Future com o texto da resposta do documento ("" se não houve análise)
+        """
+        future = Future()
+        with self._lock:
+            self._batch.append((file_path, future, render or self.render))
+            full = len(self._batch) >= self.max_documents
+        if full:
+            self.flush()
+        return future
+
+    def flush(self):
+        """Envia o lote atual, mesmo incompleto"""
+        with self._lock:
+            batch, self._batch = self._batch, []
+        if batch:
+            self.scheduler.submit_task(lambda: self._run(batch))
+
+    def cancel(self):
+        """Descarta o lote ainda não enviado"""
+        with self._lock:
+            batch, self._batch = self._batch, []
+        for _, future, _ in batch:
+            future.cancel()
+
+    def _run(self, batch: List[Tuple[str, Future, Callable]]):
+        """Gera as imagens e envia o lote, dividido pelo limite de tamanho"""
+        items = []
+        for file_path, future, render in batch:
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                image = render(file_path)
+                if image is None:
+                    future.set_result("")
+                    continue
+                items.append((file_path, future, image, payload_size(image)))
+            except Exception as e:
+                future.set_exception(e)
+
+        group, group_size = [], 0
+        for item in items:
+            if group and group_size + item[3] > self.max_payload_bytes:
+                self._send(group)
+                group, group_size = [], 0
+            group.append(item)
+            group_size += item[3]
+        if group:
+            self._send(group)
+
+    def _send(self, group):
+        """Envia um grupo de documentos em uma requisição e distribui as respostas"""
+        documents = [(file_path, image) for file_path, _, image, _ in group]
+        try:
+            response_text = self.scheduler.generate(self.build_contents(documents))
+        except Exception as e:
+            for _, future, _, _ in group:
+                future.set_exception(e)
+            return
+
+        with self._lock:
+            self.batches += 1
+            self.documents += len(group)
+
+        if len(group) == 1:
+            group[0][1].set_result(response_text)
+            return
+
+        for (file_path, future, image, _), text in zip(group, demultiplex_response(response_text, len(group))):
+            if not text:
+                # Documento ausente na resposta do lote: reenvia sozinho
+                try:
+                    text = self.scheduler.generate(self.build_contents([(file_path, image)]))
+                except Exception as e:
+                    future.set_exception(e)
+                    continue
+            future.set_result(text)
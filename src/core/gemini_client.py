@@ -0,0 +1,121 @@
+"""
+Modelo do Gemini carregado sob demanda
+
+O SDK do Gemini (google.generativeai) é a dependência mais pesada da
+aplicação e só é necessário para PDFs escaneados. LazyGeminiModel tem a
+mesma interface usada pelo GeminiScheduler (generate_content) e só importa
+e configura o SDK na primeira requisição, ou seja, quando um PDF escaneado
+é de fato encontrado; execuções só com documentos de texto não o carregam.
+"""
+
+import logging
+import os
+import threading
+from typing import List, Optional
+
+from ..utils.lazy_imports import is_available, optional_import
+
+
+logger = logging.getLogger(__name__)
+
+SDK_MODULE = 'google.generativeai'
+DEFAULT_MODEL = 'gemini-2.5-flash'
+
+# Modelos tentados em ordem de preferência (o primeiro é GEMINI_MODEL do .env, se houver)
+FALLBACK_MODELS = [
+    'gemini-2.5-flash',
+    'gemini-2.0-flash',
+    'gemini-flash-latest',
+    'gemini-pro-latest',
+    'gemini-2.5-pro',
+    'gemini-2.0-flash-001'
+]
+
+_environment_loaded = False
+
+
+def load_environment():
+    """Carrega as variáveis do arquivo .env (uma vez por processo)"""
+    global _environment_loaded
+    if _environment_loaded:
+        return
+    _environment_loaded = True
+
+    dotenv = optional_import('dotenv', "o arquivo .env")
+    if dotenv is not None:
+        dotenv.load_dotenv()
+
+
+def gemini_api_key() -> Optional[str]:
+    """Chave da API do .env/ambiente (None se não configurada)"""
+    load_environment()
+    api_key = os.getenv('GEMINI_API_KEY')
+    if not api_key or api_key == 'your_gemini_api_key_here':
+        return None
+    return api_key
+
+
+def sdk_available() -> bool:
+    """Indica se o SDK do Gemini está instalado (sem importá-lo)"""
+    return is_available(SDK_MODULE)
+
+
+class LazyGeminiModel:
+    """Modelo do Gemini cujo SDK só é importado na primeira requisição"""
+
+    def __init__(self, api_key: str, model_names: Optional[List[str]] = None):
+        """
+        Args:
+            api_key: Chave da API
+            model_names: Modelos tentados em ordem (padrão: GEMINI_MODEL e FALLBACK_MODELS)
+        """
+        self.api_key = api_key
+        self.model_names = model_names or [os.getenv('GEMINI_MODEL', DEFAULT_MODEL)] + FALLBACK_MODELS
+        self.model_name: Optional[str] = None
+        self._model = None
+        self._error: Optional[Exception] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None
+
+    def load(self):
+        """Importa e configura o SDK (uma vez; as requisições concorrentes aguardam)"""
+        if self._model is not None:
+            return self._model
+
+        with self._lock:
+            if self._model is None:
+                if self._error is not None:
+                    # Falhou antes: não tenta importar de novo a cada documento
+                    raise self._error
+                try:
+                    self._model = self._create_model()
+                except Exception as e:
+                    self._error = e
+                    logger.error("❌ Erro ao configurar Gemini AI: %s. Verifique se sua API key está válida "
+                                 "e tem acesso aos modelos Gemini", e)
+                    raise
+        return self._model
+
+    def _create_model(self):
+        genai = optional_import(SDK_MODULE, "PDFs escaneados")
+        if genai is None:
+            raise ImportError(f"{SDK_MODULE} não instalado")
+        genai.configure(api_key=self.api_key)
+
+        # Tenta cada modelo até encontrar um que funcione
+        for model_name in self.model_names:
+            try:
+                model = genai.GenerativeModel(model_name)
+            except Exception:
+                if model_name == self.model_names[-1]:  # Último modelo da lista
+                    raise
+                continue
+            self.model_name = model_name
+            logger.info("✅ Gemini AI configurado com sucesso! Modelo: %s", model_name)
+            return model
+
+    def generate_content(self, contents):
+        return self.load().generate_content(contents)
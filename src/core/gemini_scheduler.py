@@ -0,0 +1,239 @@
+"""
+Agendador de requisições ao Gemini
+
+Envia as análises de PDFs escaneados em um pool de threads, mantendo até
+max_in_flight requisições simultâneas, dentro das cotas de requisições por
+minuto (RPM) e de tokens por minuto (TPM) controladas por token buckets.
+Erros 429 (cota excedida) e 5xx são repetidos com backoff exponencial; um
+429 também pausa as demais threads pelo mesmo intervalo.
+
+O cliente é qualquer objeto com generate_content(conteudo) que devolva uma
+resposta com o atributo .text (como genai.GenerativeModel), o que permite
+usar um modelo falso local em testes e benchmarks.
+"""
+
+import logging
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_MAX_IN_FLIGHT = 4
+DEFAULT_REQUESTS_PER_MINUTE = 10
+DEFAULT_TOKENS_PER_MINUTE = 250000
+DEFAULT_MAX_RETRIES = 5
+
+# Estimativa de tokens de uma requisição: texto ~4 caracteres por token,
+# imagem com custo fixo, mais uma margem para a resposta
+CHARS_PER_TOKEN = 4
+IMAGE_TOKENS = 258
+RESPONSE_TOKENS = 100
+
+
+def estimate_tokens(contents: List) -> int:
+    """Estima os tokens consumidos por uma requisição (prompt, imagens e resposta)"""
+    tokens = RESPONSE_TOKENS
+    for part in contents:
+        if isinstance(part, str):
+            tokens += len(part) // CHARS_PER_TOKEN + 1
+        else:
+            tokens += IMAGE_TOKENS
+    return tokens
+
+
+def is_retryable(error: Exception) -> bool:
+    """Indica se o erro é temporário (429, 5xx ou falha de conexão)"""
+    for attribute in ('code', 'status_code'):
+        code = getattr(error, attribute, None)
+        if isinstance(code, int):
+            return code == 429 or 500 <= code < 600
+    return isinstance(error, (ConnectionError, TimeoutError))
+
+
+def is_rate_limit(error: Exception) -> bool:
+    """Indica se o erro é de cota excedida (429)"""
+    return getattr(error, 'code', None) == 429 or getattr(error, 'status_code', None) == 429
+
+
+class TokenBucket:
+    """Token bucket thread-safe reabastecido continuamente a uma taxa por minuto"""
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            per_minute: Tokens repostos por minuto
+            capacity: Máximo acumulado (padrão: a cota de um minuto)
+            clock: Relógio monotônico (injetável em testes)
+            sleep: Função de espera (injetável em testes)
+        """
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+    def acquire(self, amount: float = 1) -> float:
+        """
+        Retira tokens do bucket, esperando o reabastecimento se necessário
+
+        Pedidos maiores que a capacidade são limitados a ela.
+
+        Returns:
+            Segundos de espera
+        """
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return waited
+                wait = (amount - self._tokens) / self.rate
+
+            self._sleep(wait)
+            waited += wait
+
+
+class GeminiScheduler:
+    """Pool de requisições ao Gemini com limite de concorrência, cotas e retentativas"""
+
+    def __init__(self, client,
+                 max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                 requests_per_minute: Optional[float] = DEFAULT_REQUESTS_PER_MINUTE,
+                 tokens_per_minute: Optional[float] = DEFAULT_TOKENS_PER_MINUTE,
+                 max_retries: int = DEFAULT_MAX_RETRIES,
+                 base_delay: float = 2.0,
+                 max_delay: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            client: Modelo com generate_content(conteudo) → resposta com .text
+            max_in_flight: Requisições simultâneas
+            requests_per_minute: Cota de requisições por minuto (None ou 0 = sem limite)
+            tokens_per_minute: Cota de tokens por minuto (None ou 0 = sem limite)
+            max_retries: Retentativas em erros temporários antes de desistir
+            base_delay: Espera da primeira retentativa (dobra a cada tentativa)
+            max_delay: Espera máxima entre tentativas
+            clock: Relógio monotônico (injetável em testes)
+            sleep: Função de espera (injetável em testes)
+        """
+        self.client = client
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._clock = clock
+        self._sleep = sleep
+
+        self._request_bucket = TokenBucket(requests_per_minute, clock=clock, sleep=sleep) \
+            if requests_per_minute else None
+        self._token_bucket = TokenBucket(tokens_per_minute, clock=clock, sleep=sleep) \
+            if tokens_per_minute else None
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_in_flight,
+                                            thread_name_prefix='gemini')
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._paused_until = 0.0
+
+        # Estatísticas
+        self.requests = 0
+        self.retries = 0
+        self.throttled_seconds = 0.0
+
+    def submit(self, build_request: Callable[[], Optional[List]]) -> Future:
+        """
+        Agenda uma requisição
+
+        Args:
+            build_request: Monta o conteúdo da requisição (prompt, imagens) na
+                thread do pool; None quando não há o que enviar
+
+        Returns:
+            Future com o texto da resposta ("" se não houve requisição)
+        """
+        return self.submit_task(lambda: self._run(build_request))
+
+    def submit_task(self, task: Callable[[], object]) -> Future:
+        """Executa uma tarefa no pool (ex: um lote que chama generate)"""
+        future = self._executor.submit(task)
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._discard)
+        return future
+
+    def generate(self, contents: List) -> str:
+        """Envia uma requisição respeitando as cotas, com retentativas"""
+        tokens = estimate_tokens(contents)
+        attempt = 0
+        while True:
+            self._wait_quota(tokens)
+            try:
+                with self._lock:
+                    self.requests += 1
+                response = self.client.generate_content(contents)
+                return response.text if response else ""
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    raise
+
+                delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+                delay *= 0.5 + random.random() / 2
+                attempt += 1
+                with self._lock:
+                    self.retries += 1
+                    if is_rate_limit(e):
+                        # Cota excedida: as demais threads também aguardam
+                        self._paused_until = max(self._paused_until, self._clock() + delay)
+                logger.warning("⏳ Gemini indisponível (%s); nova tentativa %d/%d em %.1fs",
+                               e, attempt, self.max_retries, delay)
+                self._sleep(delay)
+
+    def cancel_pending(self) -> int:
+        """Cancela as requisições que ainda não começaram; retorna quantas"""
+        with self._lock:
+            pending = list(self._pending)
+        return sum(1 for future in pending if future.cancel())
+
+    def shutdown(self, wait: bool = True):
+        """Encerra o pool (as requisições na fila são canceladas)"""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _run(self, build_request) -> str:
+        contents = build_request()
+        if not contents:
+            return ""
+        return self.generate(contents)
+
+    def _wait_quota(self, tokens: int):
+        """Aguarda a pausa por 429 e as cotas de requisições e tokens"""
+        with self._lock:
+            pause = self._paused_until - self._clock()
+        if pause > 0:
+            self._sleep(pause)
+
+        waited = max(pause, 0.0)
+        if self._request_bucket:
+            waited += self._request_bucket.acquire(1)
+        if self._token_bucket:
+            waited += self._token_bucket.acquire(tokens)
+
+        if waited:
+            with self._lock:
+                self.throttled_seconds += waited
+
+    def _discard(self, future: Future):
+        with self._lock:
+            self._pending.discard(future)
@@ -0,0 +1,74 @@
+"""
+Matcher de palavras-chave compilado a partir das regras de renomeação
+
+As regras são compiladas uma única vez (em load_rules/add_rule) em uma tabela
+de palavras-chave únicas, já em minúsculas, com o peso de cada uma para cada
+tipo de documento. Palavras-chave repetidas entre regras ("registro",
+"graduação"...) são procuradas uma vez só, e a pontuação de todos os tipos é
+acumulada de uma vez a partir dessa tabela.
+
+A busca de cada palavra usa o operador 'in' do Python (implementado em C),
+que nas medições com históricos de dezenas de KB foi mais rápido que um
+autômato Aho-Corasick ou uma expressão regular combinada em Python puro.
+"""
+
+from typing import Dict, Optional
+
+
+# Pesos da pontuação (o nome do arquivo vale mais que o texto)
+TEXT_WEIGHT = 2
+FILENAME_WEIGHT = 3
+
+
+class KeywordMatcher:
+    """Pontua todos os tipos de documento de uma vez a partir das palavras-chave"""
+
+    def __init__(self, rules: Dict):
+        """
+        Args:
+            rules: Regras de renomeação (tipo → {'keywords': [...], ...})
+        """
+        self.types = tuple(rules.keys())
+
+        weights: Dict[str, Dict[int, int]] = {}
+        for type_index, rule in enumerate(rules.values()):
+            for keyword in rule['keywords']:
+                keyword_weights = weights.setdefault(keyword.lower(), {})
+                keyword_weights[type_index] = keyword_weights.get(type_index, 0) + 1
+
+        # (palavra-chave, ((índice do tipo, ocorrências na regra), ...))
+        self._keywords = tuple(
+            (keyword, tuple(type_weights.items()))
+            for keyword, type_weights in weights.items()
+        )
+
+    def score(self, text: str, filename: str = "") -> Dict[str, int]:
+        """
+        Calcula a pontuação de cada tipo (2 por palavra no texto, 3 no nome do arquivo)
+
+        Returns:
+            Dicionário tipo → pontuação, apenas com pontuação > 0, na ordem das regras
+        """
+        text_lower = text.lower()
+        filename_lower = filename.lower() if filename else ""
+
+        totals = [0] * len(self.types)
+        for keyword, type_weights in self._keywords:
+            points = 0
+            if keyword in text_lower:
+                points += TEXT_WEIGHT
+            if keyword in filename_lower:
+                points += FILENAME_WEIGHT
+
+            if points:
+                for type_index, count in type_weights:
+                    totals[type_index] += points * count
+
+        return {doc_type: total for doc_type, total in zip(self.types, totals) if total > 0}
+
+    def best_type(self, text: str, filename: str = "") -> Optional[str]:
+        """Retorna o tipo com maior pontuação (o primeiro das regras em caso de empate)"""
+        scores = self.score(text, filename)
+        if scores:
+            return max(scores, key=scores.get)
+        return None
@@ -0,0 +1,119 @@
+"""
+Índice de nomes para o cross-referencing de RA
+
+Substitui a varredura linear de processed_files em find_ra_by_name. Cada
+registro (nome normalizado com '_' entre as palavras, RA) é indexado por:
+
+- nome exato
+- cada par de palavras do nome (a regra de similaridade exige pelo menos 2
+  palavras em comum, ou seja, ao menos um par de palavras compartilhado)
+
+A busca consulta apenas as listas do nome exato e dos pares de palavras do
+nome procurado, então o custo depende do tamanho do nome e não da quantidade
+de registros. O resultado é o mesmo da varredura: o registro mais antigo
+(ordem de inserção) que seja igual ao nome ou tenha 2+ palavras em comum.
+"""
+
+from bisect import insort
+from itertools import combinations
+from typing import Dict, List, Optional, Set, Tuple
+
+
+class NameIndex:
+    """Índice incremental nome→RA com busca por nome exato ou 2+ palavras em comum"""
+
+    def __init__(self):
+        # Registro por posição de inserção: [chave, nome, ra, palavras]
+        self._entries: List[list] = []
+        self._positions: Dict[str, int] = {}
+        self._exact: Dict[str, List[int]] = {}
+        self._pairs: Dict[Tuple[str, str], List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def copy(self) -> 'NameIndex':
+        """Cópia independente do índice (registros adicionados a ela não alteram o original)"""
+        other = NameIndex()
+        # Registros são substituídos, nunca alterados, e podem ser compartilhados
+        other._entries = list(self._entries)
+        other._positions = dict(self._positions)
+        other._exact = {nome: list(positions) for nome, positions in self._exact.items()}
+        other._pairs = {pair: list(positions) for pair, positions in self._pairs.items()}
+        return other
+
+    def add(self, key: str, nome: str, ra: Optional[str]):
+        """
+        Registra (ou atualiza) o nome e o RA associados a uma chave
+
+        Como em um dicionário, atualizar uma chave existente mantém sua posição
+        original na ordem de busca.
+
+        Args:
+            key: Identificador do registro (nome original do arquivo)
+            nome: Nome normalizado (ex: 'katia_veronica_silva')
+            ra: RA associado (registros sem RA ou sem nome não são buscáveis)
+        """
+        words = frozenset(nome.split('_')) if nome else frozenset()
+
+        position = self._positions.get(key)
+        if position is None:
+            position = len(self._entries)
+            self._positions[key] = position
+            self._entries.append([key, nome, ra, words])
+        else:
+            entry = self._entries[position]
+            if entry[1] == nome and entry[2] == ra:
+                return
+            # Listas antigas não são limpas: registros obsoletos são
+            # descartados na busca ao conferir o estado atual
+            self._entries[position] = [key, nome, ra, words]
+
+        if not (nome and ra):
+            return
+
+        insort(self._exact.setdefault(nome, []), position)
+        for pair in combinations(sorted(words), 2):
+            insort(self._pairs.setdefault(pair, []), position)
+
+    def find(self, nome: str) -> Optional[Tuple[str, str, Optional[Set[str]]]]:
+        """
+        Busca o RA de um nome
+
+        Args:
+            nome: Nome normalizado procurado
+
+        Returns:
+            Tupla (ra, chave do registro, palavras em comum) ou None. As
+            palavras em comum são None quando o nome coincide exatamente.
+        """
+        words = set(nome.split('_'))
+        best = self._first_valid(self._exact.get(nome), lambda entry: entry[1] == nome)
+
+        for pair in combinations(sorted(words), 2):
+            candidate = self._first_valid(
+                self._pairs.get(pair),
+                lambda entry, pair=pair: pair[0] in entry[3] and pair[1] in entry[3]
+            )
+            if candidate is not None and (best is None or candidate < best):
+                best = candidate
+
+        if best is None:
+            return None
+
+        key, entry_nome, ra, entry_words = self._entries[best]
+        if entry_nome == nome:
+            return ra, key, None
+        return ra, key, words & entry_words
+
+    def _first_valid(self, positions: Optional[List[int]], matches) -> Optional[int]:
+        """Primeira posição da lista cujo registro atual ainda é buscável e corresponde"""
+        if not positions:
+            return None
+
+        for position in positions:
+            entry = self._entries[position]
+            if entry[1] and entry[2] and matches(entry):
+                return position
+
+        return None
@@ -0,0 +1,95 @@
+"""
+Renderização de páginas de PDF para envio ao Gemini
+
+Renderiza apenas a página enviada, com resolução limitada (DPI e lado
+máximo em pixels), opcionalmente em tons de cinza, e codifica direto do
+pixmap do PyMuPDF para PNG/JPEG (ou WebP via Pillow, a partir das amostras
+brutas). Os bytes codificados vão na requisição como blob inline, sem o
+ciclo decodificar/recodificar de um objeto PIL.Image.
+"""
+
+import mimetypes
+from io import BytesIO
+from typing import Any, Dict, Optional
+
+from ..utils.lazy_imports import optional_import
+
+
+IMAGE_FORMATS = {
+    'png': 'image/png',
+    'jpeg': 'image/jpeg',
+    'webp': 'image/webp',
+}
+
+DEFAULT_DPI = 144  # Mesma resolução do zoom 2x usado anteriormente
+DEFAULT_MAX_SIDE = 2000
+DEFAULT_FORMAT = 'jpeg'
+DEFAULT_QUALITY = 85
+
+
+def render_pdf_page(file_path: str,
+                    page_number: int = 0,
+                    dpi: float = DEFAULT_DPI,
+                    max_side: Optional[int] = DEFAULT_MAX_SIDE,
+                    grayscale: bool = False,
+                    image_format: str = DEFAULT_FORMAT,
+                    quality: int = DEFAULT_QUALITY) -> Optional[Dict[str, Any]]:
+    """
+    Renderiza uma página do PDF como imagem codificada
+
+    Args:
+        file_path: Caminho do PDF
+        page_number: Página renderizada (0 = primeira)
+        dpi: Resolução de renderização
+        max_side: Limite do maior lado em pixels (reduz o DPI se necessário;
+            None ou 0 = sem limite)
+        grayscale: Renderiza em tons de cinza
+        image_format: 'png', 'jpeg' ou 'webp'
+        quality: Qualidade de JPEG/WebP (1-100)
+
+    Returns:
+        Blob {'mime_type', 'data'} aceito pelo Gemini, ou None se o PDF não
+        tiver a página
+
+    Raises:
+        ImportError: PyMuPDF (ou Pillow, para WebP) não instalado
+        ValueError: Formato de imagem desconhecido
+    """
+    if image_format not in IMAGE_FORMATS:
+        raise ValueError(f"Formato de imagem desconhecido: {image_format}")
+    fitz = optional_import('fitz', "PDFs escaneados")  # Primeiro uso: só quando há PDF escaneado
+    if fitz is None:
+        raise ImportError("PyMuPDF não instalado")
+
+    with fitz.open(file_path) as doc:
+        if page_number >= len(doc):
+            return None
+
+        page = doc[page_number]
+        zoom = dpi / 72
+        if max_side:
+            zoom = min(zoom, max_side / max(page.rect.width, page.rect.height))
+
+        pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom),
+                              colorspace=fitz.csGRAY if grayscale else fitz.csRGB,
+                              alpha=False)
+
+        if image_format == 'png':
+            data = pix.tobytes("png")
+        elif image_format == 'jpeg':
+            data = pix.tobytes("jpeg", jpg_quality=quality)
+        else:
+            from PIL import Image
+            image = Image.frombytes("L" if grayscale else "RGB", (pix.width, pix.height), pix.samples)
+            buffer = BytesIO()
+            image.save(buffer, format='WEBP', quality=quality)
+            data = buffer.getvalue()
+
+    return {'mime_type': IMAGE_FORMATS[image_format], 'data': data}
+
+
+def load_image_file(file_path: str) -> Dict[str, Any]:
+    """Lê um arquivo de imagem como blob, sem decodificá-lo"""
+    mime_type = mimetypes.guess_type(file_path)[0] or 'application/octet-stream'
+    with open(file_path, 'rb') as f:
+        return {'mime_type': mime_type, 'data': f.read()}
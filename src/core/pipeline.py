@@ -0,0 +1,289 @@
+"""
+Pipeline de processamento em duas fases
+
+Fase 1 (extração): o texto dos arquivos é extraído em paralelo por um pool
+de processos (pdfplumber/PyPDF2, python-docx, docx2txt).
+
+Fase 2 (resolução): identificação do tipo, cross-referencing de RA e
+renomeação acontecem em uma única thread, na mesma ordem dos arquivos de
+entrada. Como a resolução consome os resultados na ordem original, os nomes
+finais são idênticos aos do processamento sequencial.
+
+No modo de duas passagens (two_pass=True), a fase 1 termina por completo
+(inclusive a análise do Gemini) e todos os pares nome→RA conhecidos são
+registrados antes da primeira renomeação, eliminando a dependência da ordem
+dos arquivos no cross-referencing.
+
+A lista de arquivos pode ser um gerador (ex: file_scanner.iter_files): cada
+arquivo vai para o pool de extração assim que é encontrado, e a resolução
+começa quando a varredura termina (nenhum arquivo é renomeado enquanto o
+diretório ainda está sendo lido).
+
+PDFs escaneados (sem texto) são enviados ao Gemini assim que extraídos, antes
+de chegar sua vez na resolução: o pipeline lê alguns resultados à frente e
+agenda as requisições no GeminiScheduler do analisador, que as executa em
+paralelo. A resolução aguarda cada resposta na ordem original.
+
+O pool de extração pode ser fornecido de fora (executor=, ver
+analyzer_service.AnalyzerService): nesse caso ele é reaproveitado entre
+execuções, com os processos já iniciados e as bibliotecas já importadas, e
+não é encerrado ao fim da execução. Se o pool quebrar (BrokenProcessPool, ex:
+um processo de trabalho encerrado), os arquivos restantes são extraídos no
+próprio processo e on_broken_pool avisa o dono do pool para descartá-lo.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from . import extractors
+from .timing import collect, stage
+from ..utils.logging_setup import configure_worker_logging, file_context, worker_logging_config
+
+
+# Máximo de arquivos lidos à frente da resolução para agendar o Gemini
+GEMINI_LOOKAHEAD_FILES = 64
+
+
+def default_worker_count() -> int:
+    """Número padrão de processos de extração (um por núcleo)"""
+    return os.cpu_count() or 1
+
+
+def create_executor(workers: int) -> ProcessPoolExecutor:
+    """Pool de processos de extração (registro de log encaminhado ao processo principal)"""
+    return ProcessPoolExecutor(max_workers=workers,
+                               initializer=configure_worker_logging,
+                               initargs=(worker_logging_config(),))
+
+
+class ProcessingPipeline:
+    """Executa extração paralela seguida de resolução sequencial determinística"""
+
+    def __init__(self, analyzer, workers: Optional[int] = None, two_pass: bool = False,
+                 executor: Optional[ProcessPoolExecutor] = None, context=None,
+                 on_broken_pool: Optional[Callable[[ProcessPoolExecutor], None]] = None):
+        """
+        Args:
+            analyzer: DocumentAnalyzer responsável pela fase de resolução
+            workers: Número de processos de extração (None ou 0 = automático,
+                1 = tudo no processo atual, como no fluxo sequencial)
+            two_pass: Extrai todos os arquivos e monta o índice nome→RA
+                completo antes de renomear qualquer arquivo
+            executor: Pool de extração compartilhado, mantido aberto ao fim da
+                execução (None = pool próprio, criado e encerrado em run)
+            context: RunContext da execução (None = contexto padrão do
+                analisador); pipelines com contextos diferentes podem rodar
+                ao mesmo tempo com o mesmo analisador
+            on_broken_pool: Chamado como on_broken_pool(executor) quando o pool
+                compartilhado deixa de funcionar (BrokenProcessPool)
+        """
+        self.analyzer = analyzer
+        self.workers = workers if workers and workers > 0 else default_worker_count()
+        self.two_pass = two_pass
+        self.executor = executor
+        self.context = context if context is not None else analyzer.context
+        self.on_broken_pool = on_broken_pool
+        self.pool_broken = False  # O pool quebrou durante a execução
+
+    def run(self,
+            files: Iterable,
+            on_file_start: Optional[Callable] = None,
+            on_file_done: Optional[Callable] = None,
+            should_stop: Optional[Callable[[], bool]] = None,
+            on_extracted: Optional[Callable] = None,
+            on_result: Optional[Callable] = None) -> Tuple[int, int]:
+        """
+        Processa uma lista de arquivos
+
+        Args:
+            files: Caminhos dos arquivos, na ordem em que devem ser resolvidos
+                (lista ou gerador; a extração começa durante a varredura)
+            on_file_start: Chamado como on_file_start(indice, total, caminho)
+            on_file_done: Chamado como on_file_done(indice, total, caminho, sucesso, mensagem)
+            should_stop: Retorna True quando o processamento deve ser interrompido
+            on_extracted: Chamado como on_extracted(indice, total, caminho) ao fim
+                da extração de cada arquivo na primeira passagem (two_pass)
+            on_result: Chamado como on_result(indice, total, resultado) com o
+                dicionário completo do arquivo (extract_document + 'success',
+                'message', 'outcome' e 'timings')
+
+        Returns:
+            Tupla (arquivos processados com sucesso, arquivos processados)
+        """
+        context = self.context
+        self.analyzer.start_run(context)
+        successful = 0
+        processed = 0
+        options = self.analyzer.extraction_options()
+        paths = []
+        futures = {}
+        executor = self.executor
+        owns_executor = executor is None
+
+        try:
+            # Envia cada arquivo ao pool assim que a varredura o encontra. O pool
+            # próprio só é criado a partir do segundo arquivo suportado (um
+            # arquivo só é extraído aqui mesmo, como antes)
+            first = None
+            for f in files:
+                path = str(f)
+                paths.append(path)
+                if self.workers <= 1 or self.pool_broken or \
+                        Path(path).suffix.lower() not in extractors.SUPPORTED_EXTENSIONS:
+                    continue
+                if executor is None:
+                    if first is None:
+                        first = path
+                        continue
+                    executor = create_executor(self.workers)
+                    self._submit(executor, futures, first, options)
+                self._submit(executor, futures, path, options)
+            total = len(paths)
+
+            extracted = self._extract_in_order(paths, futures, options)
+
+            if self.analyzer.gemini_scheduler:
+                extracted = self._dispatch_gemini_ahead(extracted)
+
+            if self.two_pass:
+                extracted = self._first_pass(extracted, total, on_extracted, should_stop)
+
+            for index, (path, get_result) in enumerate(extracted):
+                if should_stop and should_stop():
+                    break
+
+                if on_file_start:
+                    on_file_start(index, total, path)
+
+                with file_context(path):
+                    if get_result is None:
+                        success, message = self.analyzer.process_file(path, context)
+                        result = {'path': path, 'error': message, 'success': success, 'message': message,
+                                  'outcome': {}, 'timings': {}}
+                    else:
+                        result = get_result()
+                        success, message = self.analyzer.resolve_document(result, context)
+
+                if success:
+                    successful += 1
+                processed += 1
+
+                if on_file_done:
+                    on_file_done(index, total, path, success, message)
+                if on_result:
+                    on_result(index, total, result)
+        finally:
+            if executor and owns_executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+            else:
+                # Pool compartilhado: só descarta as extrações não consumidas
+                for future in futures.values():
+                    future.cancel()
+            if context.gemini_inflight:
+                # Interrompido: guarda as respostas do Gemini já recebidas e
+                # cancela as requisições desta execução que não começaram
+                self.analyzer.save_inflight_gemini(context)
+            if self.analyzer.cache:
+                self.analyzer.cache.evict()
+
+        return successful, processed
+
+    def _extract_in_order(self, paths, futures: Dict, options: Dict) -> Iterator[Tuple[str, Optional[Callable]]]:
+        """
+        Gera (caminho, obter_resultado) na ordem de entrada
+
+        obter_resultado() devolve o dicionário de extractors.extract_document
+        (do pool, se o arquivo estiver em futures, ou extraído aqui mesmo); é
+        None para extensões não suportadas (tratadas por process_file).
+        """
+        for path in paths:
+            if Path(path).suffix.lower() not in extractors.SUPPORTED_EXTENSIONS:
+                yield path, None
+                continue
+
+            future = futures.pop(path, None)
+            if future is None:
+                yield path, lambda path=path: extractors.extract_document(path, **options)
+            else:
+                yield path, lambda path=path, future=future: self._future_result(path, future, options)
+
+    def _submit(self, executor: ProcessPoolExecutor, futures: Dict, path: str, options: Dict):
+        """Envia um arquivo ao pool (se o pool estiver quebrado, ele é extraído na resolução)"""
+        try:
+            futures[path] = executor.submit(extractors.extract_document, path, **options)
+        except BrokenProcessPool:
+            self._broken_pool()
+
+    def _future_result(self, path: str, future, options: Dict):
+        """Aguarda a extração de um arquivo no pool"""
+        try:
+            return future.result()
+        except BrokenProcessPool:
+            # Pool indisponível (ex: processo de trabalho encerrado): extrai aqui mesmo
+            self._broken_pool()
+            return extractors.extract_document(path, **options)
+
+    def _broken_pool(self):
+        """Registra que o pool quebrou e avisa o dono do pool compartilhado (uma vez)"""
+        if self.pool_broken:
+            return
+        self.pool_broken = True
+        if self.executor is not None and self.on_broken_pool:
+            self.on_broken_pool(self.executor)
+
+    def _dispatch_gemini_ahead(self, extracted):
+        """
+        Lê resultados à frente da resolução e agenda os PDFs escaneados no Gemini
+
+        Mantém até analyzer.gemini_prefetch análises agendadas à frente (e no
+        máximo GEMINI_LOOKAHEAD_FILES arquivos) para que o pool do Gemini não
+        fique ocioso; a ordem de saída é a mesma da entrada.
+        """
+        target = self.analyzer.gemini_prefetch
+        buffered = deque()
+        dispatched = 0
+
+        for path, get_result in extracted:
+            scheduled = False
+            if get_result is not None:
+                result = get_result()
+                scheduled = self.analyzer.dispatch_gemini(result, self.context)
+                get_result = lambda result=result: result
+
+            buffered.append((path, get_result, scheduled))
+            dispatched += scheduled
+
+            while buffered and (dispatched >= target or len(buffered) > GEMINI_LOOKAHEAD_FILES):
+                path, get_result, scheduled = buffered.popleft()
+                dispatched -= scheduled
+                yield path, get_result
+
+        while buffered:
+            path, get_result, _ = buffered.popleft()
+            yield path, get_result
+
+    def _first_pass(self, extracted, total, on_extracted, should_stop):
+        """Extrai todos os arquivos e registra os pares nome→RA antes da resolução"""
+        results = []
+        for index, (path, get_result) in enumerate(extracted):
+            if should_stop and should_stop():
+                break
+
+            if get_result is None:
+                results.append((path, None))
+                continue
+
+            with file_context(path):
+                result = self.analyzer.complete_document(get_result(), self.context)
+                with collect(result.setdefault('timings', {})), stage('prepass'):
+                    self.analyzer.register_known_ra(result, self.context)
+            results.append((path, lambda result=result: result))
+
+            if on_extracted:
+                on_extracted(index, total, path)
+
+        return results
@@ -0,0 +1,341 @@
+"""
+Diário transacional de renomeações
+
+Cada execução grava um diário JSON Lines, apenas com acréscimos, em
+config/journal/. Antes de cada renomeação é gravada a intenção (origem,
+destino, SHA-256 do conteúdo) e, depois dela, a confirmação:
+
+    {"op": "begin", "run": ..., "directory": ..., "time": ...}
+    {"op": "rename", "seq": 1, "source": ..., "target": ..., "hash": ...}
+    {"op": "done", "seq": 1}
+    {"op": "undone", "seq": 1}
+    {"op": "commit"} | {"op": "rolled_back"}
+
+As linhas vão para o sistema operacional logo após serem escritas
+(sobrevivem a um travamento do processo) e o fsync é feito em lotes, a cada
+fsync_every registros e ao final. Um diário sem 'commit'/'rolled_back' é de
+uma execução interrompida: recover() conclui as renomeações pendentes
+(resume) ou desfaz a execução (rollback); undo() desfaz uma execução
+concluída. Nenhum dado de arquivo é copiado.
+"""
+
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .cache import hash_file
+
+
+DEFAULT_FSYNC_EVERY = 50
+DEFAULT_KEEP_JOURNALS = 20
+
+
+def journal_dir(config_dir: str) -> str:
+    """Diretório dos diários dentro do diretório de configuração"""
+    return os.path.join(config_dir, 'journal')
+
+
+class RenameJournal:
+    """Diário de uma execução, aberto para acréscimos"""
+
+    def __init__(self, path: str, fsync_every: int = DEFAULT_FSYNC_EVERY):
+        """
+        Args:
+            path: Arquivo do diário (criado se não existir)
+            fsync_every: Registros entre cada fsync
+        """
+        self.path = path
+        self.fsync_every = max(1, fsync_every)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, 'a', encoding='utf-8')
+        self._unsynced = 0
+        self._seq = 0
+        if os.path.getsize(path):
+            self._seq = read_journal(path)['last_seq']
+            with open(path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    # Termina a linha incompleta de uma execução interrompida
+                    self._file.write("\n")
+
+    @classmethod
+    def create(cls, directory: str, run_directory: str, fsync_every: int = DEFAULT_FSYNC_EVERY) -> 'RenameJournal':
+        """
+        Cria o diário de uma nova execução
+
+        Args:
+            directory: Diretório dos diários (ver journal_dir)
+            run_directory: Diretório de documentos processado na execução
+            fsync_every: Registros entre cada fsync
+        """
+        run_id = datetime.now().strftime('%Y%m%d-%H%M%S') + f"-{os.getpid()}"
+        journal = cls(os.path.join(directory, f"run-{run_id}.jsonl"), fsync_every)
+        journal._write({'op': 'begin', 'run': run_id, 'directory': str(run_directory), 'time': time.time()},
+                       sync=True)
+        return journal
+
+    def record_rename(self, source: Path, target: Path, content_hash: Optional[str] = None) -> int:
+        """
+        Registra a intenção de renomear (antes de renomear)
+
+        Args:
+            source: Caminho atual
+            target: Caminho final
+            content_hash: SHA-256 do conteúdo (calculado se None)
+
+        Returns:
+            Número de sequência da renomeação (para record_done)
+        """
+        self._seq += 1
+        self._write({
+            'op': 'rename', 'seq': self._seq,
+            'source': str(source), 'target': str(target),
+            'hash': content_hash or hash_file(str(source)),
+        })
+        return self._seq
+
+    def record_done(self, seq: int):
+        """Confirma uma renomeação concluída"""
+        self._write({'op': 'done', 'seq': seq})
+
+    def record_undone(self, seq: int):
+        """Registra que uma renomeação foi desfeita"""
+        self._write({'op': 'undone', 'seq': seq})
+
+    def commit(self):
+        """Marca a execução como concluída"""
+        self._write({'op': 'commit', 'time': time.time()}, sync=True)
+
+    def mark_rolled_back(self):
+        """Marca a execução como desfeita"""
+        self._write({'op': 'rolled_back', 'time': time.time()}, sync=True)
+
+    def sync(self):
+        """Força a gravação em disco dos registros pendentes"""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def close(self):
+        """Grava os registros pendentes e fecha o diário"""
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    def _write(self, record: Dict[str, Any], sync: bool = False):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self._unsynced += 1
+        if sync or self._unsynced >= self.fsync_every:
+            self.sync()
+
+
+def read_journal(path: str) -> Dict[str, Any]:
+    """
+    Lê o estado de um diário
+
+    Returns:
+        Dicionário com 'path', 'run', 'directory', 'time', 'state' ('open',
+        'committed' ou 'rolled_back'), 'last_seq' e 'renames' (lista, em ordem,
+        de dicionários com seq, source, target, hash, done e undone)
+    """
+    info = {'path': path, 'run': None, 'directory': None, 'time': None,
+            'state': 'open', 'last_seq': 0, 'renames': []}
+    renames = {}
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Última linha incompleta (execução interrompida durante a escrita)
+                continue
+
+            op = record.get('op')
+            if op == 'begin':
+                info.update(run=record.get('run'), directory=record.get('directory'), time=record.get('time'))
+            elif op == 'rename':
+                renames[record['seq']] = dict(record, done=False, undone=False)
+                info['last_seq'] = max(info['last_seq'], record['seq'])
+            elif op == 'done' and record['seq'] in renames:
+                renames[record['seq']]['done'] = True
+            elif op == 'undone' and record['seq'] in renames:
+                renames[record['seq']]['undone'] = True
+            elif op == 'commit':
+                info['state'] = 'committed'
+            elif op == 'rolled_back':
+                info['state'] = 'rolled_back'
+
+    info['renames'] = [renames[seq] for seq in sorted(renames)]
+    return info
+
+
+def list_journals(directory: str) -> List[str]:
+    """Diários existentes, do mais antigo para o mais recente"""
+    if not os.path.isdir(directory):
+        return []
+    names = sorted(name for name in os.listdir(directory) if name.startswith('run-') and name.endswith('.jsonl'))
+    return [os.path.join(directory, name) for name in names]
+
+
+def find_incomplete(directory: str) -> List[str]:
+    """Diários de execuções interrompidas (sem commit nem rollback)"""
+    return [path for path in list_journals(directory) if read_journal(path)['state'] == 'open']
+
+
+def prune_journals(directory: str, keep: int = DEFAULT_KEEP_JOURNALS) -> int:
+    """Remove os diários concluídos mais antigos, mantendo os 'keep' mais recentes"""
+    finished = [path for path in list_journals(directory) if read_journal(path)['state'] != 'open']
+    removed = 0
+    for path in finished[:max(0, len(finished) - keep)]:
+        try:
+            os.remove(path)
+            removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+def _matches(path: Path, content_hash: Optional[str]) -> bool:
+    """Confere se o arquivo ainda é o mesmo registrado no diário"""
+    return not content_hash or hash_file(str(path)) == content_hash
+
+
+def _pending_state(entry: Dict) -> str:
+    """
+    Estado no disco de uma renomeação registrada sem confirmação
+
+    Returns:
+        'done' (já renomeado), 'pending' (não renomeado) ou 'missing'
+    """
+    source, target = Path(entry['source']), Path(entry['target'])
+    if target.exists() and not source.exists():
+        return 'done'
+    if source.exists():
+        return 'pending'
+    return 'missing'
+
+
+def undo(path: str, on_entry: Optional[Callable[[Dict, bool, str], None]] = None) -> Tuple[int, int]:
+    """
+    Desfaz as renomeações de um diário, da última para a primeira
+
+    Cada arquivo só volta ao nome original se o conteúdo ainda for o
+    registrado (SHA-256) e o nome original estiver livre.
+
+    Args:
+        path: Arquivo do diário
+        on_entry: Chamado como on_entry(renomeação, sucesso, mensagem)
+
+    Returns:
+        Tupla (renomeações desfeitas, renomeações não desfeitas)
+    """
+    info = read_journal(path)
+    journal = RenameJournal(path)
+    undone = 0
+    failed = 0
+
+    try:
+        for entry in reversed(info['renames']):
+            if entry['undone']:
+                continue
+            if not entry['done'] and _pending_state(entry) != 'done':
+                # Renomeação que não chegou a acontecer
+                continue
+
+            source, target = Path(entry['source']), Path(entry['target'])
+            if not target.exists():
+                success, message = False, f"Arquivo não encontrado: {target}"
+            elif source.exists():
+                success, message = False, f"Nome original já está em uso: {source}"
+            elif not _matches(target, entry.get('hash')):
+                success, message = False, f"Conteúdo de {target.name} foi alterado; não desfeito"
+            else:
+                try:
+                    target.rename(source)
+                    journal.record_undone(entry['seq'])
+                    success, message = True, f"{target.name} → {source.name}"
+                except OSError as e:
+                    success, message = False, f"Erro ao desfazer {target.name}: {e}"
+
+            if success:
+                undone += 1
+            else:
+                failed += 1
+            if on_entry:
+                on_entry(entry, success, message)
+
+        if not failed:
+            journal.mark_rolled_back()
+    finally:
+        journal.close()
+
+    return undone, failed
+
+
+def recover(path: str, mode: str = 'rollback',
+            on_entry: Optional[Callable[[Dict, bool, str], None]] = None) -> Tuple[int, int]:
+    """
+    Recupera uma execução interrompida
+
+    Args:
+        path: Arquivo do diário
+        mode: 'resume' conclui as renomeações registradas e não confirmadas e
+            marca a execução como concluída (só se nenhuma falhar: com falhas
+            o diário continua aberto e um novo recover tenta de novo apenas
+            as que faltam); 'rollback' desfaz a execução
+        on_entry: Chamado como on_entry(renomeação, sucesso, mensagem)
+
+    Returns:
+        Tupla (renomeações concluídas/desfeitas, falhas)
+    """
+    if mode == 'rollback':
+        return undo(path, on_entry)
+    if mode != 'resume':
+        raise ValueError(f"Modo de recuperação desconhecido: {mode}")
+
+    info = read_journal(path)
+    journal = RenameJournal(path)
+    completed = 0
+    failed = 0
+
+    try:
+        for entry in info['renames']:
+            if entry['done'] or entry['undone']:
+                continue
+
+            state = _pending_state(entry)
+            source, target = Path(entry['source']), Path(entry['target'])
+            if state == 'done':
+                journal.record_done(entry['seq'])
+                success, message = True, f"{source.name} → {target.name} (já renomeado)"
+            elif state == 'missing':
+                success, message = False, f"Arquivo não encontrado: {source}"
+            elif target.exists():
+                success, message = False, f"Destino já existe: {target}"
+            elif not _matches(source, entry.get('hash')):
+                success, message = False, f"Conteúdo de {source.name} foi alterado; não renomeado"
+            else:
+                try:
+                    source.rename(target)
+                    journal.record_done(entry['seq'])
+                    success, message = True, f"{source.name} → {target.name}"
+                except OSError as e:
+                    success, message = False, f"Erro ao renomear {source.name}: {e}"
+
+            if success:
+                completed += 1
+            else:
+                failed += 1
+            if on_entry:
+                on_entry(entry, success, message)
+
+        if not failed:
+            journal.commit()
+    finally:
+        journal.close()
+
+    return completed, failed
@@ -0,0 +1,163 @@
+"""
+Plano de renomeação
+
+TakenNames resolve os sufixos de colisão (_1, _2...) contra um conjunto em
+memória dos nomes ocupados em cada diretório, carregado com um único
+os.listdir, em vez de chamar exists() repetidamente. Ele simula o efeito
+das renomeações na ordem de processamento: o nome atual do arquivo conta
+como ocupado até ele ser renomeado, e então é liberado.
+
+RenamePlan guarda as renomeações calculadas em modo de simulação (dry-run),
+pode ser gravado/lido em JSON para revisão e é executado depois, em uma
+única passada, por apply().
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+
+PLAN_VERSION = 1
+
+
+class TakenNames:
+    """Nomes ocupados por diretório, mantidos em memória durante uma execução"""
+
+    def __init__(self):
+        self._directories: Dict[str, set] = {}
+
+    def _names(self, directory: Path) -> set:
+        key = os.path.normcase(os.path.abspath(directory))
+        names = self._directories.get(key)
+        if names is None:
+            try:
+                names = {os.path.normcase(name) for name in os.listdir(directory)}
+            except OSError:
+                names = set()
+            self._directories[key] = names
+        return names
+
+    def is_taken(self, path: Path) -> bool:
+        """Indica se o nome está ocupado no diretório"""
+        return os.path.normcase(path.name) in self._names(path.parent)
+
+    def mark_taken(self, path: Path):
+        """Marca um nome como ocupado (ex: arquivo criado fora do plano)"""
+        self._names(path.parent).add(os.path.normcase(path.name))
+
+    def resolve(self, directory: Path, filename: str) -> str:
+        """Nome livre no diretório: o próprio nome ou stem_1, stem_2..."""
+        names = self._names(directory)
+        if os.path.normcase(filename) not in names:
+            return filename
+
+        stem = Path(filename).stem
+        extension = Path(filename).suffix
+        counter = 1
+        while True:
+            candidate = f"{stem}_{counter}{extension}"
+            if os.path.normcase(candidate) not in names:
+                return candidate
+            counter += 1
+
+    def move(self, source: Path, target: Path):
+        """Registra uma renomeação: libera o nome de origem e ocupa o de destino"""
+        self._names(source.parent).discard(os.path.normcase(source.name))
+        self._names(target.parent).add(os.path.normcase(target.name))
+
+
+class RenamePlan:
+    """Lista ordenada de renomeações (origem → destino) com os dados de cada arquivo"""
+
+    def __init__(self, entries: Optional[List[Dict[str, Any]]] = None):
+        self.entries: List[Dict[str, Any]] = entries or []
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.entries)
+
+    def add(self, source: Path, target: Path, **details):
+        """
+        Acrescenta uma renomeação ao plano
+
+        Args:
+            source: Caminho atual do arquivo
+            target: Caminho final
+            **details: Dados adicionais gravados na entrada (tipo, RA...)
+        """
+        entry = {'source': str(source), 'target': str(target)}
+        entry.update(details)
+        self.entries.append(entry)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'version': PLAN_VERSION,
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'entries': self.entries,
+        }
+
+    def save(self, path: str):
+        """Grava o plano em JSON"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> 'RenamePlan':
+        """Lê um plano gravado por save()"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        if data.get('version') != PLAN_VERSION:
+            raise ValueError(f"Versão de plano não suportada: {data.get('version')}")
+        return cls(data['entries'])
+
+    def apply(self, on_entry: Optional[Callable[[Dict, bool, str], None]] = None,
+              journal=None) -> Tuple[int, int]:
+        """
+        Executa as renomeações na ordem do plano
+
+        A ordem importa: um destino pode ser o nome de origem de uma entrada
+        anterior, liberado quando ela é aplicada. Entradas cuja origem não
+        existe mais ou cujo destino já está ocupado são ignoradas.
+
+        Args:
+            on_entry: Chamado como on_entry(entrada, sucesso, mensagem)
+            journal: RenameJournal em que cada renomeação é registrada
+
+        Returns:
+            Tupla (renomeações aplicadas, renomeações com falha)
+        """
+        applied = 0
+        failed = 0
+
+        for entry in self.entries:
+            source = Path(entry['source'])
+            target = Path(entry['target'])
+
+            if not source.exists():
+                success, message = False, f"Arquivo de origem não encontrado: {source}"
+            elif target.exists():
+                success, message = False, f"Destino já existe: {target}"
+            else:
+                try:
+                    seq = journal.record_rename(source, target, entry.get('hash')) if journal else None
+                    source.rename(target)
+                    if seq:
+                        journal.record_done(seq)
+                    success, message = True, f"{source.name} → {target.name}"
+                except OSError as e:
+                    success, message = False, f"Erro ao renomear {source.name}: {e}"
+
+            if success:
+                applied += 1
+            else:
+                failed += 1
+
+            if on_entry:
+                on_entry(entry, success, message)
+
+        return applied, failed
@@ -0,0 +1,230 @@
+"""
+Checkpoint de execuções para retomada (--resume)
+
+O estado de uma execução é gravado em um arquivo JSON Lines, apenas com
+acréscimos, em config/checkpoints/ (um por diretório processado):
+
+    {"op": "begin", "version": 1, "directory": ..., "time": ...}
+    {"op": "files", "files": [...]}
+    {"op": "file", "source": ..., "target": ...}
+    {"op": "name", "key": ..., "nome": ..., "ra": ..., "novo_nome": ...}
+    {"op": "gemini", "path": ..., "hash": ..., "text": ..., "type": ...}
+    {"op": "gemini_pending", "paths": [...]}
+
+'files' é a lista de arquivos da execução, gravada ao fim da varredura do
+diretório; 'file' marca um arquivo renomeado (não é lido de novo na retomada), 'name'
+reproduz o mapa nome→RA (processed_files) na ordem original e 'gemini'
+guarda respostas do Gemini já recebidas, para não gastar a cota de novo.
+Cada linha vai para o sistema operacional logo após ser escrita e o fsync é
+feito a cada sync_every registros e ao fechar.
+
+Uma execução concluída sem falhas apaga seu checkpoint; uma interrompida
+(botão Parar, travamento, cota do Gemini esgotada) o mantém, e a próxima
+execução com resume=True processa apenas os arquivos que faltam, na ordem
+original.
+"""
+
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+
+CHECKPOINT_VERSION = 1
+DEFAULT_CHECKPOINT_EVERY = 25
+
+
+def checkpoint_dir(config_dir: str) -> str:
+    """Diretório dos checkpoints dentro do diretório de configuração"""
+    return os.path.join(config_dir, 'checkpoints')
+
+
+def _normalize(path) -> str:
+    return os.path.normcase(os.path.abspath(str(path)))
+
+
+def gemini_result(state: Dict[str, Any], path, content_hash: Optional[str]) -> Optional[tuple]:
+    """
+    Resposta do Gemini gravada para um arquivo, como (texto, tipo)
+
+    Se o hash do conteúdo for conhecido nos dois lados, a resposta só vale
+    para o mesmo conteúdo.
+    """
+    saved = state['gemini'].get(_normalize(path))
+    if saved is None:
+        return None
+    saved_hash, text, doc_type = saved
+    if saved_hash and content_hash and saved_hash != content_hash:
+        return None
+    return text, doc_type
+
+
+def checkpoint_path(directory: str, run_directory: str) -> str:
+    """Arquivo de checkpoint de um diretório de documentos"""
+    key = hashlib.sha1(_normalize(run_directory).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(directory, f"{key}.jsonl")
+
+
+class RunCheckpoint:
+    """Checkpoint de uma execução, aberto para acréscimos"""
+
+    def __init__(self, path: str, sync_every: int = DEFAULT_CHECKPOINT_EVERY):
+        """
+        Args:
+            path: Arquivo do checkpoint (continua um existente)
+            sync_every: Registros entre cada fsync
+        """
+        self.path = path
+        self.sync_every = max(1, sync_every)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, 'a', encoding='utf-8')
+        self._unsynced = 0
+        if self._file.tell():
+            # Termina uma linha incompleta deixada por um travamento
+            with open(path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    self._file.write("\n")
+
+    @classmethod
+    def create(cls, path: str, run_directory: str,
+               sync_every: int = DEFAULT_CHECKPOINT_EVERY) -> 'RunCheckpoint':
+        """
+        Inicia o checkpoint de uma nova execução (substitui o anterior)
+
+        Args:
+            path: Arquivo do checkpoint (ver checkpoint_path)
+            run_directory: Diretório de documentos processado
+            sync_every: Registros entre cada fsync
+        """
+        if os.path.exists(path):
+            os.remove(path)
+        checkpoint = cls(path, sync_every)
+        checkpoint._write({
+            'op': 'begin', 'version': CHECKPOINT_VERSION, 'directory': str(run_directory), 'time': time.time(),
+        }, sync=True)
+        return checkpoint
+
+    def track_files(self, files: Iterable) -> Iterator[str]:
+        """Repassa os arquivos da execução e grava a lista ao fim da varredura"""
+        paths = []
+        for f in files:
+            paths.append(str(f))
+            yield str(f)
+        self._write({'op': 'files', 'files': paths}, sync=True)
+
+    def record_file(self, source, target):
+        """Registra um arquivo renomeado"""
+        self._write({'op': 'file', 'source': str(source), 'target': str(target)})
+
+    def record_name(self, key: str, nome: str, ra: Optional[str], novo_nome: Optional[str]):
+        """Registra uma entrada do mapa nome→RA (processed_files)"""
+        self._write({'op': 'name', 'key': key, 'nome': nome, 'ra': ra, 'novo_nome': novo_nome})
+
+    def record_gemini(self, path, content_hash: Optional[str], text: str, doc_type: Optional[str]):
+        """Registra uma resposta do Gemini já interpretada"""
+        self._write({'op': 'gemini', 'path': str(path), 'hash': content_hash, 'text': text, 'type': doc_type})
+
+    def record_gemini_pending(self, paths: List[str]):
+        """Registra as análises do Gemini que ficaram sem resposta"""
+        self._write({'op': 'gemini_pending', 'paths': [str(p) for p in paths]}, sync=True)
+
+    def sync(self):
+        """Força a gravação em disco dos registros pendentes"""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def close(self):
+        """Grava os registros pendentes e fecha o checkpoint"""
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    def discard(self):
+        """Fecha e apaga o checkpoint (execução concluída)"""
+        if not self._file.closed:
+            self._file.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def _write(self, record: Dict[str, Any], sync: bool = False):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self._unsynced += 1
+        if sync or self._unsynced >= self.sync_every:
+            self.sync()
+
+
+def read_checkpoint(path: str) -> Dict[str, Any]:
+    """
+    Lê o estado gravado em um checkpoint
+
+    Returns:
+        Dicionário com 'path', 'directory', 'time', 'files' (lista original),
+        'completed' (origem → destino dos arquivos renomeados), 'names'
+        (chave → (nome, ra, novo_nome), na ordem de inserção original),
+        'gemini' (caminho → (hash, texto, tipo)) e 'gemini_pending' (caminhos)
+
+    Raises:
+        ValueError: Versão de checkpoint não suportada
+    """
+    state = {'path': path, 'directory': None, 'time': None, 'files': [],
+             'completed': {}, 'names': {}, 'gemini': {}, 'gemini_pending': []}
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Última linha incompleta (execução interrompida durante a escrita)
+                continue
+
+            op = record.get('op')
+            if op == 'begin':
+                if record.get('version') != CHECKPOINT_VERSION:
+                    raise ValueError(f"Versão de checkpoint não suportada: {record.get('version')}")
+                state.update(directory=record['directory'], time=record['time'])
+            elif op == 'files':
+                state['files'] = record['files']
+            elif op == 'file':
+                state['completed'][record['source']] = record['target']
+            elif op == 'name':
+                state['names'][record['key']] = (record['nome'], record['ra'], record['novo_nome'])
+            elif op == 'gemini':
+                state['gemini'][_normalize(record['path'])] = (record['hash'], record['text'], record['type'])
+            elif op == 'gemini_pending':
+                state['gemini_pending'] = record['paths']
+
+    return state
+
+
+def remaining_files(state: Dict[str, Any], files: List) -> List[str]:
+    """
+    Arquivos que faltam processar na retomada, na ordem original
+
+    Os arquivos da execução original que não foram renomeados vêm primeiro;
+    arquivos novos no diretório (fora da lista original e que não sejam o
+    resultado de uma renomeação) vão para o fim. Se a execução foi
+    interrompida antes do fim da varredura, vale a ordem da busca atual.
+    """
+    done = set()
+    for source, target in state['completed'].items():
+        done.add(_normalize(source))
+        done.add(_normalize(target))
+
+    known = {_normalize(path) for path in state['files']}
+    ordered = list(state['files']) + [str(f) for f in files if _normalize(f) not in known]
+
+    remaining = []
+    seen = set()
+    for path in ordered:
+        key = _normalize(path)
+        if key in done or key in seen or not os.path.exists(path):
+            continue
+        seen.add(key)
+        remaining.append(path)
+    return remaining
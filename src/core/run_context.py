@@ -0,0 +1,61 @@
+"""
+Estado de uma execução
+
+O DocumentAnalyzer guarda apenas a configuração compartilhada (regras
+compiladas, Gemini, cache de extração) e não a altera ao extrair, classificar
+ou renomear. Tudo o que uma execução acumula fica em um RunContext passado
+explicitamente aos métodos de resolução: o índice nome→RA e os arquivos já
+processados (cross-referencing), os nomes ocupados, o plano do dry-run, o
+diário, o checkpoint, as análises do Gemini em andamento e os bytes de imagem
+enviados ao Gemini.
+
+Cada lote (ex: uma execução da janela e uma pasta observada) tem seu próprio
+contexto, de modo que vários lotes podem ser processados ao mesmo tempo, no
+mesmo processo e com o mesmo analisador. Um contexto é usado por uma
+execução de cada vez; entre execuções seguidas ele mantém o índice nome→RA.
+"""
+
+from typing import Dict, Optional
+
+from .name_index import NameIndex
+from .rename_plan import RenamePlan, TakenNames
+
+
+class RunContext:
+    """Índice nome→RA, resultados e recursos de uma execução"""
+
+    def __init__(self, dry_run: bool = False):
+        """
+        Args:
+            dry_run: Simula o processamento sem renomear os arquivos; as
+                renomeações calculadas ficam em rename_plan
+        """
+        self.dry_run = dry_run
+        self.rename_plan = RenamePlan()  # Renomeações calculadas em dry_run
+        self.taken_names = TakenNames()  # Nomes ocupados por diretório (colisões)
+        self.journal = None  # Diário de renomeações da execução (ver DocumentAnalyzer.open_journal)
+        self.checkpoint = None  # Checkpoint para retomada (ver DocumentAnalyzer.open_checkpoint)
+        self.resumed_state = None  # Estado do checkpoint retomado (respostas do Gemini já recebidas)
+        self.gemini_inflight: Dict[str, Dict] = {}  # Resultados com análise do Gemini agendada e não consumida
+        self.gemini_upload_bytes: Dict[str, int] = {}  # Bytes de imagem enviados ao Gemini por arquivo
+        self.processed_files: Dict[str, Dict] = {}  # Nome, RA e novo nome dos arquivos já processados
+        self.name_index = NameIndex()  # Índice nome→RA dos arquivos já processados
+
+    def start(self):
+        """Prepara uma nova execução (nomes ocupados relidos do disco, plano vazio)"""
+        self.taken_names = TakenNames()
+        self.rename_plan = RenamePlan()
+        self.gemini_inflight = {}
+        self.gemini_upload_bytes = {}
+
+    def register_processed_file(self, file_name: str, nome: str, ra: Optional[str], novo_nome: Optional[str]):
+        """Armazena nome e RA de um arquivo para cross-referencing"""
+        entry = {
+            'nome': nome,
+            'ra': ra,
+            'novo_nome': novo_nome
+        }
+        if self.checkpoint and self.processed_files.get(file_name) != entry:
+            self.checkpoint.record_name(file_name, nome, ra, novo_nome)
+        self.processed_files[file_name] = entry
+        self.name_index.add(file_name, nome, ra)
@@ -0,0 +1,370 @@
+"""
+Padrões de extração de RA (matrícula) e de nome a partir do nome do arquivo e do texto
+
+Funções de nível de módulo, sem estado, usadas tanto pelo DocumentAnalyzer
+quanto pelos processos de extração do pipeline.
+
+Para o nome, e para o nome e o RA juntos, os padrões são combinados em uma
+única expressão regular (alternância com um grupo nomeado por padrão),
+compilada uma vez: o texto é percorrido uma só vez e cada ocorrência vira
+um Candidate com o padrão que a encontrou (rank), a posição e o valor. A
+escolha entre candidatos segue a precedência das listas: o RA é o do
+primeiro padrão da lista com alguma ocorrência (a mais à esquerda), e o
+nome é a primeira ocorrência do primeiro padrão cujo nome passa pelos
+filtros. O resultado é o mesmo de buscar cada padrão em sequência. Depois
+de cada ocorrência, a busca recomeça na posição seguinte ao seu início,
+para que uma ocorrência não esconda outra sobreposta (ex: o RA em
+"sra. 12345").
+
+Quando só o RA é procurado, cada padrão de RA é buscado em sequência com
+sua própria expressão pré-compilada: a busca termina no primeiro padrão com
+ocorrência e, como os prefixos são literais curtos, é mais rápida que a
+alternância.
+
+As expressões não usam re.IGNORECASE (que impede o re de descartar
+rapidamente as posições que não começam um padrão): as funções públicas
+convertem o texto para minúsculas uma vez; _scan_lower e
+find_matricula_lower recebem o texto já em minúsculas, como o produzido
+pelos extratores e pela análise do Gemini, sem convertê-lo de novo.
+"""
+
+import logging
+import re
+import unicodedata
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+# Padrões para identificar matrículas no nome do arquivo: (prefixo, grupo do RA)
+# Ordem importante: do mais específico para o menos específico
+FILENAME_RA_PATTERNS = [
+    (r'ra', r'\d{6}'),              # ra seguido de 6 dígitos (ex: ra123456)
+    (r'ra', r'\d{5}'),              # ra seguido de 5 dígitos (ex: ra03013)
+    (r'ra', r'\d{4}'),              # ra seguido de 4 dígitos (ex: ra1234)
+    (r'mat', r'\d+'),               # mat seguido de números (ex: mat12345)
+    (r'matricula[_\-]?', r'\d+'),   # matricula seguido de números
+]
+
+# Padrões para identificar RA no texto do documento: (prefixo, grupo do RA)
+TEXT_RA_PATTERNS = [
+    (r'ra[:\s]+', r'\d{6}'),        # RA: 123456 ou RA 123456
+    (r'ra[:\s]+', r'\d{5}'),        # RA: 12345
+    (r'ra[:\s]+', r'\d{4}'),        # RA: 1234
+    (r'r\.?a\.?[:\s]+', r'\d+'),    # R.A.: 123456 ou RA.: 123456
+    (r'registro[:\s]+', r'\d+'),    # Registro: 123456
+    (r'matrícula[:\s]+', r'\d+'),   # Matrícula: 123456
+    (r'matricula[:\s]+', r'\d+'),   # Matricula: 123456
+]
+
+# Prefixos que antecedem o nome da pessoa no texto, em ordem de preferência. O
+# nome vai do primeiro caractere que não é quebra de linha, vírgula ou
+# ponto e vírgula até a próxima vírgula ou ponto e vírgula
+NAME_TEXT_PATTERNS = [
+    r'nome[:\s]+',
+    r'portador[:\s]+',
+    r'titular[:\s]+',
+    r'eu,\s+',       # Para TERMOs
+    r'sr\.?\s+',
+    r'sra\.?\s+',
+]
+
+# Máximo de palavras de um nome (para evitar pegar texto demais)
+NAME_MAX_WORDS = 6
+
+# Palavras que indicam que o trecho encontrado não é um nome
+NAME_EXCLUDE_WORDS = ['documento', 'carteira', 'registro', 'geral', 'federal', 'receita',
+                      'declaro', 'termo', 'responsabilidade', 'que']
+
+# Palavras do nome do arquivo seguidas do nome da pessoa (TERMO, OFÍCIO, etc + nome)
+FILENAME_NAME_KEYWORDS = ['termo', 'oficio', 'ofício', 'historico', 'histórico']
+
+# Nome usado quando nenhum nome é encontrado
+NO_NAME = "documento"
+
+
+class Candidate(NamedTuple):
+    """Ocorrência de um padrão de RA ou de nome"""
+    kind: str   # 'ra' ou 'name'
+    rank: int   # Posição do padrão na lista (0 = preferido)
+    start: int  # Início do valor no texto
+    end: int    # Fim do valor no texto
+    value: str  # RA (dígitos) ou nome (até NAME_MAX_WORDS palavras separadas por espaço)
+
+
+def _ra_alternatives(patterns, group_prefix: str) -> List[str]:
+    return [f'{prefix}(?P<{group_prefix}{rank}>{group})' for rank, (prefix, group) in enumerate(patterns)]
+
+
+def _name_alternatives() -> List[str]:
+    # O nome começa em um caractere que não é quebra de linha nem delimitador. O
+    # grupo (vazio) fica no fim para que cada alternativa comece pelo prefixo
+    return [f'{prefix}(?=[^\\n\\r,;])(?P<name{rank}>)' for rank, prefix in enumerate(NAME_TEXT_PATTERNS)]
+
+
+def _compile(alternatives: List[str]) -> 're.Pattern':
+    return re.compile('|'.join(alternatives))
+
+
+def _ra_searches(patterns) -> List['re.Pattern']:
+    return [re.compile(f'{prefix}({group})') for prefix, group in patterns]
+
+
+# Busca só do RA: uma expressão por padrão, na ordem de preferência
+FILENAME_RA_SEARCHES = _ra_searches(FILENAME_RA_PATTERNS)
+TEXT_RA_SEARCHES = _ra_searches(TEXT_RA_PATTERNS)
+
+NAME_SCAN = _compile(_name_alternatives())
+TEXT_SCAN = _compile(_ra_alternatives(TEXT_RA_PATTERNS, 'ra') + _name_alternatives())
+
+# Grupo nomeado → (tipo, rank)
+_GROUPS = {f'ra{rank}': ('ra', rank) for rank in range(len(TEXT_RA_PATTERNS))}
+_GROUPS.update({f'name{rank}': ('name', rank) for rank in range(len(NAME_TEXT_PATTERNS))})
+
+_NAME_WORD = re.compile(r'\s*([^\s,;]+)')
+
+_FILENAME_EXTENSION = re.compile(r'\.(pdf|docx?|jpg|png)$')
+_FILENAME_RA = re.compile(r'ra\d+')
+_FILENAME_DOC = re.compile(r'doc\d+')
+_DIGITS = re.compile(r'\d+')
+_SEPARATORS = re.compile(r'[_\-\.]+')
+_NON_LETTERS = re.compile(r'[^a-zA-Z\s]')
+_SPACES = re.compile(r'\s+')
+
+
+def _candidate(text: str, match: 're.Match') -> Candidate:
+    """Candidato de uma ocorrência de uma das expressões combinadas"""
+    kind, rank = _GROUPS[match.lastgroup]
+    if kind == 'ra':
+        return Candidate('ra', rank, match.start(match.lastgroup), match.end(), match.group(match.lastgroup))
+
+    start = end = match.end()
+    words = []
+    while len(words) < NAME_MAX_WORDS:
+        word = _NAME_WORD.match(text, end)
+        if not word:
+            break
+        words.append(word.group(1))
+        end = word.end()
+    return Candidate('name', rank, start, end, ' '.join(words))
+
+
+def iter_candidates(text: str, scan: 're.Pattern' = TEXT_SCAN) -> Iterator[Candidate]:
+    """
+    Percorre o texto uma vez e gera os candidatos na ordem em que aparecem
+
+    Args:
+        text: Texto (ou nome do arquivo) em minúsculas
+        scan: Expressão combinada (TEXT_SCAN ou NAME_SCAN)
+    """
+    search = scan.search
+    match = search(text)
+    while match:
+        yield _candidate(text, match)
+        match = search(text, match.start() + 1)
+
+
+def find_candidates(text: str) -> List[Candidate]:
+    """Todos os candidatos a RA e a nome do texto, em ordem de posição (em text.lower())"""
+    return list(iter_candidates(text.lower()))
+
+
+def best_ra(candidates: Iterable[Candidate]) -> Optional[Candidate]:
+    """
+    RA com a precedência das listas de padrões
+
+    O primeiro padrão com alguma ocorrência vence; entre ocorrências do
+    mesmo padrão, a primeira. Para de consumir os candidatos ao encontrar
+    o padrão preferido.
+    """
+    best = None
+    for candidate in candidates:
+        if candidate.kind == 'ra' and (best is None or candidate.rank < best.rank):
+            best = candidate
+            if best.rank == 0:
+                break
+    return best
+
+
+def is_valid_name(name: str) -> bool:
+    """Indica se o trecho encontrado após 'nome:', 'eu,' etc. parece um nome"""
+    return len(name.split()) >= 2 and not any(word in name.lower() for word in NAME_EXCLUDE_WORDS)
+
+
+class _NameChoice:
+    """Escolha incremental do nome com a precedência de NAME_TEXT_PATTERNS (ver best_name)"""
+
+    def __init__(self):
+        self.first = {}  # rank → primeira ocorrência do padrão
+        self.rank = 0  # Padrão preferido ainda possível
+        self.chosen: Optional[Candidate] = None
+
+    def add(self, candidate: Candidate) -> bool:
+        """Registra um candidato a nome; True quando a escolha não pode mais mudar"""
+        if candidate.rank not in self.first:
+            self.first[candidate.rank] = candidate
+            while self.rank in self.first:
+                if is_valid_name(self.first[self.rank].value):
+                    self.chosen = self.first[self.rank]
+                    return True
+                self.rank += 1
+        return self.rank >= len(NAME_TEXT_PATTERNS)
+
+    def result(self) -> Optional[Candidate]:
+        """Nome escolhido ao fim do texto: padrões sem ocorrência são pulados"""
+        if self.chosen:
+            return self.chosen
+        for rank in range(self.rank, len(NAME_TEXT_PATTERNS)):
+            candidate = self.first.get(rank)
+            if candidate and is_valid_name(candidate.value):
+                return candidate
+        return None
+
+
+def best_name(candidates: Iterable[Candidate]) -> Optional[Candidate]:
+    """
+    Nome com a precedência de NAME_TEXT_PATTERNS
+
+    Só a primeira ocorrência de cada padrão é considerada: se ela não passa
+    pelos filtros, passa-se ao padrão seguinte. Para de consumir os
+    candidatos assim que a escolha não pode mais mudar.
+    """
+    choice = _NameChoice()
+    for candidate in candidates:
+        if candidate.kind == 'name' and choice.add(candidate):
+            break
+    return choice.result()
+
+
+def scan_text(text: str, find_ra: bool = True, find_name: bool = True) -> Tuple[Optional[Candidate], Optional[Candidate]]:
+    """
+    RA e nome do texto em uma única varredura
+
+    Quando um dos dois já está decidido (o nome escolhido, ou um RA do padrão
+    preferido), a busca continua do mesmo ponto só pelo outro: pelo nome,
+    com a expressão combinada; pelo RA, padrão por padrão (ver
+    find_matricula_lower), até o padrão do RA já encontrado.
+
+    Args:
+        text: Texto do documento
+        find_ra: Procura o RA (False quando ele já é conhecido, ex: pelo nome do arquivo)
+        find_name: Procura o nome
+
+    Returns:
+        (candidato a RA, candidato a nome), cada um None se não encontrado ou não procurado
+    """
+    return _scan_lower(text.lower(), find_ra, find_name)
+
+
+def _scan_lower(text: str, find_ra: bool = True, find_name: bool = True) -> Tuple[Optional[Candidate], Optional[Candidate]]:
+    """scan_text para texto já em minúsculas"""
+    if not find_name:
+        return (_search_ra(text, TEXT_RA_SEARCHES) if find_ra else None), None
+
+    ra = None
+    name = _NameChoice()
+    need_ra = find_ra
+    scan = TEXT_SCAN if need_ra else NAME_SCAN
+    match = scan.search(text)
+    while match:
+        candidate = _candidate(text, match)
+        if candidate.kind == 'ra':
+            if ra is None or candidate.rank < ra.rank:
+                ra = candidate
+                need_ra = ra.rank != 0
+        elif name.add(candidate):
+            # Nome decidido: só os padrões de RA preferidos ao já encontrado,
+            # a partir daqui (as ocorrências anteriores já foram vistas)
+            if need_ra:
+                searches = TEXT_RA_SEARCHES[:ra.rank] if ra else TEXT_RA_SEARCHES
+                ra = _search_ra(text, searches, match.start() + 1) or ra
+            break
+
+        scan = TEXT_SCAN if need_ra else NAME_SCAN
+        match = scan.search(text, match.start() + 1)
+    return ra, name.result()
+
+
+def _search_ra(text: str, searches: List['re.Pattern'], pos: int = 0) -> Optional[Candidate]:
+    """Primeira ocorrência do primeiro padrão de RA com alguma ocorrência a partir de pos"""
+    for rank, search in enumerate(searches):
+        match = search.search(text, pos)
+        if match:
+            return Candidate('ra', rank, match.start(1), match.end(), match.group(1))
+    return None
+
+
+def extract_matricula_from_filename(filename: str) -> Optional[str]:
+    """Extrai matrícula (RA) do nome do arquivo usando padrões como 'ra03013'"""
+    candidate = _search_ra(filename.lower(), FILENAME_RA_SEARCHES)
+    return candidate.value if candidate else None
+
+
+def extract_matricula_from_text(text: str) -> Optional[str]:
+    """Extrai matrícula (RA) do conteúdo do texto do documento"""
+    return find_matricula_lower(text.lower())
+
+
+def find_matricula_lower(text: str) -> Optional[str]:
+    """extract_matricula_from_text para texto já em minúsculas (ex: o produzido pelos extratores)"""
+    for search in TEXT_RA_SEARCHES:
+        match = search.search(text)
+        if match:
+            return match.group(1)
+    return None
+
+
+def clean_name(name: str) -> str:
+    """Limpa o nome removendo acentos, caracteres especiais e espaços"""
+    name = unicodedata.normalize('NFD', name)
+    name = ''.join(c for c in name if unicodedata.category(c) != 'Mn')
+
+    name = _NON_LETTERS.sub('', name)
+    name = _SPACES.sub('_', name.strip())
+
+    return name.lower()
+
+
+def extract_name_from_filename(filename: str) -> Optional[str]:
+    """Extrai o nome que segue 'termo', 'oficio' ou 'historico' no nome do arquivo"""
+    # Remove extensão e RA do nome do arquivo
+    filename_clean = filename.lower()
+    filename_clean = _FILENAME_EXTENSION.sub('', filename_clean)
+    filename_clean = _FILENAME_RA.sub('', filename_clean)
+    filename_clean = _FILENAME_DOC.sub('', filename_clean)
+
+    for keyword in FILENAME_NAME_KEYWORDS:
+        if keyword in filename_clean:
+            # Extrai o que vem depois da palavra-chave
+            parts = filename_clean.split(keyword)
+            if len(parts) > 1:
+                potential_name = parts[1].strip()
+                # Remove números e caracteres especiais extras
+                potential_name = _DIGITS.sub('', potential_name)
+                potential_name = _SEPARATORS.sub(' ', potential_name).strip()
+
+                if len(potential_name.split()) >= 2:  # Pelo menos 2 palavras
+                    cleaned = clean_name(potential_name)
+                    if cleaned and cleaned != NO_NAME:
+                        logger.debug("📝 Nome extraído do arquivo: %s → %s", potential_name, cleaned)
+                        return cleaned
+    return None
+
+
+def name_from_candidate(candidate: Optional[Candidate]) -> str:
+    """Nome limpo de um candidato de best_name (NO_NAME se não houver)"""
+    if candidate is None:
+        return NO_NAME
+    cleaned = clean_name(candidate.value)
+    logger.debug("📝 Nome extraído do texto: %s → %s", candidate.value, cleaned)
+    return cleaned
+
+
+def extract_name_from_text(text: str, filename: str = "") -> str:
+    """Extrai nome de pessoa do nome do arquivo (mais confiável) ou do texto"""
+    if filename:
+        name = extract_name_from_filename(filename)
+        if name:
+            return name
+
+    return name_from_candidate(best_name(iter_candidates(text.lower(), NAME_SCAN)))
@@ -0,0 +1,213 @@
+"""
+Medição do tempo de cada etapa do processamento
+
+Os tempos de um arquivo ficam em result['timings'] (etapa → segundos). As
+etapas principais são 'extract' (nos processos de extração), 'gemini'
+(espera pela resposta), 'cache' (gravação no cache de extração), 'prepass'
+(índice nome→RA da primeira passagem) e 'resolve'; subetapas usam o nome
+da etapa principal como prefixo ('extract.pdf', 'resolve.facts'...) e
+não entram no tempo total do arquivo.
+
+collect() define o dicionário de tempos do arquivo em andamento (uma
+variável de contexto: vale por thread e também nos processos de trabalho) e
+stage()/timed() acumulam nele o tempo de um trecho ou de uma função. Fora de
+collect() eles não medem nada, então as funções instrumentadas podem ser
+chamadas de qualquer lugar.
+
+TimingReport agrega os resultados de uma execução: quantidade, total, p50,
+p95 e máximo por etapa, os arquivos mais lentos e os bytes de imagem
+enviados ao Gemini (result['gemini_upload_bytes']), em tabela para o console
+ou em JSON.
+"""
+
+import functools
+import heapq
+import json
+import math
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+DEFAULT_SLOWEST_FILES = 10
+
+# Ordem das etapas principais no relatório
+STAGE_ORDER = ('extract', 'gemini', 'cache', 'prepass', 'resolve')
+
+_current: ContextVar[Optional[Dict[str, float]]] = ContextVar('timings', default=None)
+
+
+@contextmanager
+def collect(timings: Dict[str, float]) -> Iterator[Dict[str, float]]:
+    """Mede as etapas executadas dentro do bloco em 'timings'"""
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Acumula o tempo do bloco na etapa 'name' do arquivo em andamento"""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+
+
+def timed(name: str) -> Callable:
+    """Decorador: acumula o tempo de cada chamada na etapa 'name'"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def file_total(timings: Dict[str, float]) -> float:
+    """Tempo total de um arquivo (soma das etapas principais)"""
+    return sum(seconds for name, seconds in timings.items() if '.' not in name)
+
+
+def _percentile(ordered: List[float], percent: float) -> float:
+    """Percentil pelo método do posto mais próximo (lista ordenada)"""
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+
+class TimingReport:
+    """Tempos agregados de uma execução"""
+
+    def __init__(self, slowest: int = DEFAULT_SLOWEST_FILES):
+        """
+        Args:
+            slowest: Quantidade de arquivos mais lentos mantidos no relatório
+        """
+        self.slowest = slowest
+        self.samples: Dict[str, List[float]] = {}
+        self.files = 0
+        self.text_sources: Dict[str, int] = {}
+        self.gemini_uploads = 0  # Documentos com imagem enviada ao Gemini
+        self.gemini_upload_bytes = 0
+        self._slowest: List[tuple] = []  # heap (total, sequência, caminho, tempos)
+        self._start = time.perf_counter()
+        self.wall_seconds: Optional[float] = None
+
+    def add(self, result: Dict[str, Any]):
+        """Registra os tempos de um arquivo (dicionário de resultado do pipeline)"""
+        timings = result.get('timings') or {}
+        self.files += 1
+        for name, seconds in timings.items():
+            self.samples.setdefault(name, []).append(seconds)
+
+        source = result.get('text_source')
+        if source:
+            self.text_sources[source] = self.text_sources.get(source, 0) + 1
+
+        uploaded = result.get('gemini_upload_bytes')
+        if uploaded:
+            self.gemini_uploads += 1
+            self.gemini_upload_bytes += uploaded
+
+        item = (file_total(timings), self.files, result['path'], dict(timings))
+        if len(self._slowest) < self.slowest:
+            heapq.heappush(self._slowest, item)
+        elif item[0] > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, item)
+
+    def finish(self):
+        """Marca o fim da execução (tempo de relógio)"""
+        self.wall_seconds = time.perf_counter() - self._start
+
+    def stage_names(self) -> List[str]:
+        """Etapas na ordem do relatório: cada etapa principal seguida das subetapas"""
+        def key(name):
+            main = name.split('.', 1)[0]
+            rank = STAGE_ORDER.index(main) if main in STAGE_ORDER else len(STAGE_ORDER)
+            return rank, main, '.' in name, name
+        return sorted(self.samples, key=key)
+
+    def stage_stats(self, name: str) -> Dict[str, float]:
+        ordered = sorted(self.samples[name])
+        return {
+            'count': len(ordered),
+            'total': sum(ordered),
+            'p50': _percentile(ordered, 50),
+            'p95': _percentile(ordered, 95),
+            'max': ordered[-1],
+        }
+
+    def slowest_files(self) -> List[Dict[str, Any]]:
+        return [{'file': path, 'total': total, 'timings': timings}
+                for total, _, path, timings in sorted(self._slowest, reverse=True)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        wall = self.wall_seconds if self.wall_seconds is not None else time.perf_counter() - self._start
+        return {
+            'files': self.files,
+            'wall_seconds': wall,
+            'files_per_second': self.files / wall if wall > 0 else None,
+            'text_sources': self.text_sources,
+            'gemini_upload': {
+                'documents': self.gemini_uploads,
+                'bytes': self.gemini_upload_bytes,
+                'bytes_per_document': self.gemini_upload_bytes / self.gemini_uploads if self.gemini_uploads else None,
+            },
+            'stages': {name: self.stage_stats(name) for name in self.stage_names()},
+            'slowest': self.slowest_files(),
+        }
+
+    def save(self, path: str):
+        """Grava o relatório em JSON"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+    def format_table(self) -> str:
+        """Relatório em texto (tabela por etapa e arquivos mais lentos)"""
+        data = self.to_dict()
+        lines = [
+            f"{'Etapa':<22}{'Arquivos':>9}{'Total (s)':>11}{'p50 (ms)':>10}{'p95 (ms)':>10}{'Máx (ms)':>10}",
+            "-" * 72,
+        ]
+        for name, stats in data['stages'].items():
+            label = f"  {name.split('.', 1)[1]}" if '.' in name else name
+            lines.append(
+                f"{label:<22}{stats['count']:>9}{stats['total']:>11.2f}"
+                f"{stats['p50'] * 1000:>10.1f}{stats['p95'] * 1000:>10.1f}{stats['max'] * 1000:>10.1f}"
+            )
+
+        rate = f", {data['files_per_second']:.1f} arquivo(s)/s" if data['files_per_second'] else ""
+        lines.append("-" * 72)
+        lines.append(f"{data['files']} arquivo(s) em {data['wall_seconds']:.1f}s{rate}")
+        if data['text_sources']:
+            lines.append("Origem do texto: " + ", ".join(
+                f"{source} {count}" for source, count in sorted(data['text_sources'].items())))
+        upload = data['gemini_upload']
+        if upload['documents']:
+            lines.append(f"📤 Gemini: {upload['documents']} imagem(ns), {upload['bytes'] / 1024:.0f} KB enviados "
+                         f"({upload['bytes_per_document'] / 1024:.0f} KB por documento)")
+
+        if data['slowest']:
+            lines.append("")
+            lines.append("Arquivos mais lentos:")
+            for item in data['slowest']:
+                note = ""
+                main = max((name for name in item['timings'] if '.' not in name),
+                           key=item['timings'].get, default=None)
+                if main:
+                    # A subetapa mais demorada aponta o gargalo (ex: extract.pdf, extract.hash)
+                    sub = max((name for name in item['timings'] if name.startswith(main + '.')),
+                              key=item['timings'].get, default=main)
+                    note = f" (principalmente {sub})"
+                lines.append(f"  {item['total']:>8.2f}s  {item['file']}{note}")
+
+        return "\n".join(lines)
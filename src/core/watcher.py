@@ -0,0 +1,290 @@
+"""
+Observação de pasta de entrada (processamento contínuo)
+
+FolderWatcher varre periodicamente (polling, sem depender de notificações
+do sistema operacional) um diretório de entrada e processa os documentos
+novos com o mesmo DocumentAnalyzer. O índice nome→RA fica em memória entre as
+chegadas, no RunContext do próprio observador: o analisador pode atender ao
+mesmo tempo outros lotes (ex: a janela) com contextos próprios.
+
+Um arquivo só é processado depois de ficar 'settle' segundos sem mudar de
+tamanho nem de data de modificação e de poder ser aberto para leitura
+(arquivos ainda sendo copiados esperam). Os arquivos já tratados (inclusive
+os renomeados pelo próprio observador e os que falharam, enquanto não
+mudarem) e o mapa nome→RA ficam gravados em config/watch/, para que um
+reinício não processe de novo a própria saída.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .pipeline import ProcessingPipeline
+from .run_context import RunContext
+from ..utils.file_scanner import iter_files
+
+
+DEFAULT_INTERVAL = 2.0
+DEFAULT_SETTLE = 3.0
+STATE_VERSION = 1
+
+
+def watch_state_path(config_dir: str, directory: str) -> str:
+    """Arquivo de estado do observador de um diretório"""
+    key = hashlib.sha1(os.path.normcase(os.path.abspath(directory)).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(config_dir, 'watch', f"{key}.json")
+
+
+def _key(path: str) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+
+def _signature(path: str) -> Tuple[int, int]:
+    """Tamanho e data de modificação (ns): muda enquanto o arquivo é escrito"""
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _is_readable(path: str) -> bool:
+    """No Windows, um arquivo ainda aberto para escrita por outro processo não abre"""
+    try:
+        with open(path, 'rb'):
+            return True
+    except OSError:
+        return False
+
+
+class FolderWatcher:
+    """Processa continuamente os documentos que chegam em um diretório"""
+
+    def __init__(self, analyzer, directory: str,
+                 interval: float = DEFAULT_INTERVAL,
+                 settle: float = DEFAULT_SETTLE,
+                 workers: int = 1,
+                 two_pass: bool = False,
+                 scan_options: Optional[Dict] = None,
+                 journal: bool = True,
+                 state_path: Optional[str] = None,
+                 process_existing: bool = False,
+                 context: Optional[RunContext] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            analyzer: DocumentAnalyzer usado em todas as chegadas
+            directory: Diretório de entrada
+            interval: Segundos entre varreduras
+            settle: Segundos sem mudança para considerar o arquivo completo
+            workers: Processos de extração por lote
+            two_pass: Resolução em duas passagens dentro de cada lote
+            scan_options: Argumentos de file_scanner.iter_files
+            journal: Registra as renomeações de cada lote em um diário
+            state_path: Arquivo de estado (None = não grava)
+            process_existing: Na primeira execução (sem estado gravado),
+                processa os arquivos que já estão no diretório; caso
+                contrário eles são considerados já tratados
+            context: Estado mantido entre os lotes (None = um RunContext novo)
+            clock: Relógio monotônico (injetável para testes)
+        """
+        self.analyzer = analyzer
+        self.directory = str(directory)
+        self.interval = interval
+        self.settle = settle
+        self.workers = workers
+        self.two_pass = two_pass
+        self.scan_options = scan_options or {}
+        self.journal = journal
+        self.state_path = state_path
+        self.process_existing = process_existing
+        self.context = context if context is not None else RunContext()
+        self.clock = clock
+
+        self._stop = threading.Event()
+        self._handled: Dict[str, Tuple[int, int]] = {}  # Arquivos tratados → assinatura
+        self._changing: Dict[str, Tuple[Tuple[int, int], float]] = {}  # Arquivo → (assinatura, parado desde)
+
+        # Estatísticas
+        self.batches = 0
+        self.processed = 0
+        self.successful = 0
+
+    def stop(self):
+        """Pede o fim da observação (o arquivo em processamento é concluído)"""
+        self._stop.set()
+
+    @property
+    def stopped(self) -> bool:
+        return self._stop.is_set()
+
+    def load_state(self) -> bool:
+        """
+        Lê os arquivos tratados e o mapa nome→RA gravados
+
+        Returns:
+            True se havia estado gravado
+        """
+        if not self.state_path or not os.path.exists(self.state_path):
+            return False
+
+        with open(self.state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('version') != STATE_VERSION:
+            return False
+
+        self._handled = {key: tuple(signature) for key, signature in state['files'].items()}
+        for file_name, nome, ra, novo_nome in state['names']:
+            self.context.register_processed_file(file_name, nome, ra, novo_nome)
+        return True
+
+    def save_state(self):
+        """Grava os arquivos tratados e o mapa nome→RA (substituição atômica)"""
+        if not self.state_path:
+            return
+
+        state = {
+            'version': STATE_VERSION,
+            'directory': self.directory,
+            'files': self._handled,
+            'names': [[file_name, entry['nome'], entry['ra'], entry['novo_nome']]
+                      for file_name, entry in self.context.processed_files.items()],
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(self.state_path)), exist_ok=True)
+        temp_path = self.state_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(temp_path, self.state_path)
+
+    def snapshot(self) -> Dict[str, Tuple[int, int]]:
+        """Assinatura de cada arquivo suportado do diretório"""
+        signatures = {}
+        for path in iter_files(self.directory, **self.scan_options):
+            try:
+                signatures[path] = _signature(path)
+            except OSError:
+                # Removido entre a varredura e o stat
+                continue
+        return signatures
+
+    def mark_existing(self):
+        """Considera tratados todos os arquivos atuais do diretório"""
+        self._handled = {_key(path): signature for path, signature in self.snapshot().items()}
+        self.save_state()
+
+    def poll(self) -> List[str]:
+        """
+        Faz uma varredura
+
+        Returns:
+            Arquivos novos (ou modificados) e estáveis, na ordem da varredura
+        """
+        now = self.clock()
+        current = self.snapshot()
+        ready = []
+        changing = {}
+
+        for path, signature in current.items():
+            key = _key(path)
+            if self._handled.get(key) == signature:
+                continue
+
+            previous = self._changing.get(key)
+            if previous is None or previous[0] != signature:
+                # Novo ou ainda mudando: conta o tempo parado desde a última
+                # modificação (um arquivo que chega completo fica pronto na
+                # varredura seguinte, que confirma a assinatura)
+                age = max(0.0, time.time() - signature[1] / 1e9)
+                changing[key] = (signature, now - age)
+                continue
+
+            changing[key] = previous
+            if now - previous[1] >= self.settle and _is_readable(path):
+                ready.append(path)
+
+        self._changing = changing
+        # Esquece arquivos removidos ou movidos para fora do diretório
+        current_keys = {_key(path) for path in current}
+        self._handled = {key: signature for key, signature in self._handled.items() if key in current_keys}
+        return ready
+
+    def process(self, paths: List[str],
+                on_file_start: Optional[Callable] = None,
+                on_file_done: Optional[Callable] = None,
+                on_result: Optional[Callable] = None) -> Tuple[int, int]:
+        """
+        Processa um lote de arquivos prontos
+
+        Os arquivos devem vir de poll(). Os callbacks são os de
+        ProcessingPipeline.run.
+
+        Returns:
+            Tupla (arquivos processados com sucesso, arquivos processados)
+        """
+        # Assinaturas observadas na varredura (poll) que considerou os arquivos prontos
+        signatures = {_key(path): self._changing[_key(path)][0] for path in paths}
+
+        def track(index, total, result):
+            key = _key(result['path'])
+            signature = signatures.get(key)
+            self._changing.pop(key, None)
+
+            outcome = result.get('outcome') or {}
+            if outcome.get('renamed') and outcome.get('new_name'):
+                # A renomeação preserva tamanho e data: a assinatura é a mesma
+                self._handled[_key(str(Path(result['path']).parent / outcome['new_name']))] = signature
+            else:
+                # Falhou (ou não mudou de nome): só é tentado de novo se o arquivo mudar
+                self._handled[key] = signature
+
+            if on_result:
+                on_result(index, total, result)
+
+        if self.journal:
+            self.analyzer.open_journal(self.directory, self.context)
+
+        completed = False
+        successful = processed = 0
+        try:
+            pipeline = ProcessingPipeline(self.analyzer, workers=self.workers, two_pass=self.two_pass,
+                                          context=self.context)
+            successful, processed = pipeline.run(
+                paths,
+                on_file_start=on_file_start,
+                on_file_done=on_file_done,
+                should_stop=self._stop.is_set,
+                on_result=track
+            )
+            completed = True
+        finally:
+            self.analyzer.close_journal(completed, self.context)
+            self.save_state()
+
+        self.batches += 1
+        self.processed += processed
+        self.successful += successful
+        return successful, processed
+
+    def run(self,
+            on_file_start: Optional[Callable] = None,
+            on_file_done: Optional[Callable] = None,
+            on_result: Optional[Callable] = None,
+            on_batch: Optional[Callable[[int, int], None]] = None):
+        """
+        Observa o diretório até stop()
+
+        Args:
+            on_file_start, on_file_done, on_result: Ver ProcessingPipeline.run
+            on_batch: Chamado como on_batch(sucessos, processados) após cada lote
+        """
+        if not self.load_state() and not self.process_existing:
+            self.mark_existing()
+
+        while not self._stop.is_set():
+            ready = self.poll()
+            if ready:
+                successful, processed = self.process(ready, on_file_start, on_file_done, on_result)
+                if on_batch:
+                    on_batch(successful, processed)
+            self._stop.wait(self.interval)
@@ -2,6 +2,12 @@
 GUI module - Interface gráfica do usuário
 """
 
-from .main_window import DocsAnalyserGUI
-
 __all__ = ['DocsAnalyserGUI']
+
+
+def __getattr__(name):
+    # Importado no primeiro acesso (ver src/core/__init__.py)
+    if name == 'DocsAnalyserGUI':
+        from .main_window import DocsAnalyserGUI
+        return DocsAnalyserGUI
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
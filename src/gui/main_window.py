@@ -4,7 +4,10 @@ Interface Gráfica Principal - DocsAnalyser
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
+import json
+import logging
 import threading
+import time
 from pathlib import Path
 import sys
 import os
@@ -12,8 +15,15 @@ import os
 # Adiciona o diretório raiz ao path para imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-from src.core.document_analyzer import DocumentAnalyzer
-from src.utils.helpers import load_config, save_config, count_files_in_directory, format_file_size
+from src.core.analyzer_service import AnalyzerService
+from src.core.pipeline import default_worker_count
+from src.core import rename_journal
+from src.core.run_checkpoint import checkpoint_dir, checkpoint_path
+from src.core.timing import TimingReport
+from src.utils.helpers import load_config, save_config, count_files_in_directory, format_file_size, get_config_dir
+from src.utils.file_scanner import iter_files, scan_options
+from src.gui.ui_bridge import UIBridge, BridgeLogHandler, DEFAULT_MAX_LOG_LINES
+from src.utils.logging_setup import setup_logging, LOGGER_NAME, DEFAULT_LEVEL as DEFAULT_LOG_LEVEL
 
 
 class DocsAnalyserGUI:
@@ -31,6 +41,8 @@ class DocsAnalyserGUI:
         self.progress_var = tk.DoubleVar()
         self.processing = False
         self.analyzer = None
+        # Analisador mantido entre execuções (regras, Gemini, cache e pool de extração já carregados)
+        self.service = AnalyzerService()
         
         # Configurações
         self.config = load_config()
@@ -41,6 +53,12 @@ class DocsAnalyserGUI:
         # Criar interface
         self.create_widgets()
         
+        # Atualizações vindas da thread de processamento
+        self.ui = UIBridge(self.root, self.log_text, self.status_var, self.progress_var,
+                           max_log_lines=self.config.get('gui_log_max_lines', DEFAULT_MAX_LOG_LINES))
+        # Avisos e erros do analisador (ex: Gemini não configurado) também aparecem no log da janela
+        logging.getLogger(LOGGER_NAME).addHandler(BridgeLogHandler(self.ui))
+        
         # Centralizar janela
         self.center_window()
         
@@ -147,7 +165,7 @@ class DocsAnalyserGUI:
         self.backup_var = tk.BooleanVar(value=self.config.get('auto_backup', True))
         backup_check = ttk.Checkbutton(
             options_frame,
-            text="Criar backup antes de renomear arquivos",
+            text="Registrar renomeações (permite desfazer a execução)",
             variable=self.backup_var
         )
         backup_check.pack(anchor=tk.W, pady=2)
@@ -160,6 +178,62 @@ class DocsAnalyserGUI:
         )
         gemini_check.pack(anchor=tk.W, pady=2)
         
+        self.two_pass_var = tk.BooleanVar(value=self.config.get('two_pass_resolution', True))
+        two_pass_check = ttk.Checkbutton(
+            options_frame,
+            text="Buscar RA por nome em todos os arquivos da pasta (duas passagens)",
+            variable=self.two_pass_var
+        )
+        two_pass_check.pack(anchor=tk.W, pady=2)
+        
+        self.recursive_var = tk.BooleanVar(value=self.config.get('recursive_scan', False))
+        recursive_check = ttk.Checkbutton(
+            options_frame,
+            text="Incluir subpastas (uma pasta por aluno)",
+            variable=self.recursive_var,
+            command=lambda: self.update_directory_info(self.directory_var.get())
+        )
+        recursive_check.pack(anchor=tk.W, pady=2)
+        
+        self.cache_var = tk.BooleanVar(value=self.config.get('cache_enabled', True))
+        cache_check = ttk.Checkbutton(
+            options_frame,
+            text="Reutilizar extrações anteriores (cache por conteúdo do arquivo)",
+            variable=self.cache_var
+        )
+        cache_check.pack(anchor=tk.W, pady=2)
+        
+        workers_frame = ttk.Frame(options_frame)
+        workers_frame.pack(anchor=tk.W, pady=2)
+        
+        self.workers_var = tk.IntVar(value=self.config.get('extraction_workers') or default_worker_count())
+        ttk.Label(
+            workers_frame,
+            text="Processos de extração em paralelo:"
+        ).pack(side=tk.LEFT)
+        workers_spin = ttk.Spinbox(
+            workers_frame,
+            from_=1,
+            to=64,
+            width=5,
+            textvariable=self.workers_var
+        )
+        workers_spin.pack(side=tk.LEFT, padx=(5, 0))
+        
+        self.pdf_engine_var = tk.StringVar(value=self.config.get('pdf_engine', 'auto'))
+        ttk.Label(
+            workers_frame,
+            text="Motor de PDF:"
+        ).pack(side=tk.LEFT, padx=(20, 0))
+        pdf_engine_combo = ttk.Combobox(
+            workers_frame,
+            textvariable=self.pdf_engine_var,
+            values=['auto', 'fitz', 'pdfplumber', 'pypdf2'],
+            state='readonly',
+            width=12
+        )
+        pdf_engine_combo.pack(side=tk.LEFT, padx=(5, 0))
+        
         # ========== BOTÕES DE AÇÃO ==========
         actions_frame = ttk.Frame(self.root, padding="10")
         actions_frame.pack(fill=tk.X, padx=20, pady=10)
@@ -191,6 +265,14 @@ class DocsAnalyserGUI:
         )
         clear_btn.pack(side=tk.LEFT, padx=5)
         
+        self.undo_btn = ttk.Button(
+            actions_frame,
+            text="↩️ Desfazer Última Execução",
+            command=self.undo_last_run,
+            width=28
+        )
+        self.undo_btn.pack(side=tk.LEFT, padx=5)
+        
         # ========== PROGRESSO ==========
         progress_frame = ttk.Frame(self.root, padding="10")
         progress_frame.pack(fill=tk.X, padx=20, pady=5)
@@ -256,9 +338,17 @@ class DocsAnalyserGUI:
             self.config['last_directory'] = directory
             save_config(self.config)
             
+    def scan_options(self):
+        """Opções da busca de arquivos (settings.json e opção de subpastas da tela)"""
+        options = scan_options(self.config)
+        options['recursive'] = self.recursive_var.get()
+        return options
+    
     def update_directory_info(self, directory):
         """Atualiza informações sobre o diretório selecionado"""
-        count = count_files_in_directory(directory)
+        if not directory:
+            return
+        count = count_files_in_directory(directory, **self.scan_options())
         
         if count > 0:
             self.dir_info_label.config(
@@ -272,10 +362,8 @@ class DocsAnalyserGUI:
             )
             
     def log_message(self, message, tag='info'):
-        """Adiciona mensagem ao log"""
-        self.log_text.insert(tk.END, message + '\n', tag)
-        self.log_text.see(tk.END)
-        self.root.update_idletasks()
+        """Adiciona mensagem ao log (pode ser chamado de qualquer thread)"""
+        self.ui.log(message, tag)
         
     def clear_log(self):
         """Limpa o log de processamento"""
@@ -300,8 +388,11 @@ class DocsAnalyserGUI:
             )
             return
         
+        if not self.check_incomplete_runs():
+            return
+        
         # Confirmar processamento
-        count = count_files_in_directory(directory)
+        count = count_files_in_directory(directory, **self.scan_options())
         if count == 0:
             messagebox.showwarning(
                 "Atenção",
@@ -313,16 +404,26 @@ class DocsAnalyserGUI:
             "Confirmar Processamento",
             f"Serão processados {count} arquivo(s).\n\n"
             f"Os arquivos serão renomeados permanentemente.\n"
-            f"{'Um backup será criado.' if self.backup_var.get() else 'NENHUM backup será criado.'}\n\n"
+            f"{'As renomeações poderão ser desfeitas.' if self.backup_var.get() else 'As renomeações NÃO poderão ser desfeitas.'}\n\n"
             f"Deseja continuar?"
         )
         
         if not response:
             return
         
+        resume = False
+        if self.has_interrupted_run(directory):
+            resume = messagebox.askyesno(
+                "Retomar Processamento",
+                "O processamento anterior deste diretório foi interrompido ou terminou com falhas.\n\n"
+                "Sim: retomar (apenas os arquivos que faltam)\n"
+                "Não: processar todos os arquivos novamente"
+            )
+        
         # Iniciar processamento em thread separada
         self.processing = True
         self.process_btn.config(state=tk.DISABLED)
+        self.undo_btn.config(state=tk.DISABLED)
         self.stop_btn.config(state=tk.NORMAL)
         
         self.log_message("="*60, 'info')
@@ -330,7 +431,16 @@ class DocsAnalyserGUI:
         self.log_message(f"📁 Diretório: {directory}", 'info')
         self.log_message("="*60, 'info')
         
-        thread = threading.Thread(target=self.process_documents, args=(directory,))
+        try:
+            workers = self.workers_var.get()
+        except tk.TclError:
+            workers = None
+        
+        thread = threading.Thread(
+            target=self.process_documents,
+            args=(directory, workers, self.cache_var.get(), self.two_pass_var.get(),
+                  self.pdf_engine_var.get(), resume, self.scan_options(), self.backup_var.get())
+        )
         thread.daemon = True
         thread.start()
         
@@ -338,49 +448,88 @@ class DocsAnalyserGUI:
         """Para o processamento"""
         self.processing = False
         self.log_message("⏹️ Processamento interrompido pelo usuário.", 'warning')
-        self.status_var.set("Processamento interrompido")
+        self.ui.set_status("Processamento interrompido")
         self.process_btn.config(state=tk.NORMAL)
         self.stop_btn.config(state=tk.DISABLED)
         
-    def process_documents(self, directory):
-        """Processa os documentos (executado em thread separada)"""
+    def has_interrupted_run(self, directory):
+        """Indica se há um checkpoint de execução interrompida para o diretório"""
+        return os.path.exists(checkpoint_path(checkpoint_dir(get_config_dir()), directory))
+    
+    def process_documents(self, directory, workers=None, use_cache=True, two_pass=True, pdf_engine=None,
+                          resume=False, scan=None, journal=True):
+        """
+        Processa os documentos (executado em thread separada)
+        
+        Não acessa widgets nem variáveis do Tkinter: toda atualização da
+        janela passa por self.ui.
+        """
         try:
-            # Inicializar analisador
-            self.analyzer = DocumentAnalyzer()
+            # Analisador da execução anterior, se houver (criado na primeira execução)
+            with self.service.session(use_cache=use_cache, pdf_engine=pdf_engine) as (analyzer, context):
+                self.analyzer = analyzer
             
-            # Coletar arquivos
-            files = []
-            for ext in ['.pdf', '.docx', '.doc']:
-                files.extend(Path(directory).glob(f'*{ext}'))
-                files.extend(Path(directory).glob(f'*{ext.upper()}'))
+                # Coletar arquivos (a varredura é consumida pelo pipeline sob demanda)
+                files = iter_files(directory, **(scan or {}))
             
-            total_files = len(files)
-            processed = 0
-            successful = 0
-            
-            for i, file_path in enumerate(files):
-                if not self.processing:
-                    break
-                
-                # Atualizar status
-                self.status_var.set(f"Processando: {file_path.name}")
-                self.progress_var.set((i / total_files) * 100)
+                def on_file_start(i, total, file_path):
+                    # Atualizar status
+                    name = Path(file_path).name
+                    self.ui.set_status(f"Processando: {name}")
+                    if two_pass:
+                        self.ui.set_progress(50 + (i / total) * 50)
+                    else:
+                        self.ui.set_progress((i / total) * 100)
                 
-                self.log_message(f"\n📄 Processando: {file_path.name}", 'info')
-                
-                # Processar arquivo
-                success, message = self.analyzer.process_file(str(file_path))
-                
-                if success:
-                    self.log_message(f"   ✅ {message}", 'success')
-                    successful += 1
-                else:
-                    self.log_message(f"   ❌ {message}", 'error')
-                
-                processed += 1
+                    self.log_message(f"\n📄 Processando: {name}", 'info')
+            
+                def on_file_done(i, total, file_path, success, message):
+                    if success:
+                        self.log_message(f"   ✅ {message}", 'success')
+                    else:
+                        self.log_message(f"   ❌ {message}", 'error')
+            
+                def on_extracted(i, total, file_path):
+                    self.ui.set_status(f"Extraindo: {Path(file_path).name}")
+                    self.ui.set_progress((i / total) * 50)
+            
+                # Extração em paralelo, resolução/renomeação sequencial
+                if two_pass:
+                    self.log_message("🔎 1ª passagem: extraindo texto e RAs de todos os arquivos...", 'info')
+            
+                # Checkpoint para retomada (com resume, apenas os arquivos que faltam)
+                files = self.analyzer.open_checkpoint(directory, files, resume, context)
+                if resume:
+                    self.log_message(f"⏯️ Retomando: {len(files)} arquivo(s) restante(s)", 'info')
+            
+                # Diário de renomeações (interromper pelo botão Parar também o conclui:
+                # as renomeações feitas até ali continuam registradas e podem ser desfeitas)
+                if journal:
+                    self.analyzer.open_journal(directory, context)
+            
+                completed = False
+                successful = processed = 0
+                report = TimingReport()
+                try:
+                    pipeline = self.service.pipeline(context, workers, two_pass)
+                    successful, processed = pipeline.run(
+                        files,
+                        on_file_start=on_file_start,
+                        on_file_done=on_file_done,
+                        should_stop=lambda: not self.processing,
+                        on_extracted=on_extracted,
+                        on_result=lambda index, total, result: report.add(result)
+                    )
+                    completed = True
+                finally:
+                    self.analyzer.close_journal(completed, context)
+                    finished = completed and self.processing and successful == processed
+                    self.analyzer.close_checkpoint(finished, context)
+                    if not finished:
+                        self.log_message("💾 Progresso salvo: o processamento pode ser retomado depois.", 'info')
             
             # Finalizar
-            self.progress_var.set(100)
+            self.ui.set_progress(100)
             self.log_message("\n" + "="*60, 'info')
             self.log_message(
                 f"✨ Processamento concluído! {successful}/{processed} arquivo(s) processado(s) com sucesso.",
@@ -388,9 +537,15 @@ class DocsAnalyserGUI:
             )
             self.log_message("="*60, 'info')
             
-            self.status_var.set(f"Concluído: {successful}/{processed} arquivos processados")
+            # Tempo de cada etapa e arquivos mais lentos
+            report.finish()
+            if report.files:
+                self.log_message("\n⏱️ Tempos por etapa:\n" + report.format_table(), 'info')
+            
+            self.ui.set_status(f"Concluído: {successful}/{processed} arquivos processados")
             
-            messagebox.showinfo(
+            self.ui.call(
+                messagebox.showinfo,
                 "Processamento Concluído",
                 f"Processamento concluído!\n\n"
                 f"Total: {processed} arquivo(s)\n"
@@ -400,19 +555,120 @@ class DocsAnalyserGUI:
             
         except Exception as e:
             self.log_message(f"\n❌ ERRO: {str(e)}", 'error')
-            messagebox.showerror("Erro", f"Erro durante o processamento:\n{str(e)}")
+            self.ui.call(messagebox.showerror, "Erro", f"Erro durante o processamento:\n{str(e)}")
         
         finally:
-            self.process_btn.config(state=tk.NORMAL)
-            self.stop_btn.config(state=tk.DISABLED)
             self.processing = False
+            self.ui.call(self.finish_processing)
+    
+    def finish_processing(self):
+        """Reabilita os botões ao fim do processamento (thread da interface)"""
+        self.process_btn.config(state=tk.NORMAL)
+        self.undo_btn.config(state=tk.NORMAL)
+        self.stop_btn.config(state=tk.DISABLED)
+    
+    def check_incomplete_runs(self):
+        """
+        Oferece recuperar execuções interrompidas (diário sem conclusão)
+        
+        Returns:
+            False se o usuário cancelou
+        """
+        incomplete = rename_journal.find_incomplete(rename_journal.journal_dir(get_config_dir()))
+        if not incomplete:
+            return True
+        
+        response = messagebox.askyesnocancel(
+            "Execução Interrompida",
+            f"{len(incomplete)} execução(ões) anterior(es) foi(ram) interrompida(s) durante a renomeação.\n\n"
+            f"Sim: concluir as renomeações pendentes\n"
+            f"Não: desfazer as renomeações dessas execuções\n"
+            f"Cancelar: decidir depois"
+        )
+        if response is None:
+            return False
+        
+        mode = 'resume' if response else 'rollback'
+        for path in incomplete:
+            self.log_message(f"🔁 Recuperando execução interrompida: {Path(path).name}", 'warning')
+            done, failed = rename_journal.recover(path, mode, on_entry=self.log_journal_entry)
+            self.log_message(
+                f"   {done} renomeação(ões) {'concluída(s)' if response else 'desfeita(s)'}, {failed} falha(s)",
+                'success' if not failed else 'warning'
+            )
+        return True
+    
+    def log_journal_entry(self, entry, success, message):
+        """Registra no log uma renomeação concluída/desfeita a partir do diário"""
+        self.log_message(f"   {'✅' if success else '❌'} {message}", 'success' if success else 'error')
+    
+    def undo_last_run(self):
+        """Desfaz as renomeações da última execução registrada"""
+        directory = rename_journal.journal_dir(get_config_dir())
+        committed = [path for path in rename_journal.list_journals(directory)
+                     if rename_journal.read_journal(path)['state'] == 'committed']
+        if not committed:
+            messagebox.showinfo("Desfazer", "Nenhuma execução registrada para desfazer.")
+            return
+        
+        info = rename_journal.read_journal(committed[-1])
+        count = sum(1 for entry in info['renames'] if entry['done'] and not entry['undone'])
+        if not messagebox.askyesno(
+            "Desfazer Última Execução",
+            f"Diretório: {info['directory']}\n"
+            f"{count} arquivo(s) voltarão ao nome original.\n\n"
+            f"Deseja continuar?"
+        ):
+            return
+        
+        self.log_message("="*60, 'info')
+        self.log_message(f"↩️ Desfazendo a execução {info['run']}...", 'info')
+        undone, failed = rename_journal.undo(committed[-1], on_entry=self.log_journal_entry)
+        self.log_message(
+            f"{undone} renomeação(ões) desfeita(s), {failed} falha(s).",
+            'success' if not failed else 'warning'
+        )
+        self.ui.set_status(f"Desfeito: {undone} arquivo(s)")
+
+
+# Arquivo em que a janela grava os horários de início (ver benchmarks/bench_startup.py)
+STARTUP_PROBE_ENV = 'DOCSANALYSER_STARTUP_PROBE'
+
+
+def report_first_paint(root, path, main_started):
+    """
+    Grava em 'path' o horário em que a janela foi desenhada pela primeira vez e fecha a aplicação
+    
+    Usado apenas para medir o tempo de abertura: {'main': início de main(),
+    'window': janela desenhada}, em segundos desde a época (time.time()).
+    """
+    state = {'painted': False}
+    
+    def write():
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'main': main_started, 'window': time.time()}, f)
+        root.destroy()
+    
+    def on_expose(event):
+        if not state['painted']:
+            state['painted'] = True
+            root.after_idle(write)
+    
+    root.bind('<Expose>', on_expose, add='+')
 
 
 def main():
     """Função principal para executar a GUI"""
+    main_started = time.time()
+    config = load_config()
+    setup_logging(config.get('log_level', DEFAULT_LOG_LEVEL), json_format=config.get('log_format') == 'json')
     root = tk.Tk()
     app = DocsAnalyserGUI(root)
+    probe = os.environ.get(STARTUP_PROBE_ENV)
+    if probe:
+        report_first_paint(root, probe, main_started)
     root.mainloop()
+    app.service.shutdown()
 
 
 if __name__ == "__main__":
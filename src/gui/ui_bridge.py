@@ -0,0 +1,141 @@
+"""
+Ponte entre a thread de processamento e a interface
+
+O Tkinter não pode ser usado fora da thread do mainloop. A thread de
+processamento apenas publica eventos (linhas de log, status, progresso e
+chamadas como caixas de mensagem), e a thread da interface os aplica em
+lotes a cada interval_ms com root.after(): as linhas de um lote entram no
+log com uma única inserção, status e progresso valem só pelo último valor
+e o log é limitado a max_log_lines linhas. Assim o processamento não espera
+o redesenho da janela, por mais rápido que os arquivos sejam concluídos.
+"""
+
+import logging
+import queue
+import threading
+import tkinter as tk
+from typing import Callable, List, Optional
+
+
+DRAIN_INTERVAL_MS = 100
+DEFAULT_MAX_LOG_LINES = 5000
+MAX_EVENTS_PER_DRAIN = 2000
+
+
+class UIBridge:
+    """Fila de atualizações da interface, aplicada pela thread do mainloop"""
+
+    def __init__(self, root: tk.Tk, log_widget: tk.Text,
+                 status_var: tk.StringVar, progress_var: tk.DoubleVar,
+                 max_log_lines: int = DEFAULT_MAX_LOG_LINES,
+                 interval_ms: int = DRAIN_INTERVAL_MS):
+        """
+        Args:
+            root: Janela principal
+            log_widget: Área de texto do log
+            status_var: Variável do texto de status
+            progress_var: Variável da barra de progresso
+            max_log_lines: Linhas mantidas no log (as mais antigas são descartadas)
+            interval_ms: Intervalo entre as aplicações da fila
+        """
+        self.root = root
+        self.log_widget = log_widget
+        self.status_var = status_var
+        self.progress_var = progress_var
+        self.max_log_lines = max(1, max_log_lines)
+        self.interval_ms = interval_ms
+
+        self._events = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._status: Optional[str] = None
+        self._progress: Optional[float] = None
+
+        self._schedule()
+
+    # Chamados de qualquer thread
+
+    def log(self, message: str, tag: str = 'info'):
+        """Acrescenta uma linha ao log"""
+        self._events.put(('log', message, tag))
+
+    def set_status(self, text: str):
+        """Atualiza o texto de status (vale o último valor)"""
+        with self._lock:
+            self._status = text
+
+    def set_progress(self, value: float):
+        """Atualiza a barra de progresso (vale o último valor)"""
+        with self._lock:
+            self._progress = value
+
+    def call(self, func: Callable, *args, **kwargs):
+        """Executa func na thread da interface, na ordem das linhas de log"""
+        self._events.put(('call', func, args, kwargs))
+
+    # Thread da interface
+
+    def drain(self):
+        """Aplica os eventos pendentes"""
+        chunks: List[str] = []  # Texto e tag alternados, para uma única inserção
+
+        for _ in range(MAX_EVENTS_PER_DRAIN):
+            try:
+                event = self._events.get_nowait()
+            except queue.Empty:
+                break
+
+            if event[0] == 'log':
+                chunks.extend((event[1] + '\n', event[2]))
+                continue
+
+            # Antes de uma chamada (ex: caixa de mensagem), a janela mostra tudo o que veio antes
+            self._insert(chunks)
+            chunks = []
+            self._apply_values()
+            _, func, args, kwargs = event
+            func(*args, **kwargs)
+
+        self._insert(chunks)
+        self._apply_values()
+
+    def _apply_values(self):
+        with self._lock:
+            status, self._status = self._status, None
+            progress, self._progress = self._progress, None
+        if status is not None:
+            self.status_var.set(status)
+        if progress is not None:
+            self.progress_var.set(progress)
+
+    def _insert(self, chunks: List[str]):
+        if not chunks:
+            return
+        self.log_widget.insert(tk.END, *chunks)
+
+        # O texto sempre termina em '\n': 'end-1c' fica na linha vazia após a última
+        lines = int(self.log_widget.index('end-1c').split('.')[0]) - 1
+        excess = lines - self.max_log_lines
+        if excess > 0:
+            self.log_widget.delete('1.0', f'{excess + 1}.0')
+        self.log_widget.see(tk.END)
+
+    def _schedule(self):
+        # Reagenda antes de aplicar: um erro em uma chamada não interrompe a fila
+        self.root.after(self.interval_ms, self._schedule)
+        self.drain()
+
+
+class BridgeLogHandler(logging.Handler):
+    """Mostra no log da janela as mensagens de logging (ex: avisos do analisador)"""
+
+    TAGS = {logging.WARNING: 'warning', logging.ERROR: 'error', logging.CRITICAL: 'error'}
+
+    def __init__(self, bridge: UIBridge, level: int = logging.WARNING):
+        super().__init__(level)
+        self.bridge = bridge
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            self.bridge.log(self.format(record), self.TAGS.get(record.levelno, 'info'))
+        except Exception:
+            self.handleError(record)
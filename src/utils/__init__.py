@@ -4,4 +4,4 @@ Utils module - Funções auxiliares
 
 from .helpers import *
 
-__all__ = ['load_config', 'save_config', 'get_resource_path']
+__all__ = ['load_config', 'save_config', 'get_resource_path', 'get_config_dir']
@@ -0,0 +1,124 @@
+"""
+Busca dos arquivos a processar
+
+Uma única varredura com os.scandir (opcionalmente recursiva) substitui as
+buscas glob por extensão (.pdf/.PDF, .doc/.DOC...): a extensão é comparada
+sem diferenciar maiúsculas, o que também evita arquivos duplicados no
+Windows, onde o glob já não diferencia.
+
+iter_files é um gerador: em compartilhamentos de rede lentos o
+processamento começa enquanto a varredura continua. A ordem importa para o
+cross-referencing de RA e para os sufixos de colisão, então não depende do
+sistema de arquivos: em cada diretório os arquivos saem agrupados por
+extensão, na ordem de 'extensions' (padrão: .pdf, .docx, .doc), e em ordem
+alfabética dentro de cada grupo; depois vêm os subdiretórios, também em
+ordem alfabética.
+
+A ordem é diferente da das buscas glob anteriores, que listavam .pdf, .doc
+e .docx, nessa ordem, cada grupo na ordem devolvida pelo sistema de
+arquivos. A mudança é intencional: com a ordem alfabética, os sufixos de
+colisão e o RA obtido por cross-referencing são os mesmos em qualquer
+máquina e a cada execução.
+"""
+
+import os
+from fnmatch import fnmatch
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+
+DEFAULT_EXTENSIONS = ('.pdf', '.docx', '.doc')
+
+
+def _matches(relative_path: str, name: str, patterns: Iterable[str]) -> bool:
+    """
+    Indica se a entrada casa com algum padrão glob (sem diferenciar maiúsculas)
+
+    Padrões com '/' são comparados com o caminho relativo ao diretório
+    varrido (ex: '2024/*.pdf'); os demais, só com o nome (ex: 'ra*').
+    """
+    for pattern in patterns:
+        pattern = pattern.lower()
+        target = relative_path if '/' in pattern else name
+        if fnmatch(target.lower(), pattern):
+            return True
+    return False
+
+
+def iter_files(directory: str,
+               recursive: bool = False,
+               extensions: Optional[Iterable[str]] = None,
+               include: Optional[Iterable[str]] = None,
+               exclude: Optional[Iterable[str]] = None) -> Iterator[str]:
+    """
+    Gera os caminhos dos arquivos suportados de um diretório
+
+    Args:
+        directory: Diretório de documentos
+        recursive: Inclui os subdiretórios
+        extensions: Extensões aceitas, sem diferenciar maiúsculas (padrão:
+            .pdf, .docx, .doc)
+        include: Padrões glob (ex: 'ra*', '2024/*'); se informados, o arquivo
+            precisa casar com algum. Padrões com '/' valem para o caminho
+            relativo ao diretório, os demais para o nome do arquivo
+        exclude: Padrões glob de arquivos e subdiretórios ignorados
+
+    Yields:
+        Caminho de cada arquivo
+    """
+    extensions = tuple(ext.lower() for ext in (extensions or DEFAULT_EXTENSIONS))
+    # Extensões mais longas primeiro ('.docx' antes de '.doc', se houver sobreposição)
+    ranks = sorted(((ext, rank) for rank, ext in enumerate(extensions)), key=lambda item: -len(item[0]))
+    include = list(include or [])
+    exclude = list(exclude or [])
+
+    pending = [(directory, '')]
+    while pending:
+        current, prefix = pending.pop()
+        try:
+            with os.scandir(current) as it:
+                entries = sorted(it, key=lambda entry: entry.name.lower())
+        except OSError:
+            # Diretório sem permissão ou removido durante a varredura
+            continue
+
+        files = []
+        subdirectories = []
+        for entry in entries:
+            relative_path = prefix + entry.name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive and not _matches(relative_path, entry.name, exclude):
+                        subdirectories.append((entry.path, relative_path + '/'))
+                    continue
+                if not entry.is_file():
+                    continue
+            except OSError:
+                continue
+
+            name = entry.name.lower()
+            rank = next((rank for ext, rank in ranks if name.endswith(ext)), None)
+            if rank is None:
+                continue
+            if include and not _matches(relative_path, entry.name, include):
+                continue
+            if exclude and _matches(relative_path, entry.name, exclude):
+                continue
+            files.append((rank, entry.path))
+
+        # sort é estável: dentro de cada extensão fica a ordem alfabética
+        files.sort(key=lambda item: item[0])
+        for _, path in files:
+            yield path
+
+        # Pilha: empilha em ordem inversa para visitar em ordem alfabética
+        pending.extend(reversed(subdirectories))
+
+
+def scan_options(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Argumentos de iter_files conforme settings.json"""
+    return {
+        'recursive': config.get('recursive_scan', False),
+        'extensions': config.get('supported_extensions') or DEFAULT_EXTENSIONS,
+        'include': config.get('include_patterns') or [],
+        'exclude': config.get('exclude_patterns') or [],
+    }
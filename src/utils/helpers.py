@@ -3,11 +3,16 @@ Funções auxiliares e utilitárias
 """
 
 import json
+import logging
 import os
 import sys
 from pathlib import Path
 from typing import Dict, Any
 
+from .file_scanner import iter_files
+
+logger = logging.getLogger(__name__)
+
 
 def get_resource_path(relative_path: str) -> str:
     """
@@ -28,6 +33,24 @@ def get_resource_path(relative_path: str) -> str:
     return os.path.join(base_path, relative_path)
 
 
+def get_config_dir() -> str:
+    """
+    Obtém o diretório gravável de configuração e dados locais (cache, etc.)
+    
+    No executável, fica ao lado do .exe (a pasta temporária _MEIPASS é
+    descartada a cada execução).
+    
+    Returns:
+        Caminho absoluto do diretório config
+    """
+    if getattr(sys, 'frozen', False):
+        base_path = os.path.dirname(sys.executable)
+    else:
+        base_path = os.path.abspath(".")
+    
+    return os.path.join(base_path, "config")
+
+
 def load_config(config_file: str = "config/settings.json") -> Dict[str, Any]:
     """
     Carrega configurações de um arquivo JSON
@@ -45,7 +68,7 @@ def load_config(config_file: str = "config/settings.json") -> Dict[str, Any]:
             with open(config_path, 'r', encoding='utf-8') as f:
                 return json.load(f)
         except Exception as e:
-            print(f"Erro ao carregar configurações: {e}")
+            logger.error("Erro ao carregar configurações: %s", e)
     
     # Configurações padrão
     return {
@@ -53,7 +76,36 @@ def load_config(config_file: str = "config/settings.json") -> Dict[str, Any]:
         "auto_backup": True,
         "gemini_enabled": True,
         "last_directory": "",
-        "window_size": "800x600"
+        "window_size": "800x600",
+        "extraction_workers": 0,
+        "two_pass_resolution": True,
+        "cache_enabled": True,
+        "cache_max_size_mb": 512,
+        "cache_max_age_days": 90,
+        "pdf_page_budget": 0,
+        "pdf_engine": "auto",
+        "gemini_max_in_flight": 4,
+        "gemini_requests_per_minute": 10,
+        "gemini_tokens_per_minute": 250000,
+        "gemini_max_retries": 5,
+        "gemini_batch_size": 1,
+        "gemini_batch_max_mb": 15,
+        "gemini_image_dpi": 144,
+        "gemini_image_max_side": 2000,
+        "gemini_image_grayscale": False,
+        "gemini_image_format": "jpeg",
+        "gemini_image_quality": 85,
+        "journal_keep": 20,
+        "journal_fsync_every": 50,
+        "checkpoint_every": 25,
+        "recursive_scan": False,
+        "include_patterns": [],
+        "exclude_patterns": [],
+        "watch_interval_seconds": 2,
+        "watch_settle_seconds": 3,
+        "gui_log_max_lines": 5000,
+        "log_level": "INFO",
+        "log_format": "text"
     }
 
 
@@ -78,7 +130,7 @@ def save_config(config: Dict[str, Any], config_file: str = "config/settings.json
             json.dump(config, f, ensure_ascii=False, indent=2)
         return True
     except Exception as e:
-        print(f"Erro ao salvar configurações: {e}")
+        logger.error("Erro ao salvar configurações: %s", e)
         return False
 
 
@@ -116,13 +168,14 @@ def validate_directory(directory: str) -> bool:
     return path.exists() and path.is_dir()
 
 
-def count_files_in_directory(directory: str, extensions: list = None) -> int:
+def count_files_in_directory(directory: str, extensions: list = None, **scan_options) -> int:
     """
     Conta arquivos em um diretório
     
     Args:
         directory: Caminho do diretório
         extensions: Lista de extensões para filtrar (ex: ['.pdf', '.docx'])
+        **scan_options: recursive, include e exclude (ver file_scanner.iter_files)
         
     Returns:
         Número de arquivos
@@ -130,12 +183,4 @@ def count_files_in_directory(directory: str, extensions: list = None) -> int:
     if not validate_directory(directory):
         return 0
     
-    if extensions is None:
-        extensions = ['.pdf', '.docx', '.doc']
-    
-    count = 0
-    for ext in extensions:
-        count += len(list(Path(directory).glob(f'*{ext}')))
-        count += len(list(Path(directory).glob(f'*{ext.upper()}')))
-    
-    return count
+    return sum(1 for _ in iter_files(directory, extensions=extensions, **scan_options))
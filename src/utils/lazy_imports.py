@@ -0,0 +1,72 @@
+"""
+Importação sob demanda das dependências opcionais
+
+As bibliotecas de extração (PyMuPDF, pdfplumber, PyPDF2, python-docx,
+docx2txt), o SDK do Gemini, o python-dotenv e o Pillow são pesadas e nem
+sempre estão instaladas. Em vez de importá-las junto com os módulos (o que
+atrasa a abertura da janela e do executável), cada uma é importada por
+optional_import() no primeiro uso, uma única vez por processo. Se não
+estiver instalada, o aviso de instalação é registrado nesse momento e o
+resultado é None.
+"""
+
+import importlib
+import importlib.util
+import logging
+import threading
+from types import ModuleType
+from typing import Dict, Optional
+
+
+logger = logging.getLogger(__name__)
+
+# Pacote a instalar quando o nome no pip difere do nome do módulo
+INSTALL_NAMES = {
+    'fitz': 'PyMuPDF',
+    'docx': 'python-docx',
+    'dotenv': 'python-dotenv',
+    'google.generativeai': 'google-generativeai',
+    'PIL': 'pillow',
+}
+
+_modules: Dict[str, Optional[ModuleType]] = {}
+_lock = threading.Lock()
+
+
+def optional_import(name: str, purpose: Optional[str] = None) -> Optional[ModuleType]:
+    """
+    Importa um módulo opcional no primeiro uso
+
+    Args:
+        name: Nome do módulo (ex: 'fitz', 'google.generativeai')
+        purpose: Para que o módulo serve, incluído no aviso se não estiver instalado
+
+    Returns:
+        O módulo, ou None se não estiver instalado
+    """
+    try:
+        return _modules[name]
+    except KeyError:
+        pass
+
+    with _lock:
+        if name not in _modules:
+            try:
+                _modules[name] = importlib.import_module(name)
+            except ImportError:
+                _modules[name] = None
+                hint = f" ({purpose})" if purpose else ""
+                logger.warning("Para usar %s%s, instale: pip install %s",
+                               name, hint, INSTALL_NAMES.get(name, name))
+        return _modules[name]
+
+
+def is_available(name: str) -> bool:
+    """Indica se um módulo está instalado, sem importá-lo"""
+    if _modules.get(name) is not None:
+        return True
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        # Pacote pai inexistente (ex: 'google' para 'google.generativeai')
+        return False
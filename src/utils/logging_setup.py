@@ -0,0 +1,183 @@
+"""
+Configuração das mensagens de log
+
+Os módulos registram mensagens com logging.getLogger(__name__), todos sob o
+logger do pacote (LOGGER_NAME). setup_logging() instala nele um
+QueueHandler: quem registra apenas coloca a mensagem em uma fila, e uma
+thread (QueueListener) formata e escreve na saída de erro, então a
+resolução dos arquivos não espera o console. Os diagnósticos de cada
+arquivo (resposta do Gemini, nome extraído, busca do RA...) são DEBUG e só
+aparecem com nível DEBUG (ex: --verbose na linha de comando).
+
+Cada mensagem leva o arquivo em processamento (atributo 'file', definido
+com file_context()). JsonFormatter gera um objeto JSON por linha com
+horário, nível, logger, mensagem, arquivo e os campos passados em extra=.
+"""
+
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional, Tuple, Union
+
+
+LOGGER_NAME = __name__.split('.')[0]
+DEFAULT_LEVEL = 'INFO'
+TEXT_FORMAT = '%(asctime)s %(levelname)-7s %(message)s'
+TEXT_DATE_FORMAT = '%H:%M:%S'
+
+_current_file: ContextVar[Optional[str]] = ContextVar('log_file', default=None)
+_listener: Optional[logging.handlers.QueueListener] = None
+_worker_config: Optional[Tuple[int, bool]] = None
+
+# Atributos de todo LogRecord (os demais vêm de extra=)
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime', 'file'}
+
+
+@contextmanager
+def file_context(path) -> Iterator[None]:
+    """Associa ao arquivo 'path' as mensagens registradas dentro do bloco"""
+    token = _current_file.set(str(path))
+    try:
+        yield
+    finally:
+        _current_file.reset(token)
+
+
+class FileContextFilter(logging.Filter):
+    """Acrescenta à mensagem o arquivo em processamento (na thread que registra)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, 'file'):
+            record.file = _current_file.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Um objeto JSON por mensagem"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            'time': self.formatTime(record, '%Y-%m-%dT%H:%M:%S') + f".{int(record.msecs):03d}",
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'file': getattr(record, 'file', None),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                data[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data['exception'] = record.exc_text
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler que preserva a exceção da mensagem
+
+    O QueueHandler padrão formata a mensagem com o traceback e descarta
+    exc_info, então o JsonFormatter da thread de escrita não teria o campo
+    'exception'. A fila é do próprio processo: basta fixar a mensagem
+    (argumentos já aplicados) e o texto do traceback na thread que registra.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        return record
+
+
+def make_formatter(json_format: bool = False) -> logging.Formatter:
+    return JsonFormatter() if json_format else logging.Formatter(TEXT_FORMAT, TEXT_DATE_FORMAT)
+
+
+def _output_handler(json_format: bool, stream=None) -> logging.Handler:
+    stream = stream or sys.stderr
+    if stream is None:
+        # Executável sem console (PyInstaller --windowed)
+        return logging.NullHandler()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(make_formatter(json_format))
+    return handler
+
+
+def _replace_handlers(logger: logging.Logger, handler: logging.Handler):
+    for old in list(logger.handlers):
+        logger.removeHandler(old)
+    logger.addHandler(handler)
+    logger.propagate = False
+
+
+def setup_logging(level: Union[int, str] = DEFAULT_LEVEL, json_format: bool = False,
+                  stream=None) -> logging.Logger:
+    """
+    Configura o logger do pacote (substitui uma configuração anterior)
+
+    Args:
+        level: Nível mínimo ('DEBUG', 'INFO', 'WARNING'...)
+        json_format: Um objeto JSON por linha em vez de texto
+        stream: Destino das mensagens (padrão: saída de erro)
+
+    Returns:
+        Logger do pacote
+    """
+    global _listener, _worker_config
+    shutdown_logging()
+
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(level.upper() if isinstance(level, str) else level)
+
+    log_queue = queue.SimpleQueue()
+    handler = _QueueHandler(log_queue)
+    handler.addFilter(FileContextFilter())
+    _replace_handlers(logger, handler)
+
+    _listener = logging.handlers.QueueListener(log_queue, _output_handler(json_format, stream))
+    _listener.start()
+    _worker_config = (logger.level, json_format)
+    return logger
+
+
+def shutdown_logging():
+    """Escreve as mensagens pendentes e encerra a thread de escrita"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
+
+
+def worker_logging_config() -> Optional[Tuple[int, bool]]:
+    """Configuração repassada aos processos de extração (ver configure_worker_logging)"""
+    return _worker_config
+
+
+def configure_worker_logging(config: Optional[Tuple[int, bool]]):
+    """
+    Inicializador dos processos de extração
+
+    Nos processos de trabalho as mensagens são poucas (erros de extração) e
+    vão direto para a saída de erro, com o mesmo nível e formato do
+    processo principal.
+    """
+    if config is None:
+        return
+    level, json_format = config
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(level)
+    handler = _output_handler(json_format)
+    handler.addFilter(FileContextFilter())
+    _replace_handlers(logger, handler)